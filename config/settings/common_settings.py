@@ -54,6 +54,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "mathesar.middleware.CursorClosedHandlerMiddleware",
     "mathesar.middleware.PasswordChangeNeededMiddleware",
+    "mathesar.middleware.ReplicaLagGuardMiddleware",
     'django_userforeignkey.middleware.UserForeignKeyMiddleware',
     'django_request_cache.middleware.RequestCacheMiddleware',
 ]
@@ -101,6 +102,30 @@ for db_key, db_dict in DATABASES.items():
             f"{db_dict['ENGINE']} found for {db_key}'s engine."
         )
 
+# MATHESAR_REPLICA_DATABASES optionally lists read replicas of the databases above, in the same
+# form as MATHESAR_DATABASES. Reads that can tolerate replication lag are spread across the replicas
+# of their database (see mathesar.database.routing); a database can be listed more than once.
+MATHESAR_REPLICA_DATABASES = {}
+for db_key, url_string in decouple_config('MATHESAR_REPLICA_DATABASES', default='', cast=Csv(pipe_delim)):
+    MATHESAR_REPLICA_DATABASES.setdefault(db_key, []).append(db_url(url_string))
+
+# In seconds. After a user writes, their reads use the primary for this long, so that they see their
+# own writes even if the replicas lag behind. 0 disables this.
+MATHESAR_REPLICA_LAG_GUARD = decouple_config('MATHESAR_REPLICA_LAG_GUARD', default=0, cast=float)
+
+# https://docs.djangoproject.com/en/3.1/ref/settings/#caches
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Which users wrote recently (see MATHESAR_REPLICA_LAG_GUARD). Kept out of the default cache,
+    # which is cleared whenever reflection is reset.
+    'replica_lag_guard': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'replica_lag_guard',
+    },
+}
+
 # pytest-django will create a new database named 'test_{DATABASES[table_db]['NAME']}'
 # and use it for our API tests if we don't specify DATABASES[table_db]['TEST']['NAME']
 TEST = decouple_config('TEST', default=False, cast=bool)
@@ -216,6 +241,65 @@ MATHESAR_CLIENT_DEV_URL = 'http://localhost:3000'
 MATHESAR_UI_SOURCE_LOCATION = os.path.join(BASE_DIR, 'mathesar_ui/')
 MATHESAR_CAPTURE_UNHANDLED_EXCEPTION = decouple_config('CAPTURE_UNHANDLED_EXCEPTION', default=False)
 MATHESAR_STATIC_NON_CODE_FILES_LOCATION = os.path.join(BASE_DIR, 'mathesar/static/non-code/')
+# When enabled, event triggers are installed on each user database (requires a superuser role) and
+# a background thread per database re-reflects objects as soon as they're changed by anyone.
+MATHESAR_BACKGROUND_REFLECTION = decouple_config('BACKGROUND_REFLECTION', default=False, cast=bool)
+# Maximum number of values kept by mathesar.state.cached_property; least recently used ones are
+# evicted first.
+MATHESAR_CACHED_PROPERTY_CACHE_SIZE = decouple_config('CACHED_PROPERTY_CACHE_SIZE', default=10000, cast=int)
+# Connection pool options of the engine shared by all users of each user database. See
+# mathesar.database.base.get_mathesar_engine.
+MATHESAR_DB_POOL_SIZE = decouple_config('DB_POOL_SIZE', default=5, cast=int)
+MATHESAR_DB_MAX_OVERFLOW = decouple_config('DB_MAX_OVERFLOW', default=10, cast=int)
+# Record pages are counted and fetched concurrently, on up to RECORDS_FETCH_WORKERS extra threads
+# (and so pooled connections) per process; DB_POOL_SIZE + DB_MAX_OVERFLOW should leave room for
+# them on top of one connection per concurrent request. 0 counts and fetches one after the other.
+MATHESAR_RECORDS_FETCH_WORKERS = decouple_config('RECORDS_FETCH_WORKERS', default=4, cast=int)
+MATHESAR_DB_POOL_PRE_PING = decouple_config('DB_POOL_PRE_PING', default=True, cast=bool)
+# In seconds; -1 disables recycling.
+MATHESAR_DB_POOL_RECYCLE = decouple_config('DB_POOL_RECYCLE', default=3600, cast=int)
+# In seconds. Bounds how long a connection attempt to an unreachable user database may block.
+MATHESAR_DB_CONNECT_TIMEOUT = decouple_config('DB_CONNECT_TIMEOUT', default=5, cast=int)
+# In seconds. How long the result of a user database health check is reused for.
+MATHESAR_DB_HEALTH_CHECK_TTL = decouple_config('DB_HEALTH_CHECK_TTL', default=30, cast=int)
+# In seconds. How long exact record counts are cached for. Writes through Mathesar invalidate them
+# right away; this bounds staleness after writes made by other Postgres clients.
+MATHESAR_RECORD_COUNT_CACHE_TTL = decouple_config('RECORD_COUNT_CACHE_TTL', default=60, cast=int)
+# Tables whose estimated row count is below this are always counted exactly, even when an
+# approximate count is requested.
+MATHESAR_APPROXIMATE_COUNT_THRESHOLD = decouple_config('APPROXIMATE_COUNT_THRESHOLD', default=100000, cast=int)
+# Limits on the queries that fetch and count records, per endpoint (see
+# mathesar.utils.query_budgets). statement_timeout is in milliseconds, and work_mem is a Postgres
+# memory size like '64MB'; 0 and '' keep the server's settings. When the planner estimates that
+# counting a table's records exactly would cost more than approximate_count_cost (in its arbitrary
+# units), the count is estimated instead; 0 (the default) disables this, since checking takes an
+# extra query per count, and clients get approximate counts even when they ask for exact ones.
+MATHESAR_QUERY_BUDGETS = {
+    'table_records': {
+        'statement_timeout': decouple_config('TABLE_RECORDS_STATEMENT_TIMEOUT', default=60000, cast=int),
+        'work_mem': decouple_config('TABLE_RECORDS_WORK_MEM', default=''),
+        'approximate_count_cost': decouple_config('TABLE_RECORDS_APPROXIMATE_COUNT_COST', default=0, cast=float),
+    },
+    'query_records': {
+        'statement_timeout': decouple_config('QUERY_RECORDS_STATEMENT_TIMEOUT', default=60000, cast=int),
+        'work_mem': decouple_config('QUERY_RECORDS_WORK_MEM', default=''),
+    },
+}
+# Data files are imported by copying them in chunks of about IMPORT_CHUNK_SIZE bytes, up to
+# IMPORT_WORKERS at a time, each over a pooled connection of its own. Files of at least
+# BACKGROUND_IMPORT_MIN_SIZE bytes are imported in the background: creating a table from them
+# responds right away (with 202 and the data file's progress rather than the table), and
+# /data_files/{id}/progress/ reports how far the import has got. The bundled frontend expects the
+# table, so this is off by default (0 imports every file while creating the table); only enable
+# it for API clients that follow the progress instead. Imports don't survive a restart; the ones
+# it interrupts are marked as failed when Mathesar starts.
+MATHESAR_IMPORT_WORKERS = decouple_config('IMPORT_WORKERS', default=4, cast=int)
+MATHESAR_IMPORT_CHUNK_SIZE = decouple_config('IMPORT_CHUNK_SIZE', default=16 * 1024 * 1024, cast=int)
+MATHESAR_BACKGROUND_IMPORT_MIN_SIZE = decouple_config('BACKGROUND_IMPORT_MIN_SIZE', default=0, cast=int)
+# The encoding and dialect of data files are detected from their first SNIFF_SAMPLE_SIZE bytes and,
+# if SNIFF_SPOT_CHECK is enabled, checked against as many bytes from their middle.
+MATHESAR_SNIFF_SAMPLE_SIZE = decouple_config('SNIFF_SAMPLE_SIZE', default=1024 * 1024, cast=int)
+MATHESAR_SNIFF_SPOT_CHECK = decouple_config('SNIFF_SPOT_CHECK', default=True, cast=bool)
 
 # UI source files have to be served by Django in order for static assets to be included during dev mode
 # https://vitejs.dev/guide/assets.html
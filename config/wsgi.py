@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_wsgi_application()
+
+# Background reflection is only started by the web server (rather than by management commands),
+# once Django is set up.
+from mathesar.state.background import start_reflection_workers  # noqa
+
+start_reflection_workers()
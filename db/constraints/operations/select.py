@@ -1,13 +1,10 @@
 from db.utils import get_pg_catalog_table
-from db.metadata import get_empty_metadata
 
 from sqlalchemy import select, and_
 
 
 def get_constraints_with_oids(engine, table_oid=None):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    pg_constraint = get_pg_catalog_table("pg_constraint", engine, metadata=metadata)
+    pg_constraint = get_pg_catalog_table("pg_constraint", engine)
     # conrelid is the table's OID.
     if table_oid:
         where_clause = pg_constraint.c.conrelid == table_oid
@@ -20,6 +17,19 @@ def get_constraints_with_oids(engine, table_oid=None):
     return result
 
 
+def get_constraints_with_oids_from_tables(table_oids, engine):
+    """
+    Like get_constraints_with_oids, but for the constraints attached to any of the given tables.
+    """
+    if len(table_oids) == 0:
+        return []
+    pg_constraint = get_pg_catalog_table("pg_constraint", engine)
+    query = select(pg_constraint).where(pg_constraint.c.conrelid.in_(table_oids))
+    with engine.begin() as conn:
+        result = conn.execute(query).fetchall()
+    return result
+
+
 def get_constraint_from_oid(oid, engine, table):
     constraint_record = get_constraint_record_from_oid(oid, engine)
     for constraint in table.constraints:
@@ -29,7 +39,6 @@ def get_constraint_from_oid(oid, engine, table):
 
 
 def get_constraint_record_from_oid(oid, engine, metadata=None):
-    metadata = metadata if metadata else get_empty_metadata()
     pg_constraint = get_pg_catalog_table("pg_constraint", engine, metadata=metadata)
     # conrelid is the table's OID.
     query = select(pg_constraint).where(pg_constraint.c.oid == oid)
@@ -39,9 +48,7 @@ def get_constraint_record_from_oid(oid, engine, metadata=None):
 
 
 def get_constraint_oid_by_name_and_table_oid(name, table_oid, engine):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    pg_constraint = get_pg_catalog_table("pg_constraint", engine, metadata=metadata)
+    pg_constraint = get_pg_catalog_table("pg_constraint", engine)
     # We only want to select constraints attached to a table.
     # conrelid is the table's OID.
     query = select(pg_constraint).where(
@@ -56,9 +63,7 @@ def get_fkey_constraint_oid_by_name_and_referent_table_oid(name, table_oid, engi
     """
     Sometimes, we need to find a foreign key by the referent table OID.
     """
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    pg_constraint = get_pg_catalog_table("pg_constraint", engine, metadata=metadata)
+    pg_constraint = get_pg_catalog_table("pg_constraint", engine)
     # We only want to select constraints attached to a table.
     # confrelid is the referent table's OID.
     query = select(pg_constraint).where(
@@ -70,9 +75,7 @@ def get_fkey_constraint_oid_by_name_and_referent_table_oid(name, table_oid, engi
 
 
 def get_column_constraints(column_attnum, table_oid, engine):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    pg_constraint = get_pg_catalog_table("pg_constraint", engine, metadata=metadata)
+    pg_constraint = get_pg_catalog_table("pg_constraint", engine)
     query = (
         select(pg_constraint)
         .where(and_(
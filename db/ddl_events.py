@@ -0,0 +1,172 @@
+"""
+This module lets us find out about DDL changes made on a database, no matter by whom.
+
+We install event triggers that NOTIFY on the DDL_EVENTS_CHANNEL channel whenever a DDL command
+finishes. The payload is a JSON object of the form:
+
+    {"table_oids": [<oid>, ...], "full": <boolean>}
+
+where table_oids are the oids of the tables whose definition (name, columns, constraints) may have
+changed, and full signals that the change is structural (e.g. schemas or tables were dropped) and
+can't be described by a list of tables.
+"""
+import json
+import logging
+import select
+
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+
+from db import constants
+from db.types.base import SCHEMA
+
+logger = logging.getLogger(__name__)
+
+DDL_EVENTS_CHANNEL = f"{constants.MATHESAR_PREFIX}ddl_events"
+TABLE_OIDS = 'table_oids'
+FULL = 'full'
+
+_DDL_COMMAND_END_TRIGGER = f"{constants.MATHESAR_PREFIX}ddl_command_end_notify"
+_SQL_DROP_TRIGGER = f"{constants.MATHESAR_PREFIX}sql_drop_notify"
+
+# NOTIFY payloads must be shorter than 8000 bytes. Past this, we only tell the listener that
+# something changed.
+_MAX_PAYLOAD_LENGTH = 7000
+
+
+def install_ddl_event_triggers(engine):
+    """
+    Installs (or reinstalls) the event triggers. Creating event triggers requires superuser
+    privileges.
+
+    Concurrent installs (e.g. by the workers of several processes) take turns, since replacing the
+    same functions and triggers at once fails with "tuple concurrently updated".
+    """
+    ddl_command_end_function = f"""
+    CREATE OR REPLACE FUNCTION {SCHEMA}.notify_ddl_command_end() RETURNS event_trigger AS $$
+    DECLARE
+      table_oids oid[];
+      is_full boolean;
+      payload text;
+    BEGIN
+      SELECT
+        coalesce(array_agg(DISTINCT CASE
+          WHEN c.object_type = 'table constraint'
+            THEN (SELECT conrelid FROM pg_catalog.pg_constraint WHERE oid = c.objid)
+          ELSE c.objid
+        END) FILTER (
+          WHERE c.object_type IN ('table', 'table column', 'table constraint')
+        ), '{{}}'),
+        coalesce(bool_or(c.object_type = 'schema'), false)
+      INTO table_oids, is_full
+      FROM pg_event_trigger_ddl_commands() AS c
+      WHERE c.schema_name IS DISTINCT FROM 'pg_temp';
+      IF cardinality(table_oids) = 0 AND NOT is_full THEN
+        RETURN;
+      END IF;
+      payload := json_build_object('{TABLE_OIDS}', table_oids::bigint[], '{FULL}', is_full)::text;
+      IF length(payload) > {_MAX_PAYLOAD_LENGTH} THEN
+        payload := json_build_object('{TABLE_OIDS}', '{{}}'::bigint[], '{FULL}', true)::text;
+      END IF;
+      PERFORM pg_notify('{DDL_EVENTS_CHANNEL}', payload);
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+    sql_drop_function = f"""
+    CREATE OR REPLACE FUNCTION {SCHEMA}.notify_sql_drop() RETURNS event_trigger AS $$
+    BEGIN
+      IF EXISTS (
+        SELECT 1 FROM pg_event_trigger_dropped_objects() AS d
+        WHERE d.object_type IN ('table', 'schema') AND NOT d.is_temporary
+      ) THEN
+        PERFORM pg_notify(
+          '{DDL_EVENTS_CHANNEL}',
+          json_build_object('{TABLE_OIDS}', '{{}}'::bigint[], '{FULL}', true)::text
+        );
+      END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+    with engine.begin() as conn:
+        # Released when the transaction ends.
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:channel));"),
+            {'channel': DDL_EVENTS_CHANNEL},
+        )
+        conn.execute(text(ddl_command_end_function))
+        conn.execute(text(sql_drop_function))
+        conn.execute(text(f"DROP EVENT TRIGGER IF EXISTS {_DDL_COMMAND_END_TRIGGER};"))
+        conn.execute(text(
+            f"CREATE EVENT TRIGGER {_DDL_COMMAND_END_TRIGGER} ON ddl_command_end"
+            f" EXECUTE FUNCTION {SCHEMA}.notify_ddl_command_end();"
+        ))
+        conn.execute(text(f"DROP EVENT TRIGGER IF EXISTS {_SQL_DROP_TRIGGER};"))
+        conn.execute(text(
+            f"CREATE EVENT TRIGGER {_SQL_DROP_TRIGGER} ON sql_drop"
+            f" EXECUTE FUNCTION {SCHEMA}.notify_sql_drop();"
+        ))
+
+
+def uninstall_ddl_event_triggers(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP EVENT TRIGGER IF EXISTS {_DDL_COMMAND_END_TRIGGER};"))
+        conn.execute(text(f"DROP EVENT TRIGGER IF EXISTS {_SQL_DROP_TRIGGER};"))
+        conn.execute(text(f"DROP FUNCTION IF EXISTS {SCHEMA}.notify_ddl_command_end();"))
+        conn.execute(text(f"DROP FUNCTION IF EXISTS {SCHEMA}.notify_sql_drop();"))
+
+
+def listen_for_ddl_events(engine, on_events, should_stop, poll_interval=1, batch_interval=0.05):
+    """
+    Blocks, listening for DDL event notifications, until should_stop() returns True.
+
+    Notifications arriving within batch_interval seconds of each other are collected and passed
+    to on_events as a single list of payload dicts. should_stop is checked at least every
+    poll_interval seconds.
+    """
+    raw_connection = engine.raw_connection()
+    try:
+        dbapi_connection = raw_connection.connection
+        dbapi_connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{DDL_EVENTS_CHANNEL}";')
+        while not should_stop():
+            if not _wait_for_notifications(dbapi_connection, poll_interval):
+                continue
+            # Collect notifications that arrive in quick succession (e.g. from a multi-statement
+            # migration) into a single batch.
+            while _wait_for_notifications(dbapi_connection, batch_interval):
+                pass
+            events = []
+            while dbapi_connection.notifies:
+                notification = dbapi_connection.notifies.pop(0)
+                try:
+                    events.append(json.loads(notification.payload))
+                except ValueError:
+                    logger.warning(f'Ignoring malformed DDL event payload: {notification.payload}')
+            if events:
+                on_events(events)
+    finally:
+        # The connection is in autocommit mode and LISTENing, so it shouldn't go back to the pool.
+        raw_connection.invalidate()
+
+
+def merge_ddl_events(events):
+    """
+    Merges a list of DDL event payloads into a single (table oids, full) tuple.
+    """
+    table_oids = set()
+    full = False
+    for event in events:
+        table_oids.update(event.get(TABLE_OIDS) or [])
+        full = full or bool(event.get(FULL))
+    return table_oids, full
+
+
+def _wait_for_notifications(dbapi_connection, timeout):
+    """
+    Returns True if notifications were received within timeout seconds.
+    """
+    if select.select([dbapi_connection], [], [], timeout) == ([], [], []):
+        return False
+    dbapi_connection.poll()
+    return len(dbapi_connection.notifies) > 0
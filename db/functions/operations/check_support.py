@@ -1,6 +1,6 @@
 from enum import Enum
 
-from sqlalchemy import select, MetaData, join, literal
+from sqlalchemy import select, join, literal
 
 from db.functions.known_db_functions import known_db_functions
 from db.utils import get_pg_catalog_table
@@ -26,9 +26,8 @@ def _get_functions_defined_on_database(engine):
     qualified function names on the database. E.g.
     `{'mathesar_types.uri_scheme', ..., ...}`.
     """
-    metadata = MetaData()
-    pg_proc = get_pg_catalog_table('pg_proc', engine, metadata=metadata)
-    pg_namespace = get_pg_catalog_table('pg_namespace', engine, metadata=metadata)
+    pg_proc = get_pg_catalog_table('pg_proc', engine)
+    pg_namespace = get_pg_catalog_table('pg_namespace', engine)
     join_statement = join(pg_proc, pg_namespace, pg_proc.c.pronamespace == pg_namespace.c.oid)
     select_statement = (
         select(pg_namespace.c.nspname + literal('.') + pg_proc.c.proname)
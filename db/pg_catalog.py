@@ -0,0 +1,250 @@
+"""
+Static definitions of the Postgres system catalog tables we query.
+
+Autoloading a catalog table takes several introspection queries, and we used to do it on most
+calls that look at the catalog, often into a throwaway MetaData. The definitions below are built
+once per Postgres major version and shared by the whole process.
+
+Columns are those of the catalogs on Postgres 13 and later; columns added in later versions are
+only declared for servers that have them. Types mirror what autoloading would produce, including
+NullType for types SQLAlchemy doesn't recognize, so that query results are the same.
+"""
+import threading
+
+from sqlalchemy import BOOLEAN, Column, INTEGER, MetaData, REAL, SMALLINT, String, Table, TEXT
+from sqlalchemy.dialects.postgresql import ARRAY, BYTEA, OID
+from sqlalchemy.types import NullType
+
+PG_CATALOG_SCHEMA = 'pg_catalog'
+
+# Stand for Postgres' "char" type (and arrays of it), which our engines reflect as
+# db.types.custom.char.CHAR. That module depends on db.utils, which depends on this one, so the
+# type is only looked up when the tables are declared.
+_CHAR = object()
+_CHAR_ARRAY = object()
+
+# Maps catalog table names to lists of (column name, column type, minimum server major version)
+# tuples. A minimum version of None means the column exists on all supported versions.
+_PG_CATALOG_COLUMNS = {
+    'pg_attribute': [
+        ('attrelid', OID, None),
+        ('attname', String, None),
+        ('atttypid', OID, None),
+        ('attlen', SMALLINT, None),
+        ('attnum', SMALLINT, None),
+        ('attcacheoff', INTEGER, None),
+        ('atttypmod', INTEGER, None),
+        ('attndims', SMALLINT, None),
+        ('attbyval', BOOLEAN, None),
+        ('attalign', _CHAR, None),
+        ('attstorage', _CHAR, None),
+        ('attcompression', _CHAR, 14),
+        ('attnotnull', BOOLEAN, None),
+        ('atthasdef', BOOLEAN, None),
+        ('atthasmissing', BOOLEAN, None),
+        ('attidentity', _CHAR, None),
+        ('attgenerated', _CHAR, None),
+        ('attisdropped', BOOLEAN, None),
+        ('attislocal', BOOLEAN, None),
+        ('attinhcount', SMALLINT, None),
+        ('attstattarget', SMALLINT, None),
+        ('attcollation', OID, None),
+        ('attacl', NullType, None),
+        ('attoptions', ARRAY(TEXT), None),
+        ('attfdwoptions', ARRAY(TEXT), None),
+        ('attmissingval', NullType, None),
+    ],
+    'pg_class': [
+        ('oid', OID, None),
+        ('relname', String, None),
+        ('relnamespace', OID, None),
+        ('reltype', OID, None),
+        ('reloftype', OID, None),
+        ('relowner', OID, None),
+        ('relam', OID, None),
+        ('relfilenode', OID, None),
+        ('reltablespace', OID, None),
+        ('relpages', INTEGER, None),
+        ('reltuples', REAL, None),
+        ('relallvisible', INTEGER, None),
+        ('reltoastrelid', OID, None),
+        ('relhasindex', BOOLEAN, None),
+        ('relisshared', BOOLEAN, None),
+        ('relpersistence', _CHAR, None),
+        ('relkind', _CHAR, None),
+        ('relnatts', SMALLINT, None),
+        ('relchecks', SMALLINT, None),
+        ('relhasrules', BOOLEAN, None),
+        ('relhastriggers', BOOLEAN, None),
+        ('relhassubclass', BOOLEAN, None),
+        ('relrowsecurity', BOOLEAN, None),
+        ('relforcerowsecurity', BOOLEAN, None),
+        ('relispopulated', BOOLEAN, None),
+        ('relreplident', _CHAR, None),
+        ('relispartition', BOOLEAN, None),
+        ('relrewrite', OID, None),
+        ('relfrozenxid', NullType, None),
+        ('relminmxid', NullType, None),
+        ('relacl', NullType, None),
+        ('reloptions', ARRAY(TEXT), None),
+        ('relpartbound', NullType, None),
+    ],
+    'pg_constraint': [
+        ('oid', OID, None),
+        ('conname', String, None),
+        ('connamespace', OID, None),
+        ('contype', _CHAR, None),
+        ('condeferrable', BOOLEAN, None),
+        ('condeferred', BOOLEAN, None),
+        ('convalidated', BOOLEAN, None),
+        ('conrelid', OID, None),
+        ('contypid', OID, None),
+        ('conindid', OID, None),
+        ('conparentid', OID, None),
+        ('confrelid', OID, None),
+        ('confupdtype', _CHAR, None),
+        ('confdeltype', _CHAR, None),
+        ('confmatchtype', _CHAR, None),
+        ('conislocal', BOOLEAN, None),
+        ('coninhcount', SMALLINT, None),
+        ('connoinherit', BOOLEAN, None),
+        ('conkey', ARRAY(SMALLINT), None),
+        ('confkey', ARRAY(SMALLINT), None),
+        ('conpfeqop', ARRAY(OID), None),
+        ('conppeqop', ARRAY(OID), None),
+        ('conffeqop', ARRAY(OID), None),
+        ('confdelsetcols', ARRAY(SMALLINT), 15),
+        ('conexclop', ARRAY(OID), None),
+        ('conbin', NullType, None),
+    ],
+    'pg_depend': [
+        ('classid', OID, None),
+        ('objid', OID, None),
+        ('objsubid', INTEGER, None),
+        ('refclassid', OID, None),
+        ('refobjid', OID, None),
+        ('refobjsubid', INTEGER, None),
+        ('deptype', _CHAR, None),
+    ],
+    'pg_namespace': [
+        ('oid', OID, None),
+        ('nspname', String, None),
+        ('nspowner', OID, None),
+        ('nspacl', NullType, None),
+    ],
+    'pg_proc': [
+        ('oid', OID, None),
+        ('proname', String, None),
+        ('pronamespace', OID, None),
+        ('proowner', OID, None),
+        ('prolang', OID, None),
+        ('procost', REAL, None),
+        ('prorows', REAL, None),
+        ('provariadic', OID, None),
+        ('prosupport', NullType, None),
+        ('prokind', _CHAR, None),
+        ('prosecdef', BOOLEAN, None),
+        ('proleakproof', BOOLEAN, None),
+        ('proisstrict', BOOLEAN, None),
+        ('proretset', BOOLEAN, None),
+        ('provolatile', _CHAR, None),
+        ('proparallel', _CHAR, None),
+        ('pronargs', SMALLINT, None),
+        ('pronargdefaults', SMALLINT, None),
+        ('prorettype', OID, None),
+        ('proargtypes', NullType, None),
+        ('proallargtypes', ARRAY(OID), None),
+        ('proargmodes', _CHAR_ARRAY, None),
+        ('proargnames', ARRAY(TEXT), None),
+        ('proargdefaults', NullType, None),
+        ('protrftypes', ARRAY(OID), None),
+        ('prosrc', TEXT, None),
+        ('probin', TEXT, None),
+        ('prosqlbody', NullType, 14),
+        ('proconfig', ARRAY(TEXT), None),
+        ('proacl', NullType, None),
+    ],
+    'pg_rewrite': [
+        ('oid', OID, None),
+        ('rulename', String, None),
+        ('ev_class', OID, None),
+        ('ev_type', _CHAR, None),
+        ('ev_enabled', _CHAR, None),
+        ('is_instead', BOOLEAN, None),
+        ('ev_qual', NullType, None),
+        ('ev_action', NullType, None),
+    ],
+    'pg_trigger': [
+        ('oid', OID, None),
+        ('tgrelid', OID, None),
+        ('tgparentid', OID, 13),
+        ('tgname', String, None),
+        ('tgfoid', OID, None),
+        ('tgtype', SMALLINT, None),
+        ('tgenabled', _CHAR, None),
+        ('tgisinternal', BOOLEAN, None),
+        ('tgconstrrelid', OID, None),
+        ('tgconstrindid', OID, None),
+        ('tgconstraint', OID, None),
+        ('tgdeferrable', BOOLEAN, None),
+        ('tginitdeferred', BOOLEAN, None),
+        ('tgnargs', SMALLINT, None),
+        ('tgattr', NullType, None),
+        ('tgargs', BYTEA, None),
+        ('tgqual', NullType, None),
+        ('tgoldtable', String, None),
+        ('tgnewtable', String, None),
+    ],
+}
+
+
+def is_pg_catalog_table_declared(table_name):
+    return table_name in _PG_CATALOG_COLUMNS
+
+
+def get_declared_pg_catalog_table(table_name, engine):
+    """
+    Returns the static definition of the given catalog table that matches the engine's server
+    version. Raises a KeyError if the table isn't declared in this module.
+    """
+    server_major_version = _get_server_major_version(engine)
+    tables = _tables_by_server_major_version.get(server_major_version)
+    if tables is None:
+        with _tables_lock:
+            tables = _tables_by_server_major_version.get(server_major_version)
+            if tables is None:
+                tables = _declare_pg_catalog_tables(server_major_version)
+                _tables_by_server_major_version[server_major_version] = tables
+    return tables[table_name]
+
+
+def _get_server_major_version(engine):
+    # The dialect only learns the server version when the engine first connects.
+    if getattr(engine.dialect, 'server_version_info', None) is None:
+        with engine.connect():
+            pass
+    return engine.dialect.server_version_info[0]
+
+
+def _declare_pg_catalog_tables(server_major_version):
+    from db.types.custom.char import CHAR
+    placeholder_types = {_CHAR: CHAR, _CHAR_ARRAY: ARRAY(CHAR)}
+    metadata = MetaData()
+    return {
+        table_name: Table(
+            table_name,
+            metadata,
+            *[
+                Column(column_name, placeholder_types.get(column_type, column_type))
+                for column_name, column_type, min_version in columns
+                if min_version is None or server_major_version >= min_version
+            ],
+            schema=PG_CATALOG_SCHEMA,
+        )
+        for table_name, columns in _PG_CATALOG_COLUMNS.items()
+    }
+
+
+# Maps server major versions to dicts of catalog table names to Tables.
+_tables_by_server_major_version = {}
+_tables_lock = threading.Lock()
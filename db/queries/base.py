@@ -6,6 +6,7 @@ from db.columns.base import MathesarColumn
 from db.columns.operations.select import get_column_name_from_attnum
 from db.tables.operations.select import reflect_table_from_oid
 from db.transforms.operations.apply import apply_transformations
+from db.transforms.operations.cache import get_or_build_relation, get_relation_cache_key
 from db.transforms.base import Order
 from db.metadata import get_empty_metadata
 
@@ -21,7 +22,11 @@ class DBQuery:
             # The same metadata will be used by all the methods within DBQuery
             # So make sure to change the metadata in case the DBQuery methods are called
             # after a mutation to the database object that could make the existing metadata invalid.
-            metadata=None
+            metadata=None,
+            # A function that maps the given table oids to their fingerprints, e.g. as of their last
+            # reflection, so that caching relations doesn't take a catalog query (see
+            # db.transforms.operations.cache).
+            get_table_fingerprints=None,
     ):
         self.base_table_oid = base_table_oid
         for initial_col in initial_columns:
@@ -34,6 +39,7 @@ class DBQuery:
         self.transformations = transformations
         self.name = name
         self.metadata = metadata if metadata else get_empty_metadata()
+        self.get_table_fingerprints = get_table_fingerprints
 
     def get_input_aliases(self, ix_of_transform):
         """
@@ -113,10 +119,12 @@ class DBQuery:
         that would override the transformation).
         """
         fallback_to_default_ordering = not self._is_sorting_transform_used
+        transformed_relation, relation_cache_key = self._get_transformed_relation_and_cache_key()
         return records_select.get_records(
-            table=self.transformed_relation,
+            table=transformed_relation,
             engine=self.engine,
             fallback_to_default_ordering=fallback_to_default_ordering,
+            relation_cache_key=relation_cache_key,
             **kwargs,
         )
 
@@ -158,7 +166,8 @@ class DBQuery:
                 initial_columns=self.initial_columns,
                 engine=self.engine,
                 transformations=self.transformations[:i],
-                name=f'{self.name}_{i}'
+                name=f'{self.name}_{i}',
+                get_table_fingerprints=self.get_table_fingerprints,
             ).transformed_relation.columns
         }
         map_of_alias_to_sa_col = initial_columns_map | transforms_columns_map | output_columns_map
@@ -181,8 +190,33 @@ class DBQuery:
         """
         A query describes a relation. This property is the result of parsing a
         query into a relation.
+
+        Relations are cached across DBQuery instances; see db.transforms.operations.cache.
         """
-        transformations = self.transformations
+        transformed_relation, _ = self._get_transformed_relation_and_cache_key()
+        return transformed_relation
+
+    def _get_transformed_relation_and_cache_key(self):
+        table_oids = self._referenced_table_oids
+        relation_cache_key = get_relation_cache_key(
+            self.engine,
+            table_oids,
+            self.initial_columns,
+            self.transformations,
+            table_fingerprints=(
+                self.get_table_fingerprints(table_oids) if self.get_table_fingerprints else None
+            ),
+        )
+        transformed_relation = get_or_build_relation(
+            relation_cache_key,
+            self._build_transformed_relation,
+            self.initial_columns,
+            self.transformations,
+        )
+        return transformed_relation, relation_cache_key
+
+    def _build_transformed_relation(self, initial_columns, transformations):
+        # Initial columns hold no values, so they're always those of this query.
         if transformations:
             transformed = apply_transformations(
                 self.initial_relation,
@@ -192,6 +226,15 @@ class DBQuery:
         else:
             return self.initial_relation
 
+    @property
+    def _referenced_table_oids(self):
+        table_oids = {self.base_table_oid}
+        for initial_column in self.initial_columns:
+            table_oids.add(initial_column.reloid)
+            for join_parameter in initial_column.jp_path:
+                table_oids.update((join_parameter.left_oid, join_parameter.right_oid))
+        return table_oids
+
     @property
     def initial_relation(self):
         metadata = self.metadata
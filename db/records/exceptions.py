@@ -32,3 +32,21 @@ class BadSortFormat(Exception):
 
 class SortFieldNotFound(Exception):
     pass
+
+
+class BadSeekFormat(Exception):
+    pass
+
+
+class RecordNotFound(Exception):
+    pass
+
+
+class BulkRecordOperationsError(Exception):
+    """
+    Raised when applying bulk record operations fails. errors maps the indices of the operations
+    that failed to their exceptions.
+    """
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
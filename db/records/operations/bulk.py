@@ -0,0 +1,177 @@
+"""
+Applying many inserts, updates and deletes to the records of a table, in one transaction.
+
+Consecutive operations of the same kind (and, for inserts and updates, on the same columns) are
+batched, and each batch is applied by a single INSERT ... RETURNING, UPDATE ... FROM (VALUES ...)
+RETURNING or DELETE ... USING (VALUES ...) RETURNING statement, rather than by a statement and a
+read per record.
+"""
+from sqlalchemy import cast, column, delete, literal, values
+from sqlalchemy.exc import DBAPIError
+
+from db.records.exceptions import BulkRecordOperationsError, RecordNotFound
+from db.records.utils import get_returned_record
+from db.tables.utils import get_primary_key_column
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+OPERATION_TYPES = (INSERT, UPDATE, DELETE)
+
+# The most records a single statement inserts, updates or deletes.
+BATCH_SIZE = 1000
+
+
+def apply_record_operations(table, engine, operations):
+    """
+    Applies the given operations in order, and returns a result for each of them: the inserted or
+    updated record (a dict of column names to values), or the primary key of the deleted record.
+
+    Each operation is a dict with a 'type' (one of OPERATION_TYPES), the 'id' of the record to
+    update or delete, and the 'record' to insert, or to update the record with (a dict of column
+    names to values).
+
+    Either all operations are applied or none is. If any fails (including updates and deletes of
+    records that don't exist), BulkRecordOperationsError is raised, with the errors of the
+    operations of the batch that failed.
+    """
+    results = [None] * len(operations)
+    with engine.begin() as connection:
+        for batch in _get_batches(operations):
+            batch_operations = [operations[index] for index in batch]
+            try:
+                # A savepoint, so that the failing operations can be found by retrying the batch.
+                with connection.begin_nested():
+                    batch_results = _apply_batch(table, connection, batch_operations)
+            except DBAPIError as e:
+                raise BulkRecordOperationsError(_find_errors(table, connection, batch, operations, e))
+            errors = {
+                index: RecordNotFound(operations[index]['id'])
+                for index, result in zip(batch, batch_results)
+                if result is None
+            }
+            if errors:
+                raise BulkRecordOperationsError(errors)
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+    return results
+
+
+def _get_batches(operations):
+    """
+    Yields lists of the indices of operations that can be applied by a single statement.
+    """
+    batch = []
+    batch_key = None
+    batch_ids = set()
+    for index, operation in enumerate(operations):
+        key = (operation['type'], frozenset(operation.get('record', {})))
+        # Updating or deleting a record twice in the same statement would only apply one of them.
+        id_value = operation.get('id')
+        is_repeated = operation['type'] != INSERT and id_value in batch_ids
+        if batch and (key != batch_key or is_repeated or len(batch) == BATCH_SIZE):
+            yield batch
+            batch = []
+            batch_ids = set()
+        batch.append(index)
+        batch_key = key
+        if operation['type'] != INSERT:
+            batch_ids.add(id_value)
+    if batch:
+        yield batch
+
+
+def _apply_batch(table, connection, operations):
+    """
+    Returns a result per operation, which is None for updates and deletes of missing records.
+    """
+    operation_type = operations[0]['type']
+    if operation_type == INSERT:
+        return _insert_records(table, connection, [operation['record'] for operation in operations])
+    elif operation_type == UPDATE:
+        return _update_records(table, connection, operations)
+    elif operation_type == DELETE:
+        return _delete_records(table, connection, [operation['id'] for operation in operations])
+    raise ValueError(f'Unknown record operation type: {operation_type}')
+
+
+def _find_errors(table, connection, batch, operations, batch_exception):
+    """
+    Applies the operations of a failed batch one by one, to find which of them fail.
+    """
+    errors = {}
+    for index in batch:
+        try:
+            with connection.begin_nested():
+                _apply_batch(table, connection, [operations[index]])
+        except DBAPIError as e:
+            errors[index] = e
+    # The batch may fail even when each of its operations succeeds on its own (e.g. if it violates
+    # a deferred constraint), in which case the whole batch is to blame.
+    return errors or {index: batch_exception for index in batch}
+
+
+def _insert_records(table, connection, records):
+    if not records[0]:
+        # Every column gets its default.
+        rows = [connection.execute(table.insert().returning(*table.c)).one() for _ in records]
+    else:
+        # Postgres returns the rows inserted by INSERT ... VALUES in the order of the VALUES.
+        rows = connection.execute(table.insert().values(records).returning(*table.c))
+    return [get_returned_record(table, row) for row in rows]
+
+
+def _update_records(table, connection, operations):
+    primary_key_column = get_primary_key_column(table)
+    column_names = list(operations[0]['record'])
+    # The values are cast to the types of their columns, since Postgres can't infer them from a
+    # VALUES list. Operations are identified by their position, rather than by the primary keys
+    # of the updated records, whose values may not compare equal to the given ids.
+    record_values = values(
+        column('position'),
+        column('id'),
+        *[column(f'value_{i}') for i in range(len(column_names))],
+        name='record_values',
+    ).data([
+        (
+            literal(position),
+            cast(operation['id'], primary_key_column.type),
+            *[
+                cast(operation['record'][column_name], table.c[column_name].type)
+                for column_name in column_names
+            ],
+        )
+        for position, operation in enumerate(operations)
+    ])
+    query = (
+        table.update()
+        .where(primary_key_column == record_values.c.id)
+        .values({
+            column_name: record_values.c[f'value_{i}']
+            for i, column_name in enumerate(column_names)
+        })
+        .returning(record_values.c.position, *table.c)
+    )
+    results = [None] * len(operations)
+    for position, *record in connection.execute(query):
+        results[position] = get_returned_record(table, record)
+    return results
+
+
+def _delete_records(table, connection, id_values):
+    primary_key_column = get_primary_key_column(table)
+    record_values = values(
+        column('position'), column('id'), name='record_values'
+    ).data([
+        (literal(position), cast(id_value, primary_key_column.type))
+        for position, id_value in enumerate(id_values)
+    ])
+    query = (
+        delete(table)
+        .where(primary_key_column == record_values.c.id)
+        .returning(record_values.c.position)
+    )
+    results = [None] * len(id_values)
+    for position, in connection.execute(query):
+        results[position] = id_values[position]
+    return results
@@ -0,0 +1,130 @@
+import queue
+import threading
+
+from psycopg2 import sql
+from sqlalchemy import select
+
+from db.transforms.operations.apply import apply_transformations_deprecated
+
+# Postgres hands out COPY output a row at a time; rows are buffered into chunks of about this
+# many bytes before being passed on.
+COPY_CHUNK_SIZE = 2 ** 16
+# How many chunks may be buffered while waiting for the consumer.
+COPY_QUEUE_SIZE = 16
+COPY_QUEUE_POLL_INTERVAL = 0.1
+
+
+def export_records_to_csv(table, engine, order_by=None, filter=None, search=None, duplicate_only=None):
+    """
+    Returns a generator of bytes chunks that make up the records of a table as CSV (with a
+    header), in the same order as get_records (with fallback_to_default_ordering) would return
+    them. The CSV is written by Postgres itself with COPY ... TO STDOUT, which is much faster than
+    encoding the records in Python.
+
+    The transformation arguments are those of db.records.operations.select.get_records.
+    Exceptions raised while building the query are raised by this function, and those raised
+    while running it are raised by the generator.
+    """
+    if order_by is None:
+        order_by = []
+    if search is None:
+        search = []
+    relation = apply_transformations_deprecated(
+        table=table,
+        order_by=order_by,
+        fallback_to_default_ordering=True,
+        filter=filter,
+        search=search,
+        duplicate_only=duplicate_only,
+    )
+    return _get_copy_to_chunks(engine, select(relation))
+
+
+def _get_copy_to_chunks(engine, query):
+    # psycopg2 only writes COPY output to a file object, without giving back control in between.
+    # So, the COPY runs on another thread, which passes the output on through a bounded queue.
+    chunks = queue.Queue(maxsize=COPY_QUEUE_SIZE)
+    stopped = threading.Event()
+    thread = threading.Thread(
+        target=_copy_to_queue, args=(engine, query, chunks, stopped), daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            elif isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # Also reached when the consumer stops early, in which case the COPY is aborted.
+        stopped.set()
+        thread.join()
+
+
+def _copy_to_queue(engine, query, chunks, stopped):
+    try:
+        with engine.connect() as connection:
+            compiled_query = query.compile(dialect=engine.dialect)
+            cursor = connection.connection.cursor()
+            copy_sql = sql.SQL("COPY ({query}) TO STDOUT WITH CSV HEADER").format(
+                query=sql.SQL(cursor.mogrify(str(compiled_query), compiled_query.params).decode())
+            )
+            writer = _QueueWriter(chunks, stopped)
+            try:
+                cursor.copy_expert(copy_sql, writer)
+                writer.flush()
+            except _CopyStopped:
+                # The connection is left mid-COPY, so it can't be returned to the pool.
+                connection.invalidate()
+                return
+    except Exception as e:
+        _put(chunks, stopped, e)
+    else:
+        _put(chunks, stopped, None)
+
+
+class _CopyStopped(Exception):
+    pass
+
+
+class _QueueWriter:
+    """
+    A write-only file object that passes what's written to it on to a queue, in chunks of about
+    COPY_CHUNK_SIZE bytes.
+    """
+
+    def __init__(self, chunks, stopped):
+        self._chunks = chunks
+        self._stopped = stopped
+        self._buffer = []
+        self._buffer_size = 0
+
+    def write(self, data):
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+        if self._buffer_size >= COPY_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            if not _put(self._chunks, self._stopped, b''.join(self._buffer)):
+                raise _CopyStopped()
+            self._buffer = []
+            self._buffer_size = 0
+
+
+def _put(chunks, stopped, item):
+    """
+    Puts the item on the queue once there's room, unless the consumer stopped first. Returns
+    whether the item was put.
+    """
+    while not stopped.is_set():
+        try:
+            chunks.put(item, timeout=COPY_QUEUE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
@@ -1,5 +1,4 @@
 from enum import Enum
-import json
 import logging
 from sqlalchemy import select, func, and_, case, literal, cast, TEXT, extract
 
@@ -554,43 +553,25 @@ def _get_group_metadata_definition(
     ).label(MATHESAR_GROUP_METADATA)
 
 
-def extract_group_metadata(
-        record_dictionaries, data_key='data', metadata_key='metadata',
-):
+def extract_group_metadata(record_mappings):
     """
-    This function takes an iterable of record dictionaries with record data and
-    record metadata, and moves the group metadata from the data section to the
-    metadata section.
+    This function takes an iterable of record mappings (e.g. dicts of the rows' columns) and pops
+    the group metadata out of each.
+
+    Returns the metadata of each record (its group id, or None if the record has no group
+    metadata), and the distinct groups ordered by id (or None if no record has group metadata).
     """
-    def _get_record_pieces(record):
-        data = {
-            k: v for k, v in record[data_key].items()
-            if k != MATHESAR_GROUP_METADATA
-        }
-        group_metadata = record[data_key].get(MATHESAR_GROUP_METADATA, {})
+    group_id_key = GroupMetadataField.GROUP_ID.value
+    record_metadata = []
+    groups_by_id = {}
+    for record in record_mappings:
+        group_metadata = record.pop(MATHESAR_GROUP_METADATA, None)
         if group_metadata:
-            metadata = (
-                record.get(metadata_key, {})
-                | {
-                    GroupMetadataField.GROUP_ID.value: group_metadata.get(
-                        GroupMetadataField.GROUP_ID.value
-                    )
-                }
-            )
+            group_id = group_metadata.get(group_id_key)
+            record_metadata.append({group_id_key: group_id})
+            groups_by_id.setdefault(group_id, group_metadata)
         else:
-            metadata = record.get(metadata_key)
-        return (
-            {data_key: data, metadata_key: metadata},
-            group_metadata if group_metadata else None
-        )
-
-    record_tup, group_tup = zip(
-        *(_get_record_pieces(record) for record in record_dictionaries)
-    )
-
-    reduced_groups = sorted(
-        [json.loads(blob) for blob in set([json.dumps(group) for group in group_tup])],
-        key=lambda x: x[GroupMetadataField.GROUP_ID.value] if x else None
-    )
-
-    return list(record_tup), reduced_groups if reduced_groups != [None] else None
+            record_metadata.append(None)
+    if len(groups_by_id) == 0:
+        return record_metadata, None
+    return record_metadata, [groups_by_id[group_id] for group_id in sorted(groups_by_id)]
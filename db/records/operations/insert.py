@@ -1,4 +1,7 @@
+import codecs
+import os
 import tempfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 
 from psycopg2 import sql
 from sqlalchemy.exc import IntegrityError, ProgrammingError
@@ -6,63 +9,49 @@ from psycopg2.errors import NotNullViolation, ForeignKeyViolation, DatatypeMisma
 from db.columns.exceptions import NotNullError, ForeignKeyError, TypeMismatchError, UniqueValueError, ExclusionError
 from db.columns.base import MathesarColumn
 from db.encoding_utils import get_sql_compatible_encoding
-from db.records.operations.select import get_record
+from db.records.utils import get_returned_record
 from sqlalchemy import select
 
 READ_SIZE = 20000
+# In seconds; how often insert_records_from_csv_chunks reports its progress.
+PROGRESS_INTERVAL = 1
+# Encodings in which the bytes of ASCII characters (e.g. line breaks and quotes) can also be part of
+# other characters, so that files in them can't be split by looking for those bytes.
+_ASCII_UNSAFE_ENCODINGS = {
+    'big5', 'cp949', 'gb18030', 'gbk', 'johab', 'shift_jis', 'shift_jis_2004',
+}
 
 
 def insert_record_or_records(table, engine, record_data):
     """
     record_data can be a dictionary, tuple, or list of dictionaries or tuples.
     if record_data is a list, it creates multiple records.
+
+    A single record (a dictionary) is returned by the INSERT itself, as a dict of column names to
+    values, rather than read again after committing.
     """
-    id_value = None
     with engine.begin() as connection:
-        result = connection.execute(table.insert(), record_data)
-        # If there was only a single record created, return the record.
-        if result.rowcount == 1:
-            # We need to manually commit insertion so that we can retrieve the record.
-            connection.commit()
-            id_value = result.inserted_primary_key[0]
-            if id_value is not None:
-                return get_record(table, engine, id_value)
+        if isinstance(record_data, dict):
+            # Passing the record as parameters (rather than to values()) makes an empty record
+            # insert DEFAULT VALUES.
+            row = connection.execute(table.insert().returning(*table.c), record_data).one()
+            return get_returned_record(table, row)
+        connection.execute(table.insert(), record_data)
     # Do not return any records if multiple rows were added.
     return None
 
 
-def insert_records_from_csv(table, engine, csv_filepath, column_names, header, delimiter=None, escape=None, quote=None, encoding=None):
+def insert_records_from_csv(
+    table, engine, csv_filepath, column_names, header, delimiter=None, escape=None, quote=None,
+    encoding=None, prepare_connection=None,
+):
     with open(csv_filepath, "r", encoding=encoding) as csv_file:
         with engine.begin() as conn:
+            if prepare_connection is not None:
+                prepare_connection(conn, 0)
             cursor = conn.connection.cursor()
-            # We should convert our entire query to sql.SQL class in order to keep its original header's name
-            # When we call sql.Indentifier which will return a Identifier class (based on sql.Composable)
-            # instead of a String. So we have to convert our punctuations to sql.Composable using sql.SQL
-            relation = sql.SQL(".").join(
-                sql.Identifier(part) for part in (table.schema, table.name)
-            )
-            formatted_columns = sql.SQL(",").join(
-                sql.Identifier(column_name) for column_name in column_names
-            )
             conversion_encoding, sql_encoding = get_sql_compatible_encoding(encoding)
-            copy_sql = sql.SQL(
-                "COPY {relation} ({formatted_columns}) FROM STDIN CSV {header} {delimiter} {escape} {quote} {encoding}"
-            ).format(
-                relation=relation,
-                formatted_columns=formatted_columns,
-                # If HEADER is not None, we'll pass its value to our entire SQL query
-                header=sql.SQL("HEADER" if header else ""),
-                # If DELIMITER is not None, we'll pass its value to our entire SQL query
-                delimiter=sql.SQL(f"DELIMITER E'{delimiter}'" if delimiter else ""),
-                # If ESCAPE is not None, we'll pass its value to our entire SQL query
-                escape=sql.SQL(f"ESCAPE '{escape}'" if escape else ""),
-                quote=sql.SQL(
-                    ("QUOTE ''''" if quote == "'" else f"QUOTE '{quote}'")
-                    if quote
-                    else ""
-                ),
-                encoding=sql.SQL(f"ENCODING '{sql_encoding}'" if sql_encoding else ""),
-            )
+            copy_sql = _get_copy_sql(table, column_names, header, delimiter, escape, quote, sql_encoding)
             if conversion_encoding == encoding:
                 cursor.copy_expert(copy_sql, csv_file)
             else:
@@ -76,6 +65,179 @@ def insert_records_from_csv(table, engine, csv_filepath, column_names, header, d
                         temp_file.write(contents)
                     temp_file.seek(0)
                     cursor.copy_expert(copy_sql, temp_file)
+            return cursor.rowcount
+
+
+def insert_records_from_csv_chunks(
+    table,
+    engine,
+    csv_filepath,
+    column_names,
+    header,
+    delimiter=None,
+    escape=None,
+    quote=None,
+    encoding=None,
+    chunk_size=None,
+    max_workers=1,
+    prepare_connection=None,
+    on_progress=None,
+):
+    """
+    Like insert_records_from_csv, but splits the file into chunks of about chunk_size bytes (on
+    record boundaries), and copies up to max_workers of them at a time, each over a connection of
+    its own. Each chunk is committed on its own, so the table should be a staging table that's
+    dropped if this fails. Files that can't be split are copied whole.
+
+    If prepare_connection is given, it's called with the connection each chunk is copied over and
+    the index of the chunk, before copying it (e.g. to set up a column default that records the
+    chunk of each row, since the rows of chunks copied concurrently are interleaved).
+
+    on_progress is called on the calling thread, every PROGRESS_INTERVAL seconds and when done,
+    with the number of bytes of the file read and the number of rows copied so far.
+
+    Returns the numbers of rows copied from each chunk, in order.
+    """
+    conversion_encoding, sql_encoding = get_sql_compatible_encoding(encoding)
+    normalized_encoding = codecs.lookup(encoding).name
+    can_split = (
+        chunk_size
+        and max_workers > 1
+        # Files that have to be converted to another encoding are copied whole. ASCII is UTF-8.
+        and normalized_encoding in (conversion_encoding, 'ascii')
+        and normalized_encoding not in _ASCII_UNSAFE_ENCODINGS
+        and (not quote or len(quote.encode()) == 1)
+        and (not escape or escape == (quote or '"'))
+    )
+    if not can_split:
+        num_rows = insert_records_from_csv(
+            table, engine, csv_filepath, column_names, header, delimiter=delimiter,
+            escape=escape, quote=quote, encoding=encoding, prepare_connection=prepare_connection,
+        )
+        if on_progress is not None:
+            on_progress(os.path.getsize(csv_filepath), num_rows)
+        return [num_rows]
+    chunks = get_csv_chunks(csv_filepath, chunk_size, quote=quote)
+    # Each chunk's counts are only updated by the thread copying it.
+    bytes_read = [0] * len(chunks)
+    rows_copied = [0] * len(chunks)
+
+    def _copy_chunk(index):
+        start, end = chunks[index]
+        copy_sql = _get_copy_sql(
+            table, column_names, header and index == 0, delimiter, escape, quote, sql_encoding
+        )
+        with open(csv_filepath, "rb") as csv_file, engine.begin() as conn:
+            if prepare_connection is not None:
+                prepare_connection(conn, index)
+            csv_file.seek(start)
+            cursor = conn.connection.cursor()
+            cursor.copy_expert(copy_sql, _FileChunk(csv_file, end - start, bytes_read, index))
+            rows_copied[index] = cursor.rowcount
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        not_done = [executor.submit(_copy_chunk, index) for index in range(len(chunks))]
+        while not_done:
+            done, not_done = wait(not_done, timeout=PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    for not_done_future in not_done:
+                        not_done_future.cancel()
+                    raise future.exception()
+            if on_progress is not None:
+                on_progress(sum(bytes_read), sum(rows_copied))
+    return rows_copied
+
+
+def get_csv_chunks(csv_filepath, chunk_size, quote=None):
+    """
+    Returns the (start, end) byte offsets of consecutive chunks of the CSV file, of at least
+    chunk_size bytes each (except for the last one), that end on record boundaries: on line breaks
+    that aren't within quoted values.
+
+    The file has to be in an encoding in which the bytes of line breaks and of the quote character
+    only ever encode those characters (e.g. UTF-8), and quotes within quoted values have to be
+    escaped by doubling them.
+    """
+    quote = (quote or '"').encode()
+    boundaries = [0]
+    in_quotes = False
+    # The offset of the current block in the file.
+    position = 0
+    next_boundary = chunk_size
+    with open(csv_filepath, "rb") as csv_file:
+        while True:
+            block = csv_file.read(READ_SIZE)
+            if not block:
+                break
+            index = 0
+            while position + len(block) > next_boundary:
+                newline_index = block.find(b'\n', max(next_boundary - position, index))
+                if newline_index == -1:
+                    break
+                # Each quote opens or closes a quoted value (an escaped quote does both).
+                if block.count(quote, index, newline_index) % 2 == 1:
+                    in_quotes = not in_quotes
+                index = newline_index + 1
+                if not in_quotes:
+                    boundaries.append(position + index)
+                    next_boundary = position + index + chunk_size
+            if block.count(quote, index) % 2 == 1:
+                in_quotes = not in_quotes
+            position += len(block)
+    if boundaries[-1] < position or position == 0:
+        boundaries.append(position)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+class _FileChunk:
+    """
+    A file-like object that reads at most size bytes from the current position of a binary file,
+    and adds the number of bytes read to bytes_read[index].
+    """
+    def __init__(self, file, size, bytes_read, index):
+        self.file = file
+        self.remaining = size
+        self.bytes_read = bytes_read
+        self.index = index
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        self.bytes_read[self.index] += len(data)
+        return data
+
+
+def _get_copy_sql(table, column_names, header, delimiter, escape, quote, sql_encoding):
+    # We should convert our entire query to sql.SQL class in order to keep its original header's name
+    # When we call sql.Indentifier which will return a Identifier class (based on sql.Composable)
+    # instead of a String. So we have to convert our punctuations to sql.Composable using sql.SQL
+    relation = sql.SQL(".").join(
+        sql.Identifier(part) for part in (table.schema, table.name)
+    )
+    formatted_columns = sql.SQL(",").join(
+        sql.Identifier(column_name) for column_name in column_names
+    )
+    return sql.SQL(
+        "COPY {relation} ({formatted_columns}) FROM STDIN CSV {header} {delimiter} {escape} {quote} {encoding}"
+    ).format(
+        relation=relation,
+        formatted_columns=formatted_columns,
+        # If HEADER is not None, we'll pass its value to our entire SQL query
+        header=sql.SQL("HEADER" if header else ""),
+        # If DELIMITER is not None, we'll pass its value to our entire SQL query
+        delimiter=sql.SQL(f"DELIMITER E'{delimiter}'" if delimiter else ""),
+        # If ESCAPE is not None, we'll pass its value to our entire SQL query
+        escape=sql.SQL(f"ESCAPE '{escape}'" if escape else ""),
+        quote=sql.SQL(
+            ("QUOTE ''''" if quote == "'" else f"QUOTE '{quote}'")
+            if quote
+            else ""
+        ),
+        encoding=sql.SQL(f"ENCODING '{sql_encoding}'" if sql_encoding else ""),
+    )
 
 
 def insert_from_select(from_table, target_table, engine, col_mappings=None):
@@ -1,12 +1,16 @@
-from sqlalchemy import select
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.ext import compiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.sql.functions import count
 
 from db.columns.base import MathesarColumn
 from db.tables.utils import get_primary_key_column
 from db.types.operations.cast import get_column_cast_expression
 from db.types.operations.convert import get_db_type_enum_from_id
-from db.utils import execute_pg_query
-from db.transforms.operations.apply import apply_transformations_deprecated
+from db.utils import execute_pg_query, get_pg_catalog_table
+from db.transforms import base as transforms_base
+from db.transforms.operations.apply import apply_transformations, apply_transformations_deprecated
+from db.transforms.operations.cache import get_derived_relation_cache_key, get_or_build_relation
 
 
 def get_record(table, engine, id_value):
@@ -29,6 +33,9 @@ def get_records(
     search=None,
     duplicate_only=None,
     fallback_to_default_ordering=False,
+    seek_after=None,
+    connection_to_use=None,
+    relation_cache_key=None,
 ):
     """
     Returns annotated records from a table.
@@ -49,26 +56,89 @@ def get_records(
         group_by:        group.GroupBy object
         duplicate_only:  list of column names; only rows that have duplicates across those rows
                          will be returned
+        seek_after:      list of values of the sort key (see sort.get_sort_key_names) of the
+                         row after which to start; an alternative to offset
+        connection_to_use: SQLAlchemy connection to run the query on, instead of a new one
+        relation_cache_key: the key `table` is cached by, if any (see
+                         db.transforms.operations.cache); when given, the transformed relation
+                         is cached too, without the offset and limit, so that it's shared
+                         between pages.
     """
     if order_by is None:
         order_by = []
     if search is None:
         search = []
-    relation = apply_transformations_deprecated(
-        table=table,
-        limit=limit,
-        offset=offset,
+    # The search transform takes the limit into account, so the limit and offset can only be
+    # applied separately without one.
+    paginate_separately = relation_cache_key is not None and not search
+    relation_kwargs = dict(
         order_by=order_by,
         fallback_to_default_ordering=fallback_to_default_ordering,
         filter=filter,
         group_by=group_by,
         search=search,
         duplicate_only=duplicate_only,
+        seek_after=seek_after,
+    )
+    if not paginate_separately:
+        relation_kwargs.update(limit=limit, offset=offset)
+    relation = get_or_build_relation(
+        get_derived_relation_cache_key(relation_cache_key, relation_kwargs),
+        lambda relation_kwargs: apply_transformations_deprecated(table=table, **relation_kwargs),
+        relation_kwargs,
+    )
+    if paginate_separately:
+        relation = _apply_offset_and_limit(relation, offset, limit)
+    return execute_pg_query(engine, relation, connection_to_use=connection_to_use)
+
+
+def _apply_offset_and_limit(relation, offset, limit):
+    # Mirrors the end of apply_transformations_deprecated.
+    transforms = []
+    if offset:
+        transforms.append(transforms_base.Offset(offset))
+    if limit:
+        transforms.append(transforms_base.Limit(limit))
+    return apply_transformations(relation, transforms)
+
+
+def get_records_in_batches(
+    table,
+    engine,
+    batch_size,
+    order_by=None,
+    filter=None,
+    search=None,
+    duplicate_only=None,
+):
+    """
+    Yields lists of at most batch_size records from a table, in the same order as get_records
+    (with fallback_to_default_ordering) would return them. Records are fetched through a
+    server-side cursor, so memory use doesn't depend on the number of records.
+
+    The transformation arguments are those of get_records.
+    """
+    if order_by is None:
+        order_by = []
+    if search is None:
+        search = []
+    relation = apply_transformations_deprecated(
+        table=table,
+        order_by=order_by,
+        fallback_to_default_ordering=True,
+        filter=filter,
+        search=search,
+        duplicate_only=duplicate_only,
     )
-    return execute_pg_query(engine, relation)
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, max_row_buffer=batch_size
+        ).execute(select(relation))
+        for batch in result.partitions(batch_size):
+            yield batch
 
 
-def get_count(table, engine, filter=None, search=None):
+def get_count(table, engine, filter=None, search=None, connection_to_use=None):
     if search is None:
         search = []
     col_name = "_count"
@@ -85,7 +155,66 @@ def get_count(table, engine, filter=None, search=None):
         columns_to_select=columns_to_select,
         search=search,
     )
-    return execute_pg_query(engine, relation)[0][col_name]
+    return execute_pg_query(engine, relation, connection_to_use=connection_to_use)[0][col_name]
+
+
+def get_count_estimate(table, engine, filter=None, search=None, connection_to_use=None):
+    """
+    Returns a (count, cost) tuple of the Postgres planner's estimates of how many records of a
+    table match filter and search, and of what fetching them all would cost (in the planner's
+    arbitrary units, see https://www.postgresql.org/docs/current/using-explain.html). Counting them
+    exactly costs about as much. This only plans the query, so it takes about constant time.
+    """
+    if search is None:
+        search = []
+    relation = apply_transformations_deprecated(table=table, filter=filter, search=search)
+    plans = execute_pg_query(engine, ExplainJSON(select(relation)), connection_to_use)[0][0]
+    plan = plans[0]['Plan']
+    return plan['Plan Rows'], plan['Total Cost']
+
+
+class ExplainJSON(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of a statement. The statement is compiled along with it, so that its
+    parameters are processed (and expanded) as they would be if it was executed itself.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiler.compiles(ExplainJSON)
+def compile_explain_json(element, compiler, **kw):
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def get_approximate_count(table_oid, engine):
+    """
+    Estimates the number of rows in a table the way the Postgres planner does: the row density
+    recorded by the last VACUUM or ANALYZE, scaled to the table's current size. This doesn't scan
+    the table, so it takes constant time.
+
+    Returns None if the table has never been vacuumed or analyzed.
+    """
+    pg_class = get_pg_catalog_table('pg_class', engine)
+    current_pages = (
+        func.pg_relation_size(pg_class.c.oid) / cast(func.current_setting('block_size'), Integer)
+    )
+    sel = (
+        select(pg_class.c.reltuples, pg_class.c.relpages, current_pages.label('current_pages'))
+        .where(pg_class.c.oid == table_oid)
+    )
+    result = execute_pg_query(engine, sel)
+    if not result:
+        return None
+    reltuples, relpages, current_pages = result[0]
+    # Since Postgres 14, reltuples is -1 for tables that were never vacuumed or analyzed.
+    if reltuples < 0 or (reltuples == 0 and relpages == 0 and current_pages > 0):
+        return None
+    if relpages == 0:
+        return int(reltuples)
+    return int(round(reltuples / relpages * current_pages))
 
 
 def get_column_cast_records(engine, table, column_definitions, num_records=20):
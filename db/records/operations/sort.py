@@ -1,7 +1,10 @@
 from collections import namedtuple
-from sqlalchemy import select
+from sqlalchemy import and_, false, literal, or_, select, tuple_
 from db.columns import utils as col_utils
-from db.records.exceptions import BadSortFormat, SortFieldNotFound
+from db.records.exceptions import BadSeekFormat, BadSortFormat, SortFieldNotFound
+
+ASC = 'asc'
+DESC = 'desc'
 
 
 def make_order_by_deterministic(relation, order_by=None):
@@ -31,10 +34,14 @@ def _append_primary_key_sort(relation, order_by):
     pk_cols = col_utils.get_primary_key_column_collection_from_relation(relation)
     order_by = list(order_by)
     if pk_cols is not None:
+        # Iterating over the relation's columns (rather than a set) keeps the order of the primary
+        # key columns stable, which keyset pagination relies on.
+        pk_cols = set(pk_cols)
         order_by += [
             {'field': col, 'direction': 'asc'}
             for col
-            in set(pk_cols).intersection(relation.columns)
+            in relation.columns
+            if col in pk_cols
         ]
     return order_by
 
@@ -72,6 +79,112 @@ def apply_relation_sorting(relation, sort_spec):
     return select(relation).order_by(*order_by_list)
 
 
+def get_sort_key_names(relation, order_by=None):
+    """
+    Returns the names of the columns making up the deterministic version of the given order_by,
+    i.e. the sort key that apply_relation_seek expects values for.
+    """
+    order_by = make_order_by_deterministic(relation, order_by)
+    return [_get_column_obj_from_spec(relation, spec).name for spec in order_by]
+
+
+def apply_relation_seek(relation, order_by, seek_after=None):
+    """
+    Sorts the relation by the deterministic version of order_by, keeping only the rows that come
+    after the row whose sort key is seek_after (a list of values, one per column returned by
+    get_sort_key_names). This is keyset pagination: unlike with an offset, Postgres doesn't need to
+    produce and discard the rows of the previous pages.
+    """
+    order_by = make_order_by_deterministic(relation, order_by)
+    executable = apply_relation_sorting(relation, order_by)
+    if seek_after is None:
+        return executable
+    if not isinstance(seek_after, (list, tuple)) or len(seek_after) != len(order_by):
+        raise BadSeekFormat(
+            f'Expected a list of {len(order_by)} values to seek after, got: {seek_after}'
+        )
+    sort_specs = [_get_deserialized_sort_spec(spec) for spec in order_by]
+    columns = [_get_column_obj_from_spec(relation, spec) for spec in order_by]
+    return executable.where(_get_seek_predicate(columns, sort_specs, seek_after))
+
+
+def _get_seek_predicate(columns, sort_specs, seek_after):
+    # The seek values aren't bound with the columns' types, so that Postgres coerces them from
+    # their (e.g. JSON-decoded) string representation.
+    if _can_seek_by_row_comparison(columns, sort_specs, seek_after):
+        # A single row-value comparison can use a multicolumn index on the sort key.
+        columns_row = tuple_(*columns)
+        values_row = tuple_(*[literal(value) for value in seek_after])
+        if sort_specs[0].direction == ASC:
+            return columns_row > values_row
+        else:
+            return columns_row < values_row
+    # Otherwise, a row comes after the seek row when it's equal on the first i columns and comes
+    # after it on column i + 1, for some i.
+    return or_(
+        *[
+            and_(
+                *[
+                    column.is_not_distinct_from(literal(value))
+                    for column, value in zip(columns[:i], seek_after[:i])
+                ],
+                _get_comes_after_expr(columns[i], sort_specs[i], seek_after[i]),
+            )
+            for i in range(len(columns))
+        ]
+    )
+
+
+def _can_seek_by_row_comparison(columns, sort_specs, seek_after):
+    """
+    Row comparison only matches our ordering if all columns are sorted in the same direction and
+    no NULLs are involved.
+    """
+    return (
+        len({sort_spec.direction for sort_spec in sort_specs}) == 1
+        and not any(sort_spec.nullsfirst or sort_spec.nullslast for sort_spec in sort_specs)
+        and not any(column.nullable for column in columns)
+        and not any(value is None for value in seek_after)
+    )
+
+
+def _get_comes_after_expr(column, sort_spec, value):
+    # Postgres sorts NULLs as if they were larger than any other value, unless told otherwise.
+    nulls_first = sort_spec.nullsfirst or (sort_spec.direction == DESC and not sort_spec.nullslast)
+    if value is None:
+        return column.is_not(None) if nulls_first else false()
+    if sort_spec.direction == ASC:
+        comes_after = column > literal(value)
+    else:
+        comes_after = column < literal(value)
+    if nulls_first or not column.nullable:
+        return comes_after
+    return or_(comes_after, column.is_(None))
+
+
+def _get_deserialized_sort_spec(spec):
+    try:
+        sort_spec = _deserialize_sort_spec(spec)
+    except (KeyError, TypeError, AssertionError):
+        raise BadSortFormat
+    if sort_spec.direction not in (ASC, DESC):
+        raise BadSortFormat
+    return sort_spec
+
+
+def _get_column_obj_from_spec(relation, spec):
+    try:
+        field = spec['field']
+    except (KeyError, TypeError):
+        raise BadSortFormat
+    try:
+        return col_utils.get_column_obj_from_relation(relation, field)
+    except KeyError as e:
+        raise SortFieldNotFound(e)
+    except (AttributeError, TypeError):
+        raise BadSortFormat
+
+
 def _get_sorted_column_obj_from_spec(relation, spec):
     try:
         sort_spec = _deserialize_sort_spec(spec)
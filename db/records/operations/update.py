@@ -1,4 +1,4 @@
-from db.records.operations.select import get_record
+from db.records.utils import get_returned_record
 from db.tables.utils import get_primary_key_column
 from sqlalchemy.exc import DataError
 from psycopg2.errors import DatetimeFieldOverflow, InvalidDatetimeFormat
@@ -6,12 +6,19 @@ from db.records.exceptions import InvalidDate, InvalidDateFormat
 
 
 def update_record(table, engine, id_value, record_data):
+    """
+    Returns the updated record as a dict of column names to values (returned by the UPDATE
+    itself), or None if there's no record with the given id.
+    """
     primary_key_column = get_primary_key_column(table)
     with engine.begin() as connection:
         try:
-            connection.execute(
-                table.update().where(primary_key_column == id_value).values(record_data)
-            )
+            row = connection.execute(
+                table.update()
+                .where(primary_key_column == id_value)
+                .values(record_data)
+                .returning(*table.c)
+            ).one_or_none()
         except DataError as e:
             if type(e.orig) == DatetimeFieldOverflow:
                 raise InvalidDate
@@ -19,4 +26,4 @@ def update_record(table, engine, id_value, record_data):
                 raise InvalidDateFormat
             else:
                 raise e
-    return get_record(table, engine, id_value)
+    return get_returned_record(table, row) if row is not None else None
@@ -7,3 +7,12 @@ def create_col_objects(table, column_list):
 
 def get_column_object(table, col):
     return table.columns[col.name] if isinstance(col, Column) else table.columns[col]
+
+
+def get_returned_record(table, row):
+    """
+    Returns a row returned by a statement RETURNING all columns of the table, as a dict keyed by
+    column names rather than by the labels of the returned expressions (which aren't the column
+    names for columns of types with a column expression, e.g. dates).
+    """
+    return dict(zip(table.c.keys(), row))
@@ -3,11 +3,11 @@ from sqlalchemy import select, and_, not_, or_, func
 from db import constants
 from db import types
 from db.utils import get_pg_catalog_table
-from db.metadata import get_empty_metadata
 
 TYPES_SCHEMA = types.base.SCHEMA
 TEMP_INFER_SCHEMA = constants.INFERENCE_SCHEMA
-EXCLUDED_SCHEMATA = [TYPES_SCHEMA, TEMP_INFER_SCHEMA, "information_schema"]
+IMPORT_SCHEMA = constants.IMPORT_SCHEMA
+EXCLUDED_SCHEMATA = [TYPES_SCHEMA, TEMP_INFER_SCHEMA, IMPORT_SCHEMA, "information_schema"]
 
 
 def reflect_schema(engine, name=None, oid=None, metadata=None):
@@ -16,8 +16,6 @@ def reflect_schema(engine, name=None, oid=None, metadata=None):
         assert name is None or oid is None
     except AssertionError as e:
         raise e
-    # TODO reuse metadata
-    metadata = metadata if metadata else get_empty_metadata()
     pg_namespace = get_pg_catalog_table("pg_namespace", engine, metadata=metadata)
     sel = (
         select(pg_namespace.c.oid, pg_namespace.c.nspname.label("name"))
@@ -29,9 +27,7 @@ def reflect_schema(engine, name=None, oid=None, metadata=None):
 
 
 def get_mathesar_schemas_with_oids(engine):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    pg_namespace = get_pg_catalog_table("pg_namespace", engine, metadata=metadata)
+    pg_namespace = get_pg_catalog_table("pg_namespace", engine)
     sel = (
         select(pg_namespace.c.nspname.label('schema'), pg_namespace.c.oid)
         .where(
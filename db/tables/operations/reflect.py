@@ -0,0 +1,404 @@
+"""
+Bulk reflection of SA Tables.
+
+Autoloading a Table (i.e. `Table(..., autoload_with=engine)`) takes around ten catalog queries per
+table: columns, domains, enums, primary key, foreign keys, indexes, unique and check constraints
+and the comment are each looked up separately. Here, we fetch that information for a whole set of
+tables with a handful of queries and hand it to SQLAlchemy's own Inspector.reflect_table, so that
+the resulting Table objects are built exactly like autoloaded ones.
+
+Tables referenced by foreign keys are reflected too (as autoloading does), one round of queries
+per level of foreign key depth.
+
+Indexes are not reflected, since we don't use them.
+
+Building columns like the dialect does relies on private SQLAlchemy internals
+(PGDialect._load_domains, _load_enums and _get_column_info, and Inspector._init_connection), whose
+signatures changed within 1.4.x and again in 2.0. They're only used with the SQLAlchemy version
+they're known to work with, SUPPORTED_SQLALCHEMY_VERSION (which requirements.txt pins); with any
+other version, tables are autoloaded one at a time instead, and a warning is issued.
+"""
+import re
+import warnings
+
+import sqlalchemy
+from sqlalchemy import BLANK_SCHEMA, Table, text
+from sqlalchemy.dialects.postgresql.base import PGInspector
+from sqlalchemy.exc import NoSuchTableError
+
+_TABLES_QUERY = """
+SELECT
+  c.oid,
+  n.nspname AS schema_name,
+  c.relname AS table_name,
+  pg_catalog.obj_description(c.oid, 'pg_class') AS comment
+FROM pg_catalog.pg_class AS c
+JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+WHERE c.oid = ANY(CAST(:oids AS oid[]))
+"""
+
+# Adapted from sqlalchemy.dialects.postgresql.base.PGDialect.get_columns
+_COLUMNS_QUERY = """
+SELECT
+  a.attrelid AS table_oid,
+  a.attname,
+  pg_catalog.format_type(a.atttypid, a.atttypmod),
+  (
+    SELECT pg_catalog.pg_get_expr(d.adbin, d.adrelid)
+    FROM pg_catalog.pg_attrdef d
+    WHERE d.adrelid = a.attrelid AND d.adnum = a.attnum AND a.atthasdef
+  ) AS default,
+  a.attnotnull,
+  pgd.description AS comment,
+  a.attgenerated AS generated,
+  (
+    SELECT json_build_object(
+      'always', a.attidentity = 'a',
+      'start', s.seqstart,
+      'increment', s.seqincrement,
+      'minvalue', s.seqmin,
+      'maxvalue', s.seqmax,
+      'cache', s.seqcache,
+      'cycle', s.seqcycle
+    )
+    FROM pg_catalog.pg_sequence s
+    JOIN pg_catalog.pg_class c ON s.seqrelid = c.oid
+    WHERE c.relkind = 'S'
+    AND a.attidentity != ''
+    AND s.seqrelid = pg_catalog.pg_get_serial_sequence(
+      a.attrelid::regclass::text, a.attname
+    )::regclass::oid
+  ) AS identity_options
+FROM pg_catalog.pg_attribute a
+LEFT JOIN pg_catalog.pg_description pgd ON (
+  pgd.objoid = a.attrelid AND pgd.objsubid = a.attnum
+)
+WHERE a.attrelid = ANY(CAST(:oids AS oid[])) AND a.attnum > 0 AND NOT a.attisdropped
+ORDER BY a.attrelid, a.attnum
+"""
+
+_CONSTRAINTS_QUERY = """
+SELECT
+  con.conrelid AS table_oid,
+  con.conname,
+  con.contype,
+  ARRAY(
+    SELECT a.attname
+    FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+    JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+    ORDER BY k.ord
+  ) AS column_names,
+  ARRAY(
+    SELECT a.attname
+    FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+    JOIN pg_catalog.pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+    ORDER BY k.ord
+  ) AS referred_column_names,
+  con.confrelid AS referred_table_oid,
+  rn.nspname AS referred_schema_name,
+  rc.relname AS referred_table_name,
+  pg_catalog.pg_table_is_visible(rc.oid) AS is_referred_table_visible,
+  con.confupdtype,
+  con.confdeltype,
+  con.confmatchtype,
+  con.condeferrable,
+  con.condeferred,
+  CASE WHEN con.contype = 'c' THEN pg_catalog.pg_get_constraintdef(con.oid) END AS check_src
+FROM pg_catalog.pg_constraint con
+LEFT JOIN pg_catalog.pg_class rc ON rc.oid = con.confrelid
+LEFT JOIN pg_catalog.pg_namespace rn ON rn.oid = rc.relnamespace
+WHERE con.conrelid = ANY(CAST(:oids AS oid[])) AND con.contype IN ('p', 'f', 'u', 'c')
+ORDER BY con.conrelid, con.conname
+"""
+
+# Bump along with SQLAlchemy in requirements.txt, after checking the internals used by
+# _BulkTableReflector and _BulkInspector against the new version.
+SUPPORTED_SQLALCHEMY_VERSION = '1.4.26'
+
+# See https://www.postgresql.org/docs/current/catalog-pg-constraint.html
+_FK_ACTIONS = {
+    'r': 'RESTRICT',
+    'c': 'CASCADE',
+    'n': 'SET NULL',
+    'd': 'SET DEFAULT',
+}
+_FK_FULL_MATCH = 'f'
+
+
+def reflect_tables_from_oids_in_bulk(oids, connection, metadata, keep_existing=False):
+    """
+    Reflects the tables with the given oids into metadata, returning a dict of oids to Tables. Oids
+    that don't belong to a table are left out.
+
+    Behaves like autoloading each table by name with extend_existing=not keep_existing.
+    """
+    if sqlalchemy.__version__ != SUPPORTED_SQLALCHEMY_VERSION:
+        warnings.warn(
+            f'Bulk table reflection supports SQLAlchemy {SUPPORTED_SQLALCHEMY_VERSION} only, not'
+            f' {sqlalchemy.__version__}; autoloading tables one at a time instead.'
+        )
+        return _autoload_tables_from_oids(oids, connection, metadata, keep_existing)
+    return _BulkTableReflector(connection, metadata).reflect(oids, keep_existing)
+
+
+def _autoload_tables_from_oids(oids, connection, metadata, keep_existing):
+    oids = list(oids)
+    if len(oids) == 0:
+        return {}
+    rows = connection.execute(text(_TABLES_QUERY), {'oids': oids}).mappings().fetchall()
+    return {
+        row['oid']: Table(
+            row['table_name'],
+            metadata,
+            schema=row['schema_name'],
+            autoload_with=connection,
+            extend_existing=not keep_existing,
+            keep_existing=keep_existing,
+        )
+        for row in rows
+    }
+
+
+class _BulkTableReflector:
+    def __init__(self, connection, metadata):
+        self.connection = connection
+        self.metadata = metadata
+        self.dialect = connection.dialect
+        self._domains = None
+        self._enums = None
+        self._comments = {}
+
+    def reflect(self, oids, keep_existing):
+        oids = list(oids)
+        if len(oids) == 0:
+            return {}
+        table_names = self._get_table_names(oids)
+        oids_to_tables = {}
+        frontier = {}
+        for oid, (schema_name, table_name) in table_names.items():
+            key = _get_table_key(schema_name, table_name)
+            if keep_existing and key in self.metadata.tables:
+                oids_to_tables[oid] = self.metadata.tables[key]
+            else:
+                table = Table(table_name, self.metadata, schema=schema_name, extend_existing=True)
+                oids_to_tables[oid] = table
+                frontier[oid] = [(table, schema_name)]
+        reflected_keys = {table.key for tables in frontier.values() for table, _ in tables}
+        while len(frontier) > 0:
+            frontier = self._reflect_round(frontier, table_names, reflected_keys)
+        return oids_to_tables
+
+    def _reflect_round(self, frontier, table_names, reflected_keys):
+        """
+        Reflects the tables in frontier (a dict of oids to lists of (Table, schema) tuples; a
+        Postgres table may have more than one Table, with and without a schema) and returns the
+        frontier of the next round: the referred tables that weren't in the metadata yet.
+        """
+        oids = list(frontier.keys())
+        table_names.update(self._get_table_names(
+            [oid for oid in oids if oid not in table_names]
+        ))
+        reflections = self._get_reflections(oids, frontier, table_names)
+        next_frontier = {}
+        for table_reflections in reflections.values():
+            for fkey in table_reflections['foreign_keys']:
+                referred_oid = fkey.pop('referred_table_oid')
+                referred_schema = fkey['referred_schema']
+                key = _get_table_key(referred_schema, fkey['referred_table'])
+                if key in reflected_keys or key in self.metadata.tables:
+                    continue
+                # Creating the (empty) Table before reflecting the referrer stops SQLAlchemy from
+                # autoloading it; it'll be reflected in the next round instead.
+                table = Table(
+                    fkey['referred_table'],
+                    self.metadata,
+                    schema=BLANK_SCHEMA if referred_schema is None else referred_schema,
+                )
+                reflected_keys.add(key)
+                next_frontier.setdefault(referred_oid, []).append((table, referred_schema))
+        inspector = _BulkInspector.from_connection(self.connection, reflections)
+        for oid, tables in frontier.items():
+            for table, _ in tables:
+                inspector.reflect_table(table, None)
+        return next_frontier
+
+    def _get_table_names(self, oids):
+        if len(oids) == 0:
+            return {}
+        rows = self._execute(_TABLES_QUERY, oids)
+        self._comments.update({row['oid']: row['comment'] for row in rows})
+        return {row['oid']: (row['schema_name'], row['table_name']) for row in rows}
+
+    def _get_reflections(self, oids, frontier, table_names):
+        """
+        Returns a dict of (schema, table name) tuples to dicts with the information that the
+        Inspector's per-table methods would return.
+        """
+        oids_to_column_rows = {oid: [] for oid in oids}
+        for row in self._execute(_COLUMNS_QUERY, oids):
+            oids_to_column_rows[row['table_oid']].append(row)
+        oids_to_constraint_rows = {oid: [] for oid in oids}
+        for row in self._execute(_CONSTRAINTS_QUERY, oids):
+            oids_to_constraint_rows[row['table_oid']].append(row)
+        reflections = {}
+        for oid, tables in frontier.items():
+            for table, schema in tables:
+                reflection = {
+                    'columns': [
+                        self._get_column_info(row, schema) for row in oids_to_column_rows[oid]
+                    ],
+                    'comment': {'text': self._comments.get(oid)},
+                }
+                reflection.update(
+                    _get_constraint_infos(oids_to_constraint_rows[oid], schema)
+                )
+                reflections[(schema, table.name)] = reflection
+        return reflections
+
+    def _get_column_info(self, row, schema):
+        if self._domains is None:
+            self._domains = self.dialect._load_domains(self.connection)
+            # Keyed like in PGDialect.get_columns.
+            self._enums = dict(
+                ((rec['name'],), rec) if rec['visible'] else ((rec['schema'], rec['name']), rec)
+                for rec in self.dialect._load_enums(self.connection, schema='*')
+            )
+        return self.dialect._get_column_info(
+            row['attname'],
+            row['format_type'],
+            row['default'],
+            row['attnotnull'],
+            self._domains,
+            self._enums,
+            schema,
+            row['comment'],
+            row['generated'],
+            row['identity_options'],
+        )
+
+    def _execute(self, query, oids):
+        return self.connection.execute(text(query), {'oids': oids}).mappings().fetchall()
+
+
+class _BulkInspector(PGInspector):
+    """
+    An Inspector that serves the per-table reflection methods used by reflect_table from
+    pre-fetched information, instead of querying the database.
+    """
+
+    @classmethod
+    def from_connection(cls, connection, reflections):
+        # Inspector's constructor is deprecated in favor of sqlalchemy.inspect, which would
+        # return a plain PGInspector.
+        inspector = cls.__new__(cls)
+        inspector._init_connection(connection)
+        inspector.reflections = reflections
+        return inspector
+
+    def has_table(self, table_name, schema=None):
+        return (schema, table_name) in self.reflections
+
+    def get_columns(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['columns']
+
+    def get_pk_constraint(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['pk_constraint']
+
+    def get_foreign_keys(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['foreign_keys']
+
+    def get_indexes(self, table_name, schema=None, **kw):
+        return []
+
+    def get_unique_constraints(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['unique_constraints']
+
+    def get_check_constraints(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['check_constraints']
+
+    def get_table_comment(self, table_name, schema=None, **kw):
+        return self._get_reflection(table_name, schema)['comment']
+
+    def _get_reflection(self, table_name, schema):
+        try:
+            return self.reflections[(schema, table_name)]
+        except KeyError:
+            raise NoSuchTableError(table_name)
+
+
+def _get_constraint_infos(rows, schema):
+    """
+    Builds what PGDialect's get_pk_constraint, get_foreign_keys, get_unique_constraints and
+    get_check_constraints would return for a table with the given pg_constraint rows.
+    """
+    pk_constraint = {'constrained_columns': [], 'name': None}
+    foreign_keys = []
+    unique_constraints = []
+    check_constraints = []
+    for row in rows:
+        if row['contype'] == 'p':
+            pk_constraint = {'constrained_columns': row['column_names'], 'name': row['conname']}
+        elif row['contype'] == 'f':
+            foreign_keys.append(_get_foreign_key_info(row, schema))
+        elif row['contype'] == 'u':
+            unique_constraints.append(
+                {'name': row['conname'], 'column_names': row['column_names']}
+            )
+        elif row['contype'] == 'c':
+            check_constraints.append(_get_check_constraint_info(row))
+    return {
+        'pk_constraint': pk_constraint,
+        'foreign_keys': foreign_keys,
+        'unique_constraints': unique_constraints,
+        'check_constraints': check_constraints,
+    }
+
+
+def _get_foreign_key_info(row, schema):
+    # PGDialect.get_foreign_keys parses pg_get_constraintdef, which only qualifies the referred
+    # table with its schema if the table isn't visible on the search path.
+    if not row['is_referred_table_visible']:
+        referred_schema = row['referred_schema_name']
+    elif schema is not None and schema == row['referred_schema_name']:
+        referred_schema = schema
+    else:
+        referred_schema = None
+    options = {}
+    if row['confupdtype'] in _FK_ACTIONS:
+        options['onupdate'] = _FK_ACTIONS[row['confupdtype']]
+    if row['confdeltype'] in _FK_ACTIONS:
+        options['ondelete'] = _FK_ACTIONS[row['confdeltype']]
+    if row['condeferred']:
+        options['initially'] = 'DEFERRED'
+    if row['condeferrable']:
+        options['deferrable'] = True
+    if row['confmatchtype'] == _FK_FULL_MATCH:
+        options['match'] = 'FULL'
+    return {
+        'name': row['conname'],
+        'constrained_columns': row['column_names'],
+        'referred_schema': referred_schema,
+        'referred_table': row['referred_table_name'],
+        'referred_columns': row['referred_column_names'],
+        'options': options,
+        # Only used by _BulkTableReflector, and removed before reaching the Inspector.
+        'referred_table_oid': row['referred_table_oid'],
+    }
+
+
+def _get_check_constraint_info(row):
+    # Adapted from sqlalchemy.dialects.postgresql.base.PGDialect.get_check_constraints
+    src = row['check_src']
+    m = re.match(r"^CHECK *\((.+)\)( NOT VALID)?$", src, flags=re.DOTALL)
+    if not m:
+        sqltext = ""
+    else:
+        sqltext = re.compile(r"^[\s\n]*\((.+)\)[\s\n]*$", flags=re.DOTALL).sub(r"\1", m.group(1))
+    info = {'name': row['conname'], 'sqltext': sqltext}
+    if m and m.group(2):
+        info['dialect_options'] = {'not_valid': True}
+    return info
+
+
+def _get_table_key(schema, table_name):
+    return table_name if schema is None else f'{schema}.{table_name}'
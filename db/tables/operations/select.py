@@ -1,8 +1,9 @@
 from sqlalchemy import (
-    Table, select, join, inspect, and_, cast, func, Integer, literal, or_,
+    Table, select, join, inspect, and_, cast, func, Integer, literal, or_, text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 
+from db.tables.operations.reflect import reflect_tables_from_oids_in_bulk
 from db.utils import execute_statement, get_pg_catalog_table
 
 BASE = 'base'
@@ -39,25 +40,14 @@ def reflect_table_from_oid(oid, engine, metadata, connection_to_use=None, keep_e
 
 
 def reflect_tables_from_oids(oids, engine, metadata, connection_to_use=None, keep_existing=False):
-    oids_to_schema_and_table_names = (
-        get_map_of_table_oid_to_schema_name_and_table_name(
-            oids,
-            engine,
-            metadata=metadata,
-            connection_to_use=connection_to_use,
+    if connection_to_use is not None:
+        return reflect_tables_from_oids_in_bulk(
+            oids, connection_to_use, metadata, keep_existing=keep_existing
         )
-    )
-    table_oids_to_sa_tables = {}
-    for table_oid, (schema_name, table_name) in oids_to_schema_and_table_names.items():
-        table_oids_to_sa_tables[table_oid] = reflect_table(
-            table_name,
-            schema_name,
-            engine,
-            metadata=metadata,
-            connection_to_use=connection_to_use,
-            keep_existing=keep_existing
+    with engine.connect() as connection:
+        return reflect_tables_from_oids_in_bulk(
+            oids, connection, metadata, keep_existing=keep_existing
         )
-    return table_oids_to_sa_tables
 
 
 def get_map_of_table_oid_to_schema_name_and_table_name(
@@ -103,6 +93,63 @@ def get_table_oids_from_schemas(schema_oids, engine, metadata):
     return table_oids
 
 
+def get_table_fingerprints_from_schemas(schema_oids, engine, connection_to_use=None):
+    """
+    Returns (table oid, schema oid, schema name, table name, fingerprint) tuples for each table in
+    the given schemas.
+
+    The fingerprint is a cheap digest of the catalog rows describing a table: its pg_class row,
+    its pg_attribute rows and the pg_constraint rows attached to it. Any DDL touching the table's
+    name, columns or constraints writes new versions of those rows (and so changes their xmin),
+    which lets us find out which tables changed since we last looked without reflecting them.
+    """
+    if len(schema_oids) == 0:
+        return []
+    sel = text(
+        _TABLE_FINGERPRINTS_QUERY.format(condition='c.relnamespace = ANY(:oids)')
+    ).bindparams(oids=list(schema_oids))
+    return execute_statement(engine, sel, connection_to_use).fetchall()
+
+
+def get_table_fingerprints_from_oids(table_oids, engine, connection_to_use=None):
+    """
+    Like get_table_fingerprints_from_schemas, but for the given tables.
+    """
+    if len(table_oids) == 0:
+        return []
+    sel = text(
+        _TABLE_FINGERPRINTS_QUERY.format(condition='c.oid = ANY(:oids)')
+    ).bindparams(oids=list(table_oids))
+    return execute_statement(engine, sel, connection_to_use).fetchall()
+
+
+_TABLE_FINGERPRINTS_QUERY = """
+SELECT
+    c.oid,
+    c.relnamespace AS schema_oid,
+    n.nspname AS schema_name,
+    c.relname AS table_name,
+    md5(concat_ws(
+        ':',
+        c.xmin::text,
+        c.relnatts::text,
+        (
+            SELECT string_agg(a.attnum::text || '.' || a.xmin::text, ',' ORDER BY a.attnum)
+            FROM pg_catalog.pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attnum > 0
+        ),
+        (
+            SELECT string_agg(con.oid::text || '.' || con.xmin::text, ',' ORDER BY con.oid)
+            FROM pg_catalog.pg_constraint con
+            WHERE con.conrelid = c.oid
+        )
+    )) AS fingerprint
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+WHERE c.relkind = 'r' AND {condition}
+"""
+
+
 def get_oid_from_table(name, schema, engine):
     inspector = inspect(engine)
     return inspector.get_table_oid(name, schema=schema)
@@ -0,0 +1,227 @@
+"""
+Staging tables, which imported records are copied into before they're swapped in as the table
+they're imported to.
+
+Staging tables are unlogged, so filling them doesn't write to the WAL, and they're created in
+IMPORT_SCHEMA, which isn't reflected, so they're never visible to users. Swapping one in rewrites
+it once, as a logged table with Mathesar's default id column, rather than copying its records into
+another table.
+"""
+from itertools import accumulate, count
+from uuid import uuid4
+
+from psycopg2.errors import DuplicateTable as DuplicateTableError
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Table, TEXT, func, select, text
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+
+from db import constants
+from db.schemas.operations.create import create_schema
+from db.tables.operations.alter import update_pk_sequence_to_latest
+from db.tables.operations.create import DuplicateTable
+from db.tables.operations.select import reflect_table
+
+IMPORT_SCHEMA = constants.IMPORT_SCHEMA
+STAGING_TABLE_PREFIX = f"{constants.MATHESAR_PREFIX}staging_"
+# The configuration parameter that the chunk column of staging tables defaults to.
+CHUNK_SETTING = f"{constants.MATHESAR_PREFIX}import.chunk"
+# A temporary sequence, of each connection copying into staging tables, that the row column of
+# staging tables defaults to.
+ROW_SEQUENCE = f"{constants.MATHESAR_PREFIX}import_row"
+# The placeholder of the id column, which is computed when the staging table is swapped in.
+ID_COLUMN = f"{constants.MATHESAR_PREFIX}id"
+CHUNK_COLUMN = f"{constants.MATHESAR_PREFIX}chunk"
+ROW_COLUMN = f"{constants.MATHESAR_PREFIX}row"
+# Postgres truncates identifiers to this many bytes.
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def create_staging_table(column_names, engine, key=None):
+    """
+    Creates a staging table with a TEXT column for each of the given names, besides columns that
+    record the chunk each record was copied in and its position in the chunk (see
+    prepare_staging_connection).
+
+    The key, if given, is part of the table's name, so that staging tables can be told apart (see
+    get_staging_table_keys).
+    """
+    create_schema(IMPORT_SCHEMA, engine)
+    key_part = f"{key}_" if key is not None else ""
+    staging_table = Table(
+        f"{STAGING_TABLE_PREFIX}{key_part}{uuid4().hex}",
+        MetaData(),
+        Column(ID_COLUMN, Integer),
+        Column(
+            CHUNK_COLUMN,
+            Integer,
+            # A parameter set locally by a transaction reads as '' after it ends.
+            server_default=text(f"nullif(current_setting('{CHUNK_SETTING}', true), '')::integer"),
+        ),
+        Column(
+            ROW_COLUMN,
+            BigInteger,
+            # The sequence is looked up when the default is evaluated, rather than when the table
+            # is created, so each connection uses its own.
+            server_default=text(f"nextval('pg_temp.{ROW_SEQUENCE}'::text::regclass)"),
+        ),
+        *[Column(column_name, TEXT) for column_name in column_names],
+        schema=IMPORT_SCHEMA,
+        prefixes=['UNLOGGED'],
+    )
+    staging_table.create(engine)
+    return staging_table
+
+
+def prepare_staging_connection(connection, chunk_index):
+    """
+    Prepares a connection to copy the chunk of the given index into a staging table, in the
+    connection's current transaction, so that the rows it copies are numbered from 1 in the order
+    they're copied.
+    """
+    connection.execute(select(func.set_config(CHUNK_SETTING, str(chunk_index), True)))
+    connection.execute(text(f'CREATE TEMPORARY SEQUENCE IF NOT EXISTS "{ROW_SEQUENCE}"'))
+    connection.execute(select(func.setval(f"pg_temp.{ROW_SEQUENCE}", 1, False)))
+
+
+def drop_staging_table(staging_table, engine):
+    staging_table.drop(engine, checkfirst=True)
+
+
+def get_staging_table_keys(engine):
+    """
+    Returns the names of the staging tables of the database, mapped to the keys they were created
+    with (or None).
+    """
+    query = text(
+        "SELECT tablename FROM pg_catalog.pg_tables"
+        " WHERE schemaname = :schema AND left(tablename, length(:prefix)) = :prefix"
+    )
+    with engine.begin() as conn:
+        names = conn.execute(query, {'schema': IMPORT_SCHEMA, 'prefix': STAGING_TABLE_PREFIX})
+        names = names.scalars().all()
+    staging_table_keys = {}
+    for name in names:
+        key, _, _ = name[len(STAGING_TABLE_PREFIX):].rpartition('_')
+        staging_table_keys[name] = key or None
+    return staging_table_keys
+
+
+def swap_in_staging_table(
+    staging_table, name, schema, column_names, chunk_row_counts, engine, comment=None
+):
+    """
+    Turns the staging table into a logged table of the given name, in the given schema, with
+    Mathesar's default id column, numbering its records in the order they were copied in.
+
+    chunk_row_counts are the numbers of rows copied from each chunk, in order.
+
+    If one of column_names is the default id column, its values are used as ids if they're unique
+    integers, and it's renamed to ID_ORIGINAL otherwise.
+    """
+    create_schema(schema, engine)
+    preparer = engine.dialect.identifier_preparer
+    staging_relation = f"{preparer.quote(IMPORT_SCHEMA)}.{preparer.quote(staging_table.name)}"
+    offsets = [0, *accumulate(chunk_row_counts)][:-1]
+    computed_id = (
+        f"(ARRAY[{', '.join(str(offset) for offset in offsets)}]::bigint[])"
+        f"[{preparer.quote(CHUNK_COLUMN)} + 1] + {preparer.quote(ROW_COLUMN)}"
+    )
+    with engine.begin() as conn:
+        if constants.ID in column_names:
+            try:
+                with conn.begin_nested():
+                    _rewrite_staging_table(
+                        conn, staging_relation, staging_table.name,
+                        f"{preparer.quote(constants.ID)}::integer",
+                        drop_column_names=[constants.ID],
+                    )
+            except (IntegrityError, DataError):
+                # Rolling back to the savepoint only discards the rewrite.
+                conn.execute(text(
+                    f"ALTER TABLE {staging_relation} RENAME COLUMN {preparer.quote(constants.ID)}"
+                    f" TO {preparer.quote(constants.ID_ORIGINAL)}"
+                ))
+                _rewrite_staging_table(conn, staging_relation, staging_table.name, computed_id)
+        else:
+            _rewrite_staging_table(conn, staging_relation, staging_table.name, computed_id)
+        relation = f"{preparer.quote(schema)}.{preparer.quote(name)}"
+        conn.execute(text(f"ALTER TABLE {staging_relation} SET SCHEMA {preparer.quote(schema)}"))
+        try:
+            conn.execute(text(
+                f"ALTER TABLE {preparer.quote(schema)}.{preparer.quote(staging_table.name)}"
+                f" RENAME TO {preparer.quote(name)}"
+            ))
+        except ProgrammingError as e:
+            if isinstance(e.orig, DuplicateTableError):
+                raise DuplicateTable
+            raise
+        conn.execute(text(
+            f"ALTER TABLE {relation} RENAME COLUMN {preparer.quote(ID_COLUMN)}"
+            f" TO {preparer.quote(constants.ID)}"
+        ))
+        conn.execute(text(
+            f"ALTER TABLE {relation}"
+            f" RENAME CONSTRAINT {preparer.quote(_get_staging_pkey_name(staging_table.name))}"
+            f" TO {preparer.quote(_choose_relation_name(conn, name, schema, 'pkey'))}"
+        ))
+        # Like the sequence of a serial column.
+        sequence = (
+            f"{preparer.quote(schema)}"
+            f".{preparer.quote(_choose_relation_name(conn, name, schema, 'id_seq'))}"
+        )
+        conn.execute(text(
+            f"CREATE SEQUENCE {sequence} AS integer"
+            f" OWNED BY {relation}.{preparer.quote(constants.ID)}"
+        ))
+        conn.execute(text(
+            f"ALTER TABLE {relation} ALTER COLUMN {preparer.quote(constants.ID)}"
+            f" SET DEFAULT nextval(CAST(:sequence AS regclass))"
+        ), {'sequence': sequence})
+        if comment is not None:
+            conn.execute(text(f"COMMENT ON TABLE {relation} IS :comment"), {'comment': comment})
+        table = reflect_table(name, schema, engine, MetaData(), connection_to_use=conn)
+        update_pk_sequence_to_latest(engine, table, connection=conn)
+    return table
+
+
+def _rewrite_staging_table(conn, staging_relation, staging_table_name, id_expression, drop_column_names=()):
+    """
+    Computes the id column of the staging table, drops the columns that only staging tables have,
+    and makes it logged, in a single rewrite of the table.
+    """
+    drop_columns = ''.join(
+        f', DROP COLUMN "{column_name}"'
+        for column_name in [CHUNK_COLUMN, ROW_COLUMN, *drop_column_names]
+    )
+    conn.execute(text(
+        f"ALTER TABLE {staging_relation}"
+        f' ALTER COLUMN "{ID_COLUMN}" TYPE integer USING ({id_expression})::integer,'
+        f' ALTER COLUMN "{ID_COLUMN}" SET NOT NULL,'
+        f' ADD CONSTRAINT "{_get_staging_pkey_name(staging_table_name)}" PRIMARY KEY ("{ID_COLUMN}")'
+        f"{drop_columns},"
+        " SET LOGGED"
+    ))
+
+
+def _get_staging_pkey_name(staging_table_name):
+    # Staging tables' names can be too long to add a suffix to.
+    return f"{constants.MATHESAR_PREFIX}pkey_{staging_table_name.rpartition('_')[2]}"
+
+
+def _choose_relation_name(conn, name, schema, label):
+    """
+    Chooses a name for a relation (e.g. an index or a sequence) of the table of the given name,
+    that isn't taken in the given schema, the way Postgres chooses one for those it creates.
+    """
+    query = text(
+        "SELECT 1 FROM pg_catalog.pg_class JOIN pg_catalog.pg_namespace"
+        " ON pg_namespace.oid = pg_class.relnamespace"
+        " WHERE nspname = :schema AND relname = :name"
+    )
+    for attempt in count():
+        suffix = f"_{label}{attempt or ''}"
+        truncated_name = name
+        while len(f"{truncated_name}{suffix}".encode()) > MAX_IDENTIFIER_LENGTH:
+            truncated_name = truncated_name[:-1]
+        relation_name = f"{truncated_name}{suffix}"
+        if conn.execute(query, {'schema': schema, 'name': relation_name}).first() is None:
+            return relation_name
@@ -0,0 +1,129 @@
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from db.queries.base import DBQuery
+from db.records.operations.select import get_records
+from db.records.operations.sort import get_sort_key_names
+from db.transforms import base as transforms_base
+from db.transforms.operations.cache import clear_relation_cache, get_relation_cache_key
+
+
+def _copy_dbquery(dbq):
+    return DBQuery(
+        dbq.base_table_oid,
+        dbq.initial_columns,
+        dbq.engine,
+        transformations=dbq.transformations,
+    )
+
+
+def _get_filter(literal):
+    return transforms_base.Filter({'greater': [{'column_name': ['id']}, {'literal': [literal]}]})
+
+
+def test_transformed_relation_shared_between_dbqueries(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    dbq.transformations = [_get_filter(1)]
+    clear_relation_cache()
+    with patch.object(
+        DBQuery, '_build_transformed_relation', autospec=True,
+        side_effect=DBQuery._build_transformed_relation,
+    ) as mock_build:
+        records = dbq.get_records()
+        assert _copy_dbquery(dbq).get_records() == records
+    assert mock_build.call_count == 1
+
+
+def test_transformed_relation_shared_between_values(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    dbq.transformations = [_get_filter(1)]
+    other_dbq = _copy_dbquery(dbq)
+    other_dbq.transformations = [_get_filter(2)]
+    expected_records = [record for record in dbq.get_records() if record['id'] > 2]
+    clear_relation_cache()
+    with patch.object(
+        DBQuery, '_build_transformed_relation', autospec=True,
+        side_effect=DBQuery._build_transformed_relation,
+    ) as mock_build:
+        records = dbq.get_records()
+        other_records = other_dbq.get_records()
+    assert mock_build.call_count == 1
+    assert records != other_records
+    assert other_records == expected_records
+
+
+def test_transformed_relation_not_shared_between_shapes(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    dbq.transformations = [_get_filter(1)]
+    other_dbq = _copy_dbquery(dbq)
+    other_dbq.transformations = [_get_filter('1')]
+    clear_relation_cache()
+    with patch.object(
+        DBQuery, '_build_transformed_relation', autospec=True,
+        side_effect=DBQuery._build_transformed_relation,
+    ) as mock_build:
+        dbq.transformed_relation
+        other_dbq.transformed_relation
+    assert mock_build.call_count == 2
+
+
+def test_transformed_relation_with_table_fingerprints(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    relation_cache_key = dbq._get_transformed_relation_and_cache_key()[1]
+    _, fingerprints, _ = relation_cache_key.shape
+    dbq.get_table_fingerprints = lambda table_oids: dict(fingerprints)
+    with patch('db.transforms.operations.cache.get_table_fingerprints_from_oids') as mock_get:
+        assert dbq._get_transformed_relation_and_cache_key()[1].shape == relation_cache_key.shape
+    mock_get.assert_not_called()
+
+
+def test_transformed_relation_rebuilt_after_ddl(shallow_link_dbquery, engine_with_academics):
+    engine, schema = engine_with_academics
+    dbq = shallow_link_dbquery
+    relation = dbq.transformed_relation
+    records = dbq.get_records()
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{schema}".universities RENAME COLUMN name TO title'))
+    other_dbq = _copy_dbquery(dbq)
+    assert other_dbq.transformed_relation is not relation
+    assert other_dbq.get_records() == records
+
+
+def test_records_pages_with_relation_cache(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    order_by = [{'field': 'institution_name', 'direction': 'desc'}]
+    relation, relation_cache_key = dbq._get_transformed_relation_and_cache_key()
+    assert relation_cache_key is not None
+    for offset in range(4):
+        expected_records = get_records(
+            relation, dbq.engine, limit=1, offset=offset, order_by=order_by,
+            fallback_to_default_ordering=True,
+        )
+        records = get_records(
+            relation, dbq.engine, limit=1, offset=offset, order_by=order_by,
+            fallback_to_default_ordering=True, relation_cache_key=relation_cache_key,
+        )
+        assert records == expected_records
+
+
+def test_records_seek_with_relation_cache(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    order_by = [{'field': 'institution_name', 'direction': 'desc'}]
+    relation, relation_cache_key = dbq._get_transformed_relation_and_cache_key()
+    sort_key_names = get_sort_key_names(relation, order_by)
+    all_records = get_records(relation, dbq.engine, order_by=order_by)
+    for i, record in enumerate(all_records):
+        seek_after = [record[name] for name in sort_key_names]
+        records = get_records(
+            relation, dbq.engine, order_by=order_by, seek_after=seek_after,
+            relation_cache_key=relation_cache_key,
+        )
+        assert records == all_records[i + 1:]
+
+
+def test_relation_cache_key_with_sa_objects(shallow_link_dbquery):
+    dbq = shallow_link_dbquery
+    relation = dbq.transformed_relation
+    order_by = [{'field': relation.columns['id'], 'direction': 'asc'}]
+    assert get_relation_cache_key(dbq.engine, [dbq.base_table_oid], order_by) is None
@@ -0,0 +1,108 @@
+import pytest
+from psycopg2.errors import NotNullViolation, UniqueViolation
+from sqlalchemy import MetaData, Table, text
+
+from db.records.exceptions import BulkRecordOperationsError, RecordNotFound
+from db.records.operations import bulk
+from db.records.operations.bulk import DELETE, INSERT, UPDATE, apply_record_operations
+from db.records.operations.select import get_records
+
+
+@pytest.fixture
+def people_table_obj(engine_with_schema):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f'''
+            CREATE TABLE "{schema}".people (
+                id serial PRIMARY KEY, name text NOT NULL UNIQUE, born date
+            );
+            INSERT INTO "{schema}".people (name, born)
+            VALUES ('Ada', '1815-12-10'), ('Alan', '1912-06-23'), ('Grace', NULL);
+        '''))
+    table = Table('people', MetaData(bind=engine), schema=schema, autoload_with=engine)
+    return table, engine
+
+
+def _get_people(table, engine):
+    records = get_records(table, engine, order_by=[{'field': 'id', 'direction': 'asc'}])
+    return [dict(zip(table.c.keys(), record)) for record in records]
+
+
+def test_apply_record_operations(people_table_obj):
+    table, engine = people_table_obj
+    results = apply_record_operations(table, engine, [
+        {'type': INSERT, 'record': {'name': 'Edsger', 'born': '1930-05-11'}},
+        {'type': INSERT, 'record': {'name': 'Barbara', 'born': None}},
+        {'type': UPDATE, 'id': 1, 'record': {'born': '1815-12-11'}},
+        {'type': UPDATE, 'id': '2', 'record': {'born': '1912-06-24'}},
+        {'type': DELETE, 'id': 3},
+        {'type': UPDATE, 'id': 4, 'record': {'name': 'Edsger W.'}},
+    ])
+    people = {person['id']: person for person in _get_people(table, engine)}
+    assert list(people) == [1, 2, 4, 5]
+    assert people[1]['born'] != people[2]['born']
+    assert results[:4] == [{**people[4], 'name': 'Edsger'}, people[5], people[1], people[2]]
+    assert results[4:] == [3, people[4]]
+    assert people[4]['name'] == 'Edsger W.'
+    assert people[5]['born'] is None
+
+
+def test_apply_record_operations_batches(people_table_obj, monkeypatch):
+    table, engine = people_table_obj
+    monkeypatch.setattr(bulk, 'BATCH_SIZE', 2)
+    operations = [
+        {'type': INSERT, 'record': {'name': f'Person {i}'}} for i in range(5)
+    ] + [
+        {'type': UPDATE, 'id': 1, 'record': {'name': 'Ada L.'}},
+        # Updating the same record again has to happen after the first update.
+        {'type': UPDATE, 'id': 1, 'record': {'name': 'Ada K.'}},
+    ]
+    assert list(bulk._get_batches(operations)) == [[0, 1], [2, 3], [4], [5], [6]]
+    results = apply_record_operations(table, engine, operations)
+    assert [result['name'] for result in results[:5]] == [f'Person {i}' for i in range(5)]
+    assert results[6]['name'] == 'Ada K.'
+    assert len(_get_people(table, engine)) == 3 + 5
+
+
+def test_apply_record_operations_is_atomic(people_table_obj):
+    table, engine = people_table_obj
+    people = _get_people(table, engine)
+    with pytest.raises(BulkRecordOperationsError) as exc_info:
+        apply_record_operations(table, engine, [
+            {'type': DELETE, 'id': 3},
+            {'type': INSERT, 'record': {'name': 'Edsger'}},
+            {'type': INSERT, 'record': {'name': 'Ada'}},
+            {'type': INSERT, 'record': {'name': 'Barbara'}},
+            {'type': INSERT, 'record': {'name': 'Barbara'}},
+        ])
+    errors = exc_info.value.errors
+    assert list(errors) == [2, 4]
+    assert all(isinstance(errors[index].orig, UniqueViolation) for index in errors)
+    assert _get_people(table, engine) == people
+
+
+def test_apply_record_operations_not_null_violation(people_table_obj):
+    table, engine = people_table_obj
+    with pytest.raises(BulkRecordOperationsError) as exc_info:
+        apply_record_operations(table, engine, [
+            {'type': UPDATE, 'id': 1, 'record': {'name': 'Ada L.'}},
+            {'type': UPDATE, 'id': 2, 'record': {'name': None}},
+        ])
+    assert list(exc_info.value.errors) == [1]
+    assert isinstance(exc_info.value.errors[1].orig, NotNullViolation)
+
+
+def test_apply_record_operations_missing_records(people_table_obj):
+    table, engine = people_table_obj
+    people = _get_people(table, engine)
+    with pytest.raises(BulkRecordOperationsError) as exc_info:
+        apply_record_operations(table, engine, [
+            {'type': UPDATE, 'id': 1, 'record': {'name': 'Ada L.'}},
+            {'type': UPDATE, 'id': 100, 'record': {'name': 'Nobody'}},
+            {'type': DELETE, 'id': 2},
+            {'type': DELETE, 'id': 200},
+        ])
+    errors = exc_info.value.errors
+    assert list(errors) == [1]
+    assert isinstance(errors[1], RecordNotFound)
+    assert _get_people(table, engine) == people
@@ -0,0 +1,39 @@
+import csv
+import io
+
+from sqlalchemy import text
+
+from db.records.operations.export import export_records_to_csv
+from db.records.operations.select import get_records
+
+
+def _read_csv(chunks):
+    return list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+
+
+def test_export_records_to_csv(roster_table_obj):
+    roster, engine = roster_table_obj
+    rows = _read_csv(export_records_to_csv(roster, engine))
+    assert rows[0] == [column.name for column in roster.columns]
+    assert len(rows) == 1001
+    assert [row[0] for row in rows[1:]] == [str(i) for i in range(1, 1001)]
+
+
+def test_export_records_to_csv_transformed(roster_table_obj):
+    roster, engine = roster_table_obj
+    filter = {"equal": [{"column_name": ["Grade"]}, {"literal": [100]}]}
+    order_by = [{"field": "Student Name", "direction": "desc"}]
+    rows = _read_csv(export_records_to_csv(roster, engine, order_by=order_by, filter=filter))
+    records = get_records(roster, engine, order_by=order_by, filter=filter)
+    assert len(records) > 0
+    assert [row[0] for row in rows[1:]] == [str(record[0]) for record in records]
+
+
+def test_export_records_to_csv_stopped_early(roster_table_obj, monkeypatch):
+    roster, engine = roster_table_obj
+    monkeypatch.setattr('db.records.operations.export.COPY_CHUNK_SIZE', 100)
+    chunks = export_records_to_csv(roster, engine)
+    next(chunks)
+    chunks.close()
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT 1')).scalar() == 1
@@ -38,43 +38,34 @@ def roster_percentile_subj_grade_setup(roster_table_obj):
 def record_dictionary_list():
     return [
         {
-            'data': {
-                'id': 1, 'Center': 'NASA KSC', 'Status': 'Application', 'Case Number': 'KSC-12871',
-                '__mathesar_group_metadata': {
-                    'group_id': 15, 'count': 29,
-                    'first_value': {'Center': 'NASA KSC', 'Status': 'Application'},
-                    'last_value': {'Center': 'NASA KSC', 'Status': 'Application'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
-            },
-            'metadata': {}
+            'id': 1, 'Center': 'NASA KSC', 'Status': 'Application', 'Case Number': 'KSC-12871',
+            '__mathesar_group_metadata': {
+                'group_id': 15, 'count': 29,
+                'first_value': {'Center': 'NASA KSC', 'Status': 'Application'},
+                'last_value': {'Center': 'NASA KSC', 'Status': 'Application'},
+                'less_than_eq_value': None, 'greater_than_eq_value': None,
+                'less_than_value': None, 'greater_than_value': None,
+            }
         },
         {
-            'data': {
-                'id': 2, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14048-1',
-                '__mathesar_group_metadata': {
-                    'group_id': 2, 'count': 100,
-                    'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
-            },
-            'metadata': {}
+            'id': 2, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14048-1',
+            '__mathesar_group_metadata': {
+                'group_id': 2, 'count': 100,
+                'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
+                'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
+                'less_than_eq_value': None, 'greater_than_eq_value': None,
+                'less_than_value': None, 'greater_than_value': None,
+            }
         },
         {
-            'data': {
-                'id': 3, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14231-1',
-                '__mathesar_group_metadata': {
-                    'group_id': 2, 'count': 100,
-                    'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
-            },
-            'metadata': {}
+            'id': 3, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14231-1',
+            '__mathesar_group_metadata': {
+                'group_id': 2, 'count': 100,
+                'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
+                'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
+                'less_than_eq_value': None, 'greater_than_eq_value': None,
+                'less_than_value': None, 'greater_than_value': None,
+            }
         }
     ]
 
@@ -771,39 +762,44 @@ def test_get_percentile_range_group_groups_correct(roster_percentile_subj_grade_
 
 
 def test_extract_group_metadata_correct_data(record_dictionary_list):
-    records, _ = group.extract_group_metadata(
-        record_dictionary_list, data_key='data', metadata_key='metadata'
-    )
     data_no_meta = [
-        {k: v for k, v in rec['data'].items() if k != group.MATHESAR_GROUP_METADATA}
+        {k: v for k, v in rec.items() if k != group.MATHESAR_GROUP_METADATA}
         for rec in record_dictionary_list
     ]
-    assert all(
-        [rec['data'] == expect for rec, expect in zip(records, data_no_meta)]
-    )
+    group.extract_group_metadata(record_dictionary_list)
+    assert record_dictionary_list == data_no_meta
 
 
 def test_extract_group_metadata_correct_metadata(record_dictionary_list):
-    records, _ = group.extract_group_metadata(
-        record_dictionary_list, data_key='data', metadata_key='metadata'
-    )
-    assert all(
-        [
-            rec['metadata'][group.GroupMetadataField.GROUP_ID.value] == _group_id(orig['data'])
-            for rec, orig in zip(records, record_dictionary_list)
-        ]
-    )
+    expect_ids = [_group_id(rec) for rec in record_dictionary_list]
+    record_metadata, _ = group.extract_group_metadata(record_dictionary_list)
+    assert [
+        meta[group.GroupMetadataField.GROUP_ID.value] for meta in record_metadata
+    ] == expect_ids
 
 
 def test_extract_group_metadata_correct_groups(record_dictionary_list):
-    _, groups = group.extract_group_metadata(
-        record_dictionary_list, data_key='data', metadata_key='metadata'
-    )
+    expect_ids = [_group_id(rec) for rec in record_dictionary_list]
+    _, groups = group.extract_group_metadata(record_dictionary_list)
     assert len(groups) == 2
     actual_ids = [
         gr_dict[group.GroupMetadataField.GROUP_ID.value] for gr_dict in groups
     ]
-    expect_ids = [
-        _group_id(rec['data']) for rec in record_dictionary_list
-    ]
-    assert set(actual_ids) == set(expect_ids)
+    assert actual_ids == sorted(set(expect_ids))
+
+
+def test_extract_group_metadata_first_record_ungrouped(record_dictionary_list):
+    record_dictionary_list[0].pop(group.MATHESAR_GROUP_METADATA)
+    record_metadata, groups = group.extract_group_metadata(record_dictionary_list)
+    assert record_metadata[0] is None
+    assert [
+        gr_dict[group.GroupMetadataField.GROUP_ID.value] for gr_dict in groups
+    ] == [2]
+
+
+def test_extract_group_metadata_ungrouped(record_dictionary_list):
+    for rec in record_dictionary_list:
+        rec.pop(group.MATHESAR_GROUP_METADATA)
+    record_metadata, groups = group.extract_group_metadata(record_dictionary_list)
+    assert record_metadata == [None] * len(record_dictionary_list)
+    assert groups is None
@@ -1,5 +1,12 @@
-from db.records.operations.insert import insert_from_select
+from sqlalchemy import select
+
+from db.records.operations.insert import (
+    get_csv_chunks, insert_from_select, insert_record_or_records, insert_records_from_csv_chunks,
+)
 from db.records.operations.select import get_records
+from db.tables.operations.staging import (
+    CHUNK_COLUMN, ROW_COLUMN, create_staging_table, prepare_staging_connection,
+)
 
 
 def test_insert_from_select_without_mappings(books_table_import_from_obj, books_table_import_target_obj):
@@ -39,3 +46,53 @@ def test_insert_from_select_with_mappings(books_table_import_from_obj, books_tab
     assert res_table.c['title'] == target_table.c[1]
     assert res_table.c['author'] == target_table.c[2]
     assert records == records_with_mappings
+
+
+def test_insert_record_or_records_returns_inserted_record(books_table_import_target_obj):
+    table, engine = books_table_import_target_obj
+    record = insert_record_or_records(table, engine, {'title': 'Dune', 'author': 'Frank Herbert'})
+    assert record == {'id': 4, 'title': 'Dune', 'author': 'Frank Herbert'}
+    # Every column gets its default.
+    assert insert_record_or_records(table, engine, {}) == {'id': 5, 'title': None, 'author': None}
+    records = [{'title': 'Emma', 'author': 'Jane Austen'}, {'title': 'Ulysses', 'author': 'James Joyce'}]
+    assert insert_record_or_records(table, engine, records) is None
+    assert len(get_records(table, engine)) == 7
+
+
+def test_get_csv_chunks_ends_chunks_on_record_boundaries(tmp_path):
+    csv_filepath = tmp_path / 'chunks.csv'
+    contents = b'name,notes\na,"one\ntwo"\nb,"say ""hi""\n"\nc,three\n'
+    csv_filepath.write_bytes(contents)
+    chunks = get_csv_chunks(csv_filepath, 1)
+    assert [contents[start:end] for start, end in chunks] == [
+        b'name,notes\n', b'a,"one\ntwo"\n', b'b,"say ""hi""\n"\n', b'c,three\n',
+    ]
+    assert get_csv_chunks(csv_filepath, len(contents)) == [(0, len(contents))]
+
+
+def test_insert_records_from_csv_chunks(engine_with_schema, tmp_path):
+    engine, _ = engine_with_schema
+    csv_filepath = tmp_path / 'chunks.csv'
+    values = [f'line {i}\nof "{i}"' for i in range(200)]
+    csv_filepath.write_text(
+        'value\n' + ''.join('"' + value.replace('"', '""') + '"\n' for value in values)
+    )
+    table = create_staging_table(['value'], engine)
+    progress = []
+    chunk_row_counts = insert_records_from_csv_chunks(
+        table, engine, csv_filepath, ['value'], True, encoding='utf-8', chunk_size=100,
+        max_workers=4, prepare_connection=prepare_staging_connection,
+        on_progress=lambda *args: progress.append(args),
+    )
+    assert len(chunk_row_counts) > 1
+    assert sum(chunk_row_counts) == 200
+    assert progress[-1] == (csv_filepath.stat().st_size, 200)
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(table.c[CHUNK_COLUMN], table.c.value)
+            .order_by(table.c[CHUNK_COLUMN], table.c[ROW_COLUMN])
+        ).fetchall()
+    assert [row.value for row in rows] == values
+    assert [row[0] for row in rows] == [
+        index for index, num_rows in enumerate(chunk_row_counts) for _ in range(num_rows)
+    ]
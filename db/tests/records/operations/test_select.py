@@ -1,10 +1,13 @@
 from decimal import Decimal
 from collections import Counter
 
-from sqlalchemy import Column, VARCHAR
+from sqlalchemy import Column, VARCHAR, text
 
-from db.records.operations.select import get_records, get_column_cast_records
+from db.records.operations.select import (
+    get_approximate_count, get_count_estimate, get_records, get_records_in_batches, get_column_cast_records,
+)
 from db.tables.operations.create import create_mathesar_table
+from db.tables.operations.select import get_oid_from_table
 from db.types.base import PostgresType
 
 
@@ -27,6 +30,42 @@ def test_get_records_gets_limited_offset_records(roster_table_obj):
     assert len(offset_records) == 10 and offset_records[0] == base_records[5]
 
 
+def test_get_records_in_batches(roster_table_obj):
+    roster, engine = roster_table_obj
+    batches = list(get_records_in_batches(roster, engine, 300))
+    assert [len(batch) for batch in batches] == [300, 300, 300, 100]
+    records = [record for batch in batches for record in batch]
+    assert records == get_records(roster, engine, order_by=[{'field': 'id', 'direction': 'asc'}])
+
+
+def test_get_approximate_count(roster_table_obj):
+    roster, engine = roster_table_obj
+    with engine.begin() as conn:
+        conn.execute(text(f'ANALYZE "{roster.schema}"."{roster.name}"'))
+    table_oid = get_oid_from_table(roster.name, roster.schema, engine)
+    assert get_approximate_count(table_oid, engine) == 1000
+
+
+def test_get_count_estimate(roster_table_obj):
+    roster, engine = roster_table_obj
+    with engine.begin() as conn:
+        conn.execute(text(f'ANALYZE "{roster.schema}"."{roster.name}"'))
+    estimated_count, estimated_cost = get_count_estimate(roster, engine)
+    assert estimated_count == 1000
+    assert estimated_cost > 0
+    filter = {'equal': [{'column_name': ['Subject']}, {'literal': ['Physics']}]}
+    filtered_count, _ = get_count_estimate(roster, engine, filter=filter)
+    assert filtered_count < estimated_count
+
+
+def test_get_count_estimate_in_filter(roster_table_obj):
+    roster, engine = roster_table_obj
+    # The values of in filters are expanded into parameters when the query is executed.
+    filter = {'in': [{'column_name': ['Subject']}, {'literal': [['Physics', 'Math']]}]}
+    estimated_count, _ = get_count_estimate(roster, engine, filter=filter)
+    assert 0 < estimated_count < 1000
+
+
 def test_get_column_cast_records(engine_with_schema):
     COL1 = "col1"
     COL2 = "col2"
@@ -1,10 +1,11 @@
 import pytest
 
-from sqlalchemy import MetaData, Table
+from sqlalchemy import MetaData, Table, update
 from sqlalchemy.schema import DropConstraint
 
+from db.records.exceptions import BadSeekFormat
 from db.records.operations.select import get_records
-from db.records.operations.sort import BadSortFormat, SortFieldNotFound
+from db.records.operations.sort import BadSortFormat, SortFieldNotFound, get_sort_key_names
 
 
 def test_get_records_gets_ordered_records_str_col_name(roster_table_obj):
@@ -254,3 +255,46 @@ def test_get_records_orders_exceptions(filter_sort_table_obj, order_list, except
     filter_sort, engine = filter_sort_table_obj
     with pytest.raises(exception):
         get_records(filter_sort, engine, order_by=order_list)
+
+
+def _get_records_by_seeking(table, engine, order_by, page_size):
+    sort_key_names = get_sort_key_names(table, order_by)
+    records = []
+    seek_after = None
+    while True:
+        page = get_records(
+            table, engine, limit=page_size, order_by=order_by, seek_after=seek_after,
+            fallback_to_default_ordering=True,
+        )
+        records += page
+        if len(page) < page_size:
+            return records
+        seek_after = [page[-1]._mapping[name] for name in sort_key_names]
+
+
+seek_order_bys = [
+    [],
+    [{"field": "Grade", "direction": "asc"}],
+    [{"field": "Grade", "direction": "desc"}, {"field": "Subject", "direction": "asc"}],
+    [{"field": "Grade", "direction": "asc", "nullsfirst": True}],
+    [{"field": "Grade", "direction": "desc", "nullslast": True}],
+]
+
+
+@pytest.mark.parametrize("order_by", seek_order_bys)
+def test_get_records_seek_after_pages_through_ordering(roster_table_obj, order_by):
+    roster, engine = roster_table_obj
+    with engine.begin() as conn:
+        conn.execute(update(roster).where(roster.c.id % 7 == 0).values(Grade=None))
+    expected_ids = [
+        row.id for row in get_records(roster, engine, order_by=order_by, fallback_to_default_ordering=True)
+    ]
+    seeked_ids = [row.id for row in _get_records_by_seeking(roster, engine, order_by, 37)]
+    assert seeked_ids == expected_ids
+
+
+def test_get_records_seek_after_wrong_length(roster_table_obj):
+    roster, engine = roster_table_obj
+    order_by = [{"field": "Grade", "direction": "asc"}]
+    with pytest.raises(BadSeekFormat):
+        get_records(roster, engine, order_by=order_by, seek_after=[50])
@@ -0,0 +1,15 @@
+from db.records.operations.select import get_record
+from db.records.operations.update import update_record
+
+
+def test_update_record_returns_updated_record(times_table_obj):
+    table, engine = times_table_obj
+    record = update_record(table, engine, 2, {'date': '2011-01-08'})
+    # Keyed by column names, with values like the ones read by get_record.
+    assert record == get_record(table, engine, 2)._asdict()
+    assert record['date'] != get_record(table, engine, 1)._asdict()['date']
+
+
+def test_update_record_missing_record(times_table_obj):
+    table, engine = times_table_obj
+    assert update_record(table, engine, 100, {'date': '2011-01-08'}) is None
@@ -1,6 +1,13 @@
+import inspect
 import sys
+
+import sqlalchemy
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql.base import PGDialect
+from sqlalchemy.engine.reflection import Inspector
+
 from db.columns.operations.select import get_column_name_from_attnum
+from db.tables.operations import reflect as ma_reflect
 from db.tables.operations import select as ma_sel
 import pytest
 from db.metadata import get_empty_metadata
@@ -231,3 +238,78 @@ def test_get_description_from_table(roster_table_name, engine_with_roster):
     actual_comment = ma_sel.get_table_description(roster_table_oid, engine)
 
     assert actual_comment == expect_comment
+
+
+def _get_table_description(table):
+    return (
+        table.fullname,
+        [(col.name, repr(col.type), col.nullable, col.primary_key) for col in table.columns],
+        sorted(
+            (
+                type(constraint).__name__,
+                constraint.name,
+                sorted(col.name for col in constraint.columns),
+                sorted(fkey.target_fullname for fkey in getattr(constraint, 'elements', [])),
+            )
+            for constraint in table.constraints
+        ),
+    )
+
+
+def test_reflect_tables_from_oids_matches_autoload(engine_with_academics):
+    engine, schema = engine_with_academics
+    oids = [ma_sel.get_oid_from_table(ARTICLES, schema, engine)]
+    bulk_metadata = get_empty_metadata()
+    tables = ma_sel.reflect_tables_from_oids(oids, engine, metadata=bulk_metadata)
+    autoload_metadata = get_empty_metadata()
+    ma_sel.reflect_table(ARTICLES, schema, engine, metadata=autoload_metadata)
+    # Tables referred to by foreign keys are reflected too, as with autoloading.
+    assert set(bulk_metadata.tables) == set(autoload_metadata.tables)
+    for key, autoloaded_table in autoload_metadata.tables.items():
+        assert (
+            _get_table_description(bulk_metadata.tables[key])
+            == _get_table_description(autoloaded_table)
+        )
+    assert tables[oids[0]] is bulk_metadata.tables[f'{schema}.{ARTICLES}']
+
+
+def test_reflect_tables_from_oids_skips_unknown_oids(engine_with_academics):
+    engine, schema = engine_with_academics
+    oid = ma_sel.get_oid_from_table(ARTICLES, schema, engine)
+    tables = ma_sel.reflect_tables_from_oids([oid, 0], engine, metadata=get_empty_metadata())
+    assert list(tables.keys()) == [oid]
+
+
+def test_bulk_reflection_supports_installed_sqlalchemy():
+    # Bulk reflection relies on these private internals, and falls back to (slow) autoloading with
+    # any other SQLAlchemy version. Check them against the new version before bumping it.
+    assert sqlalchemy.__version__ == ma_reflect.SUPPORTED_SQLALCHEMY_VERSION
+    assert list(inspect.signature(PGDialect._load_domains).parameters) == ['self', 'connection']
+    assert list(inspect.signature(PGDialect._load_enums).parameters) == [
+        'self', 'connection', 'schema',
+    ]
+    assert list(inspect.signature(PGDialect._get_column_info).parameters) == [
+        'self', 'name', 'format_type', 'default', 'notnull', 'domains', 'enums', 'schema',
+        'comment', 'generated', 'identity',
+    ]
+    assert list(inspect.signature(Inspector._init_connection).parameters) == [
+        'self', 'connection',
+    ]
+
+
+def test_reflect_tables_from_oids_autoloads_with_unsupported_sqlalchemy(
+    engine_with_academics, monkeypatch
+):
+    engine, schema = engine_with_academics
+    oids = [ma_sel.get_oid_from_table(ARTICLES, schema, engine), 0]
+    monkeypatch.setattr(ma_reflect, 'SUPPORTED_SQLALCHEMY_VERSION', '0.0.0')
+    metadata = get_empty_metadata()
+    with pytest.warns(UserWarning, match='autoloading tables one at a time'):
+        tables = ma_sel.reflect_tables_from_oids(oids, engine, metadata=metadata)
+    assert list(tables.keys()) == oids[:1]
+    autoload_metadata = get_empty_metadata()
+    ma_sel.reflect_table(ARTICLES, schema, engine, metadata=autoload_metadata)
+    assert (
+        _get_table_description(tables[oids[0]])
+        == _get_table_description(autoload_metadata.tables[f'{schema}.{ARTICLES}'])
+    )
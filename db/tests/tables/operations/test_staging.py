@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy import MetaData, Table, inspect, select, text
+
+from db.constants import ID, ID_ORIGINAL
+from db.records.operations.insert import insert_record_or_records
+from db.records.operations.select import get_records
+from db.tables.operations.create import DuplicateTable, create_mathesar_table
+from db.tables.operations.staging import (
+    create_staging_table, get_staging_table_keys, prepare_staging_connection, swap_in_staging_table,
+)
+
+
+def _copy_chunks(staging_table, engine, chunks, order=None):
+    # Chunks can be copied in any order.
+    for index in order or range(len(chunks)):
+        with engine.begin() as conn:
+            prepare_staging_connection(conn, index)
+            conn.execute(staging_table.insert(), chunks[index])
+    return [len(records) for records in chunks]
+
+
+def test_swap_in_staging_table(engine_with_schema):
+    engine, schema = engine_with_schema
+    staging_table = create_staging_table(['name', 'born'], engine)
+    chunk_row_counts = _copy_chunks(staging_table, engine, [
+        [{'name': 'Ada', 'born': '1815'}, {'name': 'Alan', 'born': '1912'}],
+        [{'name': 'Grace', 'born': '1906'}],
+    ], order=[1, 0])
+    table = swap_in_staging_table(
+        staging_table, 'people', schema, ['name', 'born'], chunk_row_counts, engine,
+        comment='Pioneers',
+    )
+    assert get_records(table, engine, fallback_to_default_ordering=True) == [
+        (1, 'Ada', '1815'), (2, 'Alan', '1912'), (3, 'Grace', '1906'),
+    ]
+    assert not inspect(engine).has_table(staging_table.name, schema=staging_table.schema)
+    assert inspect(engine).get_pk_constraint('people', schema=schema) == {
+        'name': 'people_pkey', 'constrained_columns': [ID],
+    }
+    assert inspect(engine).get_table_comment('people', schema=schema)['text'] == 'Pioneers'
+    with engine.begin() as conn:
+        persistence = conn.execute(
+            select(text('relpersistence')).select_from(text('pg_class'))
+            .where(text('oid = CAST(:table AS regclass)')),
+            {'table': f'"{schema}"."people"'},
+        ).scalar()
+    assert persistence == 'p'
+    # The id column's sequence continues after the swapped in records.
+    assert insert_record_or_records(table, engine, {'name': 'Barbara'})[ID] == 4
+
+
+def test_swap_in_staging_table_uses_valid_ids(engine_with_schema):
+    engine, schema = engine_with_schema
+    staging_table = create_staging_table([ID, 'name'], engine)
+    chunk_row_counts = _copy_chunks(staging_table, engine, [
+        [{ID: '7', 'name': 'Ada'}, {ID: '3', 'name': 'Alan'}],
+    ])
+    table = swap_in_staging_table(
+        staging_table, 'people', schema, [ID, 'name'], chunk_row_counts, engine
+    )
+    assert [column.name for column in table.columns] == [ID, 'name']
+    assert get_records(table, engine, fallback_to_default_ordering=True) == [(3, 'Alan'), (7, 'Ada')]
+    assert insert_record_or_records(table, engine, {'name': 'Grace'})[ID] == 8
+
+
+@pytest.mark.parametrize('ids', [['a', 'b'], ['1', '1'], ['1', None]])
+def test_swap_in_staging_table_falls_back_on_invalid_ids(engine_with_schema, ids):
+    engine, schema = engine_with_schema
+    staging_table = create_staging_table([ID, 'name'], engine)
+    chunk_row_counts = _copy_chunks(staging_table, engine, [
+        [{ID: ids[0], 'name': 'Ada'}, {ID: ids[1], 'name': 'Alan'}],
+    ])
+    swap_in_staging_table(
+        staging_table, 'people', schema, [ID, 'name'], chunk_row_counts, engine
+    )
+    table = Table('people', MetaData(), schema=schema, autoload_with=engine)
+    assert [column.name for column in table.columns] == [ID, ID_ORIGINAL, 'name']
+    assert get_records(table, engine, fallback_to_default_ordering=True) == [(1, ids[0], 'Ada'), (2, ids[1], 'Alan')]
+
+
+def test_swap_in_staging_table_avoids_taken_relation_names(engine_with_schema):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SEQUENCE "{schema}"."people_id_seq"'))
+    staging_table = create_staging_table(['name'], engine)
+    chunk_row_counts = _copy_chunks(staging_table, engine, [[{'name': 'Ada'}]])
+    table = swap_in_staging_table(
+        staging_table, 'people', schema, ['name'], chunk_row_counts, engine
+    )
+    assert insert_record_or_records(table, engine, {'name': 'Alan'})[ID] == 2
+    with engine.begin() as conn:
+        sequence = conn.execute(
+            select(text(f"pg_get_serial_sequence('\"{schema}\".\"people\"', 'id')"))
+        ).scalar()
+    assert sequence == f'{schema}.people_id_seq1'
+
+
+def test_swap_in_staging_table_duplicate_name(engine_with_schema):
+    engine, schema = engine_with_schema
+    create_mathesar_table('people', schema, [], engine)
+    staging_table = create_staging_table(['name'], engine)
+    chunk_row_counts = _copy_chunks(staging_table, engine, [[{'name': 'Ada'}]])
+    with pytest.raises(DuplicateTable):
+        swap_in_staging_table(
+            staging_table, 'people', schema, ['name'], chunk_row_counts, engine
+        )
+    # The staging table is left as it was, to be dropped.
+    assert inspect(engine).has_table(staging_table.name, schema=staging_table.schema)
+
+
+def test_get_staging_table_keys(engine_with_schema):
+    engine, _ = engine_with_schema
+    keyed_staging_table = create_staging_table(['name'], engine, key=12)
+    staging_table = create_staging_table(['name'], engine)
+    staging_table_keys = get_staging_table_keys(engine)
+    assert staging_table_keys[keyed_staging_table.name] == '12'
+    assert staging_table_keys[staging_table.name] is None
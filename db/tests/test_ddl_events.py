@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from db.ddl_events import (
+    FULL, TABLE_OIDS, install_ddl_event_triggers, listen_for_ddl_events, merge_ddl_events,
+    uninstall_ddl_event_triggers,
+)
+from db.tables.operations.select import get_oid_from_table
+
+
+@pytest.fixture
+def engine_with_ddl_event_triggers(engine_with_schema):
+    engine, schema = engine_with_schema
+    install_ddl_event_triggers(engine)
+    yield engine, schema
+    uninstall_ddl_event_triggers(engine)
+
+
+def _collect_ddl_events(engine, statements):
+    received_events = []
+    listening = threading.Event()
+    stop = threading.Event()
+
+    def _on_events(events):
+        received_events.extend(events)
+        stop.set()
+
+    def _should_stop():
+        listening.set()
+        return stop.is_set()
+
+    listener = threading.Thread(
+        target=listen_for_ddl_events,
+        args=(engine, _on_events, _should_stop),
+        kwargs={'poll_interval': 0.1},
+    )
+    listener.start()
+    listening.wait(timeout=5)
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    listener.join(timeout=5)
+    stop.set()
+    return received_events
+
+
+def test_ddl_events_alter_table(engine_with_ddl_event_triggers):
+    engine, schema = engine_with_ddl_event_triggers
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE "{schema}".ddl_events_alter (id integer)'))
+    table_oid = get_oid_from_table('ddl_events_alter', schema, engine)
+    events = _collect_ddl_events(
+        engine, [f'ALTER TABLE "{schema}".ddl_events_alter ADD COLUMN name text']
+    )
+    table_oids, full = merge_ddl_events(events)
+    assert table_oids == {table_oid}
+    assert full is False
+
+
+def test_ddl_events_drop_table(engine_with_ddl_event_triggers):
+    engine, schema = engine_with_ddl_event_triggers
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE "{schema}".ddl_events_drop (id integer)'))
+    events = _collect_ddl_events(engine, [f'DROP TABLE "{schema}".ddl_events_drop'])
+    _, full = merge_ddl_events(events)
+    assert full is True
+
+
+def test_merge_ddl_events():
+    events = [
+        {TABLE_OIDS: [1, 2], FULL: False},
+        {TABLE_OIDS: [2, 3], FULL: False},
+        {TABLE_OIDS: [], FULL: True},
+    ]
+    assert merge_ddl_events(events) == ({1, 2, 3}, True)
+
+
+def test_install_ddl_event_triggers_concurrently(engine_with_ddl_event_triggers):
+    engine, _ = engine_with_ddl_event_triggers
+    errors = []
+
+    def _install():
+        try:
+            for _ in range(5):
+                install_ddl_event_triggers(engine)
+        except Exception as e:
+            errors.append(e)
+
+    installers = [threading.Thread(target=_install) for _ in range(4)]
+    for installer in installers:
+        installer.start()
+    for installer in installers:
+        installer.join()
+    assert errors == []
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import MetaData, Table, select
+
+from db import pg_catalog
+from db.utils import get_pg_catalog_table, ignore_type_warning
+
+
+@ignore_type_warning
+def _autoload_pg_catalog_table(table_name, engine):
+    return Table(table_name, MetaData(), autoload_with=engine, schema='pg_catalog')
+
+
+@pytest.mark.parametrize('table_name', pg_catalog._PG_CATALOG_COLUMNS.keys())
+def test_declared_pg_catalog_table_matches_autoloaded(engine, table_name):
+    declared_table = pg_catalog.get_declared_pg_catalog_table(table_name, engine)
+    autoloaded_table = _autoload_pg_catalog_table(table_name, engine)
+    declared_columns = {column.name: type(column.type) for column in declared_table.columns}
+    autoloaded_columns = {column.name: type(column.type) for column in autoloaded_table.columns}
+    assert declared_columns == autoloaded_columns
+
+
+def test_get_pg_catalog_table_shares_declared_tables(engine):
+    pg_class = get_pg_catalog_table('pg_class', engine, metadata=MetaData())
+    assert get_pg_catalog_table('pg_class', engine) is pg_class
+
+
+def test_declared_pg_catalog_table_is_queryable(engine):
+    pg_namespace = get_pg_catalog_table('pg_namespace', engine)
+    with engine.connect() as conn:
+        schema_names = conn.execute(select(pg_namespace.c.nspname)).scalars().all()
+    assert 'pg_catalog' in schema_names
+
+
+def test_get_pg_catalog_table_autoloads_undeclared_table(engine):
+    pg_type = get_pg_catalog_table('pg_type', engine, metadata=MetaData())
+    assert 'typname' in pg_type.columns
@@ -1,7 +1,11 @@
-from sqlalchemy import MetaData, Column, String, Table
+import pytest
+from psycopg2.errors import QueryCanceled
+from sqlalchemy import MetaData, Column, String, Table, text
+from sqlalchemy.exc import OperationalError
 
 from db.columns.utils import get_enriched_column_table
 from db.metadata import get_empty_metadata
+from db.utils import connect_with_query_budget, connect_with_shared_snapshot
 
 
 def test_get_enriched_column_table(engine):
@@ -16,3 +20,35 @@ def test_get_enriched_column_table_no_engine():
     table = Table("testtable", MetaData(), Column(abc, String), Column('def', String))
     enriched_table = get_enriched_column_table(table, metadata=get_empty_metadata())
     assert enriched_table.columns[abc].engine is None
+
+
+def test_connect_with_shared_snapshot(engine_with_schema):
+    engine, schema = engine_with_schema
+    count_query = text(f'SELECT count(*) FROM "{schema}".snapshot_test')
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE "{schema}".snapshot_test (id integer)'))
+    with connect_with_shared_snapshot(engine, 2) as (conn_1, conn_2):
+        assert conn_1.execute(count_query).scalar() == 0
+        with engine.begin() as conn:
+            conn.execute(text(f'INSERT INTO "{schema}".snapshot_test VALUES (1)'))
+        # Neither connection sees the insert, which happened after the snapshot was taken.
+        assert conn_2.execute(count_query).scalar() == 0
+        assert conn_1.execute(count_query).scalar() == 0
+    with engine.connect() as conn:
+        assert conn.execute(count_query).scalar() == 1
+
+
+def test_connect_with_query_budget(engine):
+    with connect_with_query_budget(engine, statement_timeout=5000, work_mem='8MB') as conn:
+        assert conn.execute(text('SHOW statement_timeout')).scalar() == '5s'
+        assert conn.execute(text('SHOW work_mem')).scalar() == '8MB'
+    # The budget only applies to the transaction.
+    with engine.connect() as conn:
+        assert conn.execute(text('SHOW work_mem')).scalar() != '8MB'
+
+
+def test_connect_with_query_budget_timeout(engine):
+    with pytest.raises(OperationalError) as exc_info:
+        with connect_with_query_budget(engine, statement_timeout=50) as conn:
+            conn.execute(text('SELECT pg_sleep(1)'))
+    assert isinstance(exc_info.value.orig, QueryCanceled)
@@ -133,6 +133,26 @@ class Order(Transform):
         return _to_non_executable(executable)
 
 
+class Seek(Transform):
+    """
+    Orders the relation like Order does, keeping only the rows that come after the row with the
+    given sort key. Used for keyset pagination.
+
+    "spec": {
+        "order_by": [{"field": "col1", "direction": "asc"}],
+        "after": [5, 2]  # values of the deterministic sort key, or None for the first page
+    }
+    """
+    type = "seek"
+
+    def apply_to_relation(self, relation):
+        enforce_relation_type_expectations(relation)
+        executable = rec_sort.apply_relation_seek(
+            relation, self.spec.get('order_by'), self.spec.get('after')
+        )
+        return _to_non_executable(executable)
+
+
 class Limit(Transform):
     type = "limit"
 
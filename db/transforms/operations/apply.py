@@ -28,6 +28,7 @@ def apply_transformations_deprecated(
     duplicate_only=None,
     search=None,
     fallback_to_default_ordering=False,
+    seek_after=None,
 ):
     """
     ## Regarding ordering
@@ -39,6 +40,12 @@ def apply_transformations_deprecated(
     At the same time, when both `order_by` and `fallback_to_default_ordering` are falsy, an ordering
     will not be applied. This is useful, when `table` has already been pre-sorted (e.g. because it's
     actually the result of a DBQuery that defines an ordering that we don't want to override).
+
+    ## Regarding seeking
+
+    When `seek_after` (the sort key of the last row of the previous page, see
+    `db.records.operations.sort.get_sort_key_names`) is given, only the rows that come after it are
+    kept, and the deterministic ordering is always applied. Use it instead of `offset`.
     """
     # TODO rename the actual method parameter
     if search is None:
@@ -55,7 +62,9 @@ def apply_transformations_deprecated(
         transforms.append(base.DuplicateOnly(duplicate_only))
     if group_by:
         transforms.append(base.Group(group_by))
-    if order_by or fallback_to_default_ordering:
+    if seek_after is not None:
+        transforms.append(base.Seek({'order_by': order_by, 'after': seek_after}))
+    elif order_by or fallback_to_default_ordering:
         transforms.append(base.Order(order_by))
     if search:
         transforms.append(base.Search([search, limit]))
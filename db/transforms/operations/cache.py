@@ -0,0 +1,364 @@
+"""
+A process-wide cache of relations built by applying transformations.
+
+SQLAlchemy already caches the SQL it compiles for a statement, keyed by the statement's structure,
+so that only the bound values differ from one execution to the next. What it can't avoid is
+building the statement in the first place: for a query, that means reflecting its tables and
+looking up its columns' names, and then applying its transformations, on every request.
+
+Relations are cached by the catalog fingerprints of the tables they're built from (see
+get_table_fingerprints_from_oids), so that a relation built before one of those tables' columns or
+constraints changed is never reused.
+
+They're also cached by the shape of the specs they're built from, rather than by the specs
+themselves. The values in specs (the literals of filters and searches, and the sort keys to seek
+after) end up as bound parameters, so a relation built for some values is reused for others by
+replacing its parameters' values. To tell which parameters hold which values, a relation is built
+with a unique placeholder in place of each value. Specs with values that don't end up as bound
+parameters as they are (e.g. searches, which turn them into patterns) aren't cached.
+"""
+import json
+import random
+import threading
+from collections import OrderedDict
+from copy import copy
+from itertools import count
+from uuid import uuid4
+
+from sqlalchemy.sql import ClauseElement, visitors
+from sqlalchemy.sql.elements import BindParameter
+
+from db.tables.operations.select import get_table_fingerprints_from_oids
+
+# How many relations are kept, across all databases.
+RELATION_CACHE_SIZE = 256
+
+# The keys under which specs hold values: filter specs hold a list of them under "literal", search
+# specs a single one, and seek specs a list of them under "after" (or "seek_after").
+_VALUE_KEYS = {'literal', 'after', 'seek_after'}
+
+
+class RelationCacheKey:
+    """
+    The shape of the specs a relation is built from, and their values.
+    """
+
+    def __init__(self, shape, values, parent=None):
+        self.shape = shape
+        self.values = values
+        # The key of the relation this one is built from, if any.
+        self.parent = parent
+
+
+def get_relation_cache_key(engine, table_oids, *specs, table_fingerprints=None):
+    """
+    Returns a key for a relation built from the tables with the given oids, according to the given
+    specs, or None if the relation can't be cached (e.g. because one of the tables doesn't exist).
+
+    table_fingerprints can map (some of) the tables' oids to their fingerprints, e.g. as of their
+    last reflection. The fingerprints of the other tables are queried.
+
+    Specs can be anything that's JSON serializable, and objects (like Transforms or InitialColumns)
+    whose attributes are. Specs that refer to SQLAlchemy objects (e.g. an order_by with columns
+    rather than column names) can't be cached.
+    """
+    shape, values = _get_shape_and_values(specs)
+    if shape is None:
+        return None
+    table_oids = set(table_oids)
+    fingerprints = {
+        oid: fingerprint for oid, fingerprint in (table_fingerprints or {}).items()
+        if oid in table_oids
+    }
+    missing_table_oids = table_oids - fingerprints.keys()
+    if len(missing_table_oids) > 0:
+        fingerprints.update(
+            (row['oid'], row['fingerprint'])
+            for row in get_table_fingerprints_from_oids(list(missing_table_oids), engine)
+        )
+    if set(fingerprints) != table_oids:
+        return None
+    return RelationCacheKey(
+        (str(engine.url), tuple(sorted(fingerprints.items())), shape), values
+    )
+
+
+def get_derived_relation_cache_key(relation_cache_key, *specs):
+    """
+    Returns a key for a relation built from the relation with the given key, according to the
+    given specs. Like the given key, the returned one may be None.
+    """
+    if relation_cache_key is None:
+        return None
+    shape, values = _get_shape_and_values(specs)
+    if shape is None:
+        return None
+    return RelationCacheKey(
+        (relation_cache_key.shape, shape),
+        relation_cache_key.values + values,
+        parent=relation_cache_key,
+    )
+
+
+def get_or_build_relation(relation_cache_key, build_relation, *specs):
+    """
+    Returns the cached relation with the given key, building (and caching) it with build_relation
+    if there's none. Exceptions raised by build_relation aren't cached.
+
+    build_relation is called with specs, which must be those the key was made from, or with a copy
+    of them with placeholders in place of their values. If the key was derived from another, the
+    relation build_relation builds on must be the one returned for that key.
+    """
+    if relation_cache_key is None:
+        return build_relation(*specs)
+    entry = _relation_cache.get(relation_cache_key.shape)
+    if entry is None:
+        entry = _build_relation_cache_entry(relation_cache_key, build_relation, specs)
+        if entry is not None:
+            _relation_cache.set(relation_cache_key.shape, entry)
+    if entry is None or entry is _UNCACHEABLE:
+        return build_relation(*specs)
+    relation, positions_by_bind_key = entry
+    if len(positions_by_bind_key) == 0:
+        return relation
+    return relation.params({
+        bind_key: relation_cache_key.values[position]
+        for bind_key, position in positions_by_bind_key.items()
+    })
+
+
+def clear_relation_cache():
+    _relation_cache.clear()
+
+
+# Cached in place of a relation whose specs' values don't end up as bound parameters.
+_UNCACHEABLE = object()
+
+
+def _build_relation_cache_entry(relation_cache_key, build_relation, specs):
+    """
+    Builds the relation with placeholders in place of the specs' values. Returns it along with the
+    position, in the key's values, of the value each of its bound parameters holds (by their
+    keys), or _UNCACHEABLE. Returns None if the relation can't be cached for now, because the one
+    it's built on isn't cached.
+    """
+    positions_by_bind_key = {}
+    parent = relation_cache_key.parent
+    if parent is not None:
+        parent_entry = _relation_cache.get(parent.shape)
+        if parent_entry is None or parent_entry is _UNCACHEABLE:
+            return None
+        _, parent_positions_by_bind_key = parent_entry
+        positions_by_bind_key.update(parent_positions_by_bind_key)
+    placeholders = _Placeholders(first_position=len(parent.values) if parent is not None else 0)
+    try:
+        relation = build_relation(*_map_values(specs, placeholders.make))
+    except Exception:
+        # Placeholders aren't always valid values. Unless the values themselves aren't either (in
+        # which case this raises), relations of this shape can't be cached.
+        build_relation(*specs)
+        return _UNCACHEABLE
+    found_bind_keys = set()
+    found_positions = set()
+    for element in visitors.iterate(relation):
+        if not isinstance(element, BindParameter):
+            continue
+        if element.key in positions_by_bind_key:
+            found_bind_keys.add(element.key)
+            continue
+        position = placeholders.get_position(element.value)
+        if position is not None:
+            positions_by_bind_key[element.key] = position
+            found_bind_keys.add(element.key)
+            found_positions.add(position)
+        elif placeholders.is_part_of(element.value):
+            return _UNCACHEABLE
+    if found_bind_keys != positions_by_bind_key.keys():
+        # The relation was built on another relation than the cached one it's derived from.
+        return None
+    if found_positions != placeholders.positions:
+        return _UNCACHEABLE
+    return relation, positions_by_bind_key
+
+
+class _Placeholders:
+    """
+    Makes placeholders for values, unique to a single build of a relation, and tells which
+    value's position in a key's values a bound parameter's value is the placeholder of.
+    """
+
+    def __init__(self, first_position):
+        self._token = uuid4().hex
+        # Small enough to be exact as floats, too.
+        self._numbers = count(random.getrandbits(40) << 12)
+        self._positions = count(first_position)
+        self._positions_by_placeholder = {}
+        self._strings = []
+
+    @property
+    def positions(self):
+        return set(self._positions_by_placeholder.values())
+
+    def make(self, value):
+        placeholder = self._make(value)
+        self._positions_by_placeholder[_freeze(placeholder)] = next(self._positions)
+        return placeholder
+
+    def get_position(self, value):
+        try:
+            return self._positions_by_placeholder.get(_freeze(value))
+        except TypeError:
+            return None
+
+    def is_part_of(self, value):
+        if isinstance(value, str):
+            return any(string in value for string in self._strings)
+        if isinstance(value, (list, tuple)):
+            return any(self.is_part_of(item) for item in value)
+        return False
+
+    def _make(self, value):
+        if isinstance(value, list):
+            return [self._make(item) for item in value]
+        number = next(self._numbers)
+        if isinstance(value, str):
+            string = f"{self._token}{number}"
+            self._strings.append(string)
+            return string
+        if isinstance(value, float):
+            self._strings.append(str(float(number)))
+            return float(number)
+        self._strings.append(str(number))
+        return number
+
+
+class _ValueType:
+    """
+    Stands for a value of the given type in the shape of specs.
+    """
+
+    def __init__(self, value):
+        if isinstance(value, list):
+            self.type = [type(item).__name__ for item in value]
+        else:
+            self.type = type(value).__name__
+
+
+def _get_shape_and_values(specs):
+    """
+    Returns the serialized shape of the specs, and their values, or (None, None) if they can't be
+    cached.
+    """
+    values = []
+
+    def _collect_value(value):
+        values.append(value)
+        return _ValueType(value)
+
+    shape = _serialize_specs(_map_values(specs, _collect_value))
+    if shape is None:
+        return None, None
+    return shape, values
+
+
+def _map_values(obj, map_value):
+    """
+    Returns a copy of the given specs, in which map_value's result takes the place of each value.
+    """
+    if isinstance(obj, dict):
+        return {
+            key: _map_value_items(item, map_value) if key in _VALUE_KEYS else _map_values(item, map_value)
+            for key, item in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_map_values(item, map_value) for item in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, ClauseElement):
+        mapped_obj = copy(obj)
+        mapped_obj.__dict__.update(_map_values(vars(obj), map_value))
+        return mapped_obj
+    return obj
+
+
+def _map_value_items(obj, map_value):
+    if isinstance(obj, list):
+        return [_map_value(item, map_value) for item in obj]
+    return _map_value(obj, map_value)
+
+
+def _map_value(value, map_value):
+    if _is_value(value):
+        return map_value(value)
+    return _map_values(value, map_value)
+
+
+def _is_value(value):
+    """
+    Whether the value ends up as a bound parameter. Others (e.g. None, which can make filters and
+    seeks use IS NULL) are part of the specs' shape.
+    """
+    if isinstance(value, list):
+        return len(value) > 0 and all(_is_scalar_value(item) for item in value)
+    return _is_scalar_value(value)
+
+
+def _is_scalar_value(value):
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _serialize_specs(specs):
+    try:
+        return json.dumps(specs, sort_keys=True, default=_serialize_object)
+    except (_UncacheableSpec, TypeError, ValueError):
+        return None
+
+
+class _UncacheableSpec(Exception):
+    pass
+
+
+def _serialize_object(obj):
+    if isinstance(obj, ClauseElement):
+        raise _UncacheableSpec()
+    # The type is part of the serialization, so that e.g. a Decimal and a string, which would be
+    # bound as different types, aren't confused.
+    if hasattr(obj, '__dict__'):
+        return [type(obj).__qualname__, vars(obj)]
+    return [type(obj).__qualname__, str(obj)]
+
+
+class _RelationCache:
+    """
+    A thread-safe LRU cache of relation cache keys to relations.
+    """
+
+    def __init__(self, max_size=RELATION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, relation_cache_key):
+        with self._lock:
+            relation = self._entries.get(relation_cache_key)
+            if relation is not None:
+                self._entries.move_to_end(relation_cache_key)
+            return relation
+
+    def set(self, relation_cache_key, relation):
+        with self._lock:
+            self._entries[relation_cache_key] = relation
+            self._entries.move_to_end(relation_cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_relation_cache = _RelationCache()
@@ -1,3 +1,4 @@
+from contextlib import ExitStack, contextmanager
 import inspect
 import warnings
 
@@ -6,6 +7,7 @@ from psycopg2.errors import UndefinedFunction
 import sqlalchemy
 from sqlalchemy.exc import ProgrammingError
 
+from db import pg_catalog
 from db.records import exceptions
 
 
@@ -24,6 +26,60 @@ def execute_statement(engine, statement, connection_to_use=None):
             raise e
 
 
+def set_query_budget(connection, statement_timeout=None, work_mem=None):
+    """
+    Limits the queries run in the connection's current transaction, like SET LOCAL does.
+
+    statement_timeout is in milliseconds, and work_mem is a Postgres memory size (e.g. '64MB').
+    Falsy values keep the current settings.
+    """
+    config = {'statement_timeout': statement_timeout, 'work_mem': work_mem}
+    set_config_calls = [
+        sqlalchemy.func.set_config(name, str(value), True)
+        for name, value in config.items()
+        if value
+    ]
+    if set_config_calls:
+        connection.execute(sqlalchemy.select(*set_config_calls))
+
+
+@contextmanager
+def connect_with_query_budget(engine, statement_timeout=None, work_mem=None):
+    """
+    Yields a connection in a transaction whose queries are limited by set_query_budget.
+    """
+    with engine.begin() as connection:
+        set_query_budget(connection, statement_timeout=statement_timeout, work_mem=work_mem)
+        yield connection
+
+
+@contextmanager
+def connect_with_shared_snapshot(engine, num_connections):
+    """
+    Yields a list of connections whose (REPEATABLE READ) transactions all see the same snapshot of
+    the database, so that queries run concurrently on them are consistent with each other.
+
+    See https://www.postgresql.org/docs/current/functions-admin.html#FUNCTIONS-SNAPSHOT-SYNCHRONIZATION
+    """
+    with ExitStack() as stack:
+        connections = []
+        snapshot_id = None
+        for _ in range(num_connections):
+            connection = stack.enter_context(engine.connect())
+            connection = connection.execution_options(isolation_level='REPEATABLE READ')
+            stack.enter_context(connection.begin())
+            if snapshot_id is None:
+                snapshot_id = connection.execute(sqlalchemy.text('SELECT pg_export_snapshot()')).scalar()
+            else:
+                # Has to be the first statement of the transaction.
+                connection.execute(
+                    sqlalchemy.text('SET TRANSACTION SNAPSHOT :snapshot_id'),
+                    {'snapshot_id': snapshot_id},
+                )
+            connections.append(connection)
+        yield connections
+
+
 def execute_pg_query(engine, query, connection_to_use=None):
     if isinstance(query, sqlalchemy.sql.expression.Executable):
         executable = query
@@ -95,7 +151,15 @@ def ignore_type_warning(f):
 
 
 @ignore_type_warning
-def get_pg_catalog_table(table_name, engine, metadata):
+def get_pg_catalog_table(table_name, engine, metadata=None):
+    """
+    Returns an SA Table for the given pg_catalog table. Tables declared in db.pg_catalog are shared
+    and don't need reflecting, so metadata is only used for other tables, which are autoloaded.
+    """
+    if pg_catalog.is_pg_catalog_table_declared(table_name):
+        return pg_catalog.get_declared_pg_catalog_table(table_name, engine)
+    if metadata is None:
+        metadata = sqlalchemy.MetaData()
     table = sqlalchemy.Table(table_name, metadata, autoload_with=engine, schema='pg_catalog')
     # Refresh metadata if it hasn't reflected correctly. Refer https://github.com/centerofci/mathesar/issues/2138
     if len(table.c) < 1:
@@ -8,7 +8,7 @@ from demo.install.arxiv_skeleton import append_db_and_arxiv_schema_to_log
 from demo.install.base import ARXIV, create_demo_database
 from demo.install.custom_settings import customize_settings
 from demo.install.explorations import load_custom_explorations
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.models.base import Database
 from mathesar.state import reset_reflection
 
@@ -36,7 +36,7 @@ class LiveDemoModeMiddleware:
             )
             append_db_and_arxiv_schema_to_log(db_name, ARXIV)
             reset_reflection(db_name=db_name)
-            engine = create_mathesar_engine(db_name)
+            engine = get_mathesar_engine(db_name)
             customize_settings(engine)
             load_custom_explorations(engine)
 
@@ -15,13 +15,13 @@ class RecordAccessPolicy(AccessPolicy):
     """
     statements = [
         {
-            'action': ['list', 'retrieve'],
+            'action': ['list', 'retrieve', 'export'],
             'principal': 'authenticated',
             'effect': 'allow',
             'condition_expression': ['(is_superuser or is_table_viewer)']
         },
         {
-            'action': ['destroy', 'update', 'partial_update', 'create'],
+            'action': ['destroy', 'update', 'partial_update', 'create', 'bulk'],
             'principal': 'authenticated',
             'effect': 'allow',
             'condition_expression': ['(is_superuser or is_table_editor)']
@@ -1,5 +1,6 @@
 from django_filters import rest_framework as filters
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin
 from rest_framework.response import Response
 
@@ -11,7 +12,7 @@ from mathesar.api.exceptions.error_codes import ErrorCodes
 from mathesar.errors import InvalidTableError
 from mathesar.models.base import DataFile
 from mathesar.api.pagination import DefaultLimitOffsetPagination
-from mathesar.api.serializers.data_files import DataFileSerializer
+from mathesar.api.serializers.data_files import DataFileProgressSerializer, DataFileSerializer
 from mathesar.utils.datafiles import create_datafile
 
 
@@ -53,3 +54,9 @@ class DataFileViewSet(viewsets.GenericViewSet, ListModelMixin, RetrieveModelMixi
             raise mathesar.api.exceptions.data_import_exceptions.exceptions.InvalidTableAPIException(e, status_code=status.HTTP_400_BAD_REQUEST)
         serializer = DataFileSerializer(datafile, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(methods=['get'], detail=True)
+    def progress(self, request, pk=None):
+        data_file = self.get_object()
+        serializer = DataFileProgressSerializer(data_file, context={'request': request})
+        return Response(serializer.data)
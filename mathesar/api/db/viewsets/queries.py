@@ -4,6 +4,7 @@ from rest_access_policy import AccessViewSetMixin
 
 from rest_framework import viewsets
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
@@ -15,6 +16,8 @@ from mathesar.api.pagination import DefaultLimitOffsetPagination, TableLimitOffs
 from mathesar.api.serializers.queries import BaseQuerySerializer, QuerySerializer
 from mathesar.api.serializers.records import RecordListParameterSerializer
 from mathesar.models.query import UIQuery
+from mathesar.utils.json import FastJSONRenderer
+from mathesar.utils.query_budgets import QUERY_RECORDS, get_query_budget
 
 
 class QueryViewSet(
@@ -39,7 +42,7 @@ class QueryViewSet(
             queryset = queryset.filter(base_table__schema=schema_id)
         return queryset.order_by('-created_at')
 
-    @action(methods=['get'], detail=True)
+    @action(methods=['get'], detail=True, renderer_classes=[FastJSONRenderer, BrowsableAPIRenderer])
     def records(self, request, pk=None):
         paginator = TableLimitOffsetPagination()
         query = self.get_object()
@@ -54,6 +57,7 @@ class QueryViewSet(
             grouping=serializer.validated_data['grouping'],
             search=serializer.validated_data['search_fuzzy'],
             duplicate_only=serializer.validated_data['duplicate_only'],
+            query_budget=get_query_budget(QUERY_RECORDS),
         )
         return paginator.get_paginated_response(records)
 
@@ -63,7 +67,7 @@ class QueryViewSet(
         output_col_desc = query.output_columns_described
         return Response(output_col_desc)
 
-    @action(methods=['get'], detail=True)
+    @action(methods=['get'], detail=True, renderer_classes=[FastJSONRenderer, BrowsableAPIRenderer])
     def results(self, request, pk=None):
         paginator = TableLimitOffsetPagination()
         query = self.get_object()
@@ -78,6 +82,7 @@ class QueryViewSet(
             grouping=serializer.validated_data['grouping'],
             search=serializer.validated_data['search_fuzzy'],
             duplicate_only=serializer.validated_data['duplicate_only'],
+            query_budget=get_query_budget(QUERY_RECORDS),
         )
         paginated_records = paginator.get_paginated_response(records)
         columns = query.output_columns_simple
@@ -114,6 +119,7 @@ class QueryViewSet(
                 grouping=record_serializer.validated_data['grouping'],
                 search=record_serializer.validated_data['search_fuzzy'],
                 duplicate_only=record_serializer.validated_data['duplicate_only'],
+                query_budget=get_query_budget(QUERY_RECORDS),
             )
             paginated_records = paginator.get_paginated_response(records)
         except DeletedColumnAccess as e:
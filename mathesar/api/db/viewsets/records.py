@@ -1,6 +1,12 @@
+import itertools
+from urllib.parse import quote
+
+from bidict import bidict
+from django.http import StreamingHttpResponse
 from psycopg2.errors import ForeignKeyViolation, InvalidDatetimeFormat
 from rest_access_policy import AccessViewSetMixin
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
 from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
@@ -8,6 +14,7 @@ from sqlalchemy.exc import IntegrityError, DataError
 
 from mathesar.api.db.permissions.records import RecordAccessPolicy
 from mathesar.api.exceptions.error_codes import ErrorCodes
+from mathesar.api.exceptions.exception_mappers import record_operation_error_mapper
 import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
 import mathesar.api.exceptions.generic_exceptions.base_exceptions as generic_api_exceptions
 from db.functions.exceptions import (
@@ -15,14 +22,20 @@ from db.functions.exceptions import (
 )
 from db.records.exceptions import (
     BadGroupFormat, GroupFieldNotFound, InvalidGroupType, UndefinedFunction,
-    BadSortFormat, SortFieldNotFound
+    BadSortFormat, SortFieldNotFound, BadSeekFormat, BulkRecordOperationsError
 )
+from db.records.operations.bulk import DELETE
 from mathesar.api.pagination import TableLimitOffsetPagination
-from mathesar.api.serializers.records import RecordListParameterSerializer, RecordSerializer
+from mathesar.api.serializers.records import (
+    BulkRecordOperationsSerializer, RecordExportParameterSerializer, RecordListParameterSerializer,
+    RecordSerializer,
+)
 from mathesar.api.utils import get_table_or_404
 from mathesar.functions.operations.convert import rewrite_db_function_spec_column_ids_to_names
 from mathesar.models.base import Table
-from mathesar.utils.json import MathesarJSONRenderer
+from mathesar.utils.export import EXPORT_RENDERERS, get_export_chunks
+from mathesar.utils.json import MathesarFastJSONRenderer
+from mathesar.utils.query_budgets import TABLE_RECORDS, get_query_budget
 
 
 class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
@@ -34,7 +47,7 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
     def get_queryset(self):
         return Table.objects.all().order_by('-created_at')
 
-    renderer_classes = [MathesarJSONRenderer, BrowsableAPIRenderer]
+    renderer_classes = [MathesarFastJSONRenderer, BrowsableAPIRenderer]
 
     # For filter parameter formatting, see:
     # db/functions/operations/deserialize.py::get_db_function_from_ma_function_spec function doc>
@@ -52,7 +65,8 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
         grouping = serializer.validated_data['grouping']
         search_fuzzy = serializer.validated_data['search_fuzzy']
         filter_processed = None
-        column_names_to_ids = table.get_column_name_id_bidirectional_map()
+        context = self.get_serializer_context(table)
+        column_names_to_ids = context['columns_map']
         column_ids_to_names = column_names_to_ids.inverse
         if filter_unprocessed:
             filter_processed = rewrite_db_function_spec_column_ids_to_names(
@@ -75,7 +89,10 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
                 order_by=name_converted_order_by,
                 grouping=name_converted_group_by,
                 search=name_converted_search,
-                duplicate_only=serializer.validated_data['duplicate_only']
+                duplicate_only=serializer.validated_data['duplicate_only'],
+                count_strategy=serializer.validated_data['count'],
+                use_snapshot=serializer.validated_data['snapshot'],
+                query_budget=get_query_budget(TABLE_RECORDS),
             )
         except (BadDBFunctionFormat, UnknownDBFunctionID, ReferencedColumnsDontExist) as e:
             raise database_api_exceptions.BadFilterAPIException(
@@ -101,20 +118,93 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
                 details=e.args[0],
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+        except BadSeekFormat as e:
+            raise generic_api_exceptions.InvalidCursorAPIException(details=e.args[0])
         except DataError as e:
             if isinstance(e.orig, InvalidDatetimeFormat):
                 raise database_api_exceptions.InvalidDateFormatAPIException(
                     e,
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
+            elif paginator.cursor_mode:
+                # The cursor's sort key values don't fit the sorted columns.
+                raise generic_api_exceptions.InvalidCursorAPIException(details=str(e.orig))
 
         serializer = RecordSerializer(
             records,
             many=True,
-            context=self.get_serializer_context(table)
+            context=context
         )
         return paginator.get_paginated_response(serializer.data)
 
+    # Streams all records of the table matching the filter and search parameters, in the given
+    # order. The file format is picked with the `format` parameter (see EXPORT_RENDERERS).
+    @action(methods=['get'], detail=False, renderer_classes=EXPORT_RENDERERS)
+    def export(self, request, table_pk=None):
+        serializer = RecordExportParameterSerializer(data=request.GET)
+        serializer.is_valid(raise_exception=True)
+        table = get_table_or_404(table_pk)
+
+        filter_unprocessed = serializer.validated_data['filter']
+        order_by = serializer.validated_data['order_by']
+        search_fuzzy = serializer.validated_data['search_fuzzy']
+        filter_processed = None
+        column_ids_to_names = table.get_column_name_id_bidirectional_map().inverse
+        if filter_unprocessed:
+            filter_processed = rewrite_db_function_spec_column_ids_to_names(
+                column_ids_to_names=column_ids_to_names,
+                spec=filter_unprocessed,
+            )
+        name_converted_order_by = [{**column, 'field': column_ids_to_names[column['field']]} for column in order_by]
+        name_converted_search = [{**column, 'column': column_ids_to_names[column['field']]} for column in search_fuzzy]
+
+        renderer = request.accepted_renderer
+        try:
+            chunks = get_export_chunks(
+                table,
+                renderer.format,
+                filter=filter_processed,
+                order_by=name_converted_order_by,
+                search=name_converted_search,
+            )
+            # Runs the query before responding, so that errors in it are reported with a proper
+            # status code, rather than by cutting the streamed file short.
+            first_chunk = next(chunks, b'')
+        except (BadDBFunctionFormat, UnknownDBFunctionID, ReferencedColumnsDontExist) as e:
+            raise database_api_exceptions.BadFilterAPIException(
+                e,
+                field='filters',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except (BadSortFormat, SortFieldNotFound) as e:
+            raise database_api_exceptions.BadSortAPIException(
+                e,
+                field='order_by',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except UndefinedFunction as e:
+            raise database_api_exceptions.UndefinedFunctionAPIException(
+                e,
+                details=e.args[0],
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except ImportError as e:
+            raise generic_api_exceptions.ValueAPIException(
+                e,
+                message=f'Exporting as {renderer.format} is not supported by this installation.',
+                field='format',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            itertools.chain([first_chunk], chunks), content_type=content_type
+        )
+        filename = quote(f'{table.name}.{renderer.format}')
+        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{filename}"
+        return response
+
     def retrieve(self, request, pk=None, table_pk=None):
         table = get_table_or_404(table_pk)
         # TODO refactor to use serializer for more DRY response logic
@@ -125,12 +215,12 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
                 {"literal": [pk]}
             ]
         }
-        column_names_to_ids = table.get_column_name_id_bidirectional_map()
+        context = self.get_serializer_context(table)
         records = paginator.paginate_queryset(
             table,
             request,
             table,
-            column_names_to_ids,
+            context['columns_map'],
             filters=record_filters
         )
         if not records:
@@ -138,38 +228,25 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
         serializer = RecordSerializer(
             records,
             many=True,
-            context=self.get_serializer_context(table)
+            context=context
         )
         return paginator.get_paginated_response(serializer.data)
 
     def create(self, request, table_pk=None):
         table = get_table_or_404(table_pk)
-        serializer = RecordSerializer(data=request.data, context=self.get_serializer_context(table))
+        context = self.get_serializer_context(table)
+        serializer = RecordSerializer(data=request.data, context=context)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        # TODO refactor to use serializer for more DRY response logic
-        column_name_id_map = table.get_column_name_id_bidirectional_map()
-        table_pk_column_id = column_name_id_map[table.primary_key_column_name]
-        pk_value = serializer.data[table_pk_column_id]
+        record = serializer.save()
+        # The record was returned by the INSERT, so only its previews are read.
         paginator = TableLimitOffsetPagination()
-        record_filters = {
-            "equal": [
-                {"column_name": [table.primary_key_column_name]},
-                {"literal": [pk_value]}
-            ]
-        }
-        column_names_to_ids = table.get_column_name_id_bidirectional_map()
-        records = paginator.paginate_queryset(
-            table,
-            request,
-            table,
-            column_names_to_ids,
-            filters=record_filters
+        records = paginator.paginate_written_record(
+            request, table, record, context['columns_map']
         )
         serializer = RecordSerializer(
             records,
             many=True,
-            context=self.get_serializer_context(table)
+            context=context
         )
         response = paginator.get_paginated_response(serializer.data)
         response.status_code = status.HTTP_201_CREATED
@@ -177,34 +254,24 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
 
     def partial_update(self, request, pk=None, table_pk=None):
         table = get_table_or_404(table_pk)
+        context = self.get_serializer_context(table)
         serializer = RecordSerializer(
             {'id': pk},
             data=request.data,
-            context=self.get_serializer_context(table),
+            context=context,
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        # TODO refactor to use serializer for more DRY response logic
+        record = serializer.save()
+        # The record was returned by the UPDATE, so only its previews are read.
         paginator = TableLimitOffsetPagination()
-        record_filters = {
-            "equal": [
-                {"column_name": [table.primary_key_column_name]},
-                {"literal": [pk]}
-            ]
-        }
-        column_names_to_ids = table.get_column_name_id_bidirectional_map()
-        records = paginator.paginate_queryset(
-            table,
-            request,
-            table,
-            column_names_to_ids,
-            filters=record_filters
+        records = paginator.paginate_written_record(
+            request, table, record, context['columns_map']
         )
         serializer = RecordSerializer(
             records,
             many=True,
-            context=self.get_serializer_context(table)
+            context=context
         )
         return paginator.get_paginated_response(serializer.data)
 
@@ -228,7 +295,51 @@ class RecordViewSet(AccessViewSetMixin, viewsets.ViewSet):
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(methods=['post'], detail=False)
+    def bulk(self, request, table_pk=None):
+        """
+        Applies a list of record inserts, updates and deletes in one transaction, e.g.
+        {"operations": [{"type": "update", "id": 1, "record": {"<column id>": "value"}}]}.
+
+        Responds with a result per operation: the inserted or updated record, or the id of the
+        deleted one. If any operation is invalid or fails, none is applied, and the response lists
+        the errors of the failing operations, with their indices.
+        """
+        table = get_table_or_404(table_pk)
+        context = self.get_serializer_context(table)
+        serializer = BulkRecordOperationsSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data['operations']
+        try:
+            results = table.apply_record_operations(operations)
+        except BulkRecordOperationsError as e:
+            raise database_api_exceptions.BulkRecordOperationsAPIException({
+                index: record_operation_error_mapper(error, table).detail
+                for index, error in e.errors.items()
+            })
+        record_serializer = RecordSerializer(context=context)
+        return Response({
+            'results': [
+                {'type': DELETE, 'id': result}
+                if operation['type'] == DELETE
+                else {'type': operation['type'], 'record': record_serializer.to_representation(result)}
+                for operation, result in zip(operations, results)
+            ]
+        })
+
     def get_serializer_context(self, table):
-        columns_map = table.get_column_name_id_bidirectional_map()
-        context = {'columns_map': columns_map, 'table': table}
+        """
+        The context carries the table's column metadata, read once per request, for the
+        serializers to validate and represent records with.
+        """
+        column_descriptors = table.get_column_descriptors()
+        columns_map = bidict({
+            column_descriptor.name: column_id
+            for column_id, column_descriptor in column_descriptors.items()
+        })
+        context = {
+            'columns_map': columns_map,
+            'column_descriptors': column_descriptors,
+            'table': table,
+        }
         return context
@@ -19,6 +19,7 @@ from mathesar.api.exceptions.database_exceptions import (
     exceptions as database_api_exceptions,
 )
 from mathesar.api.pagination import DefaultLimitOffsetPagination
+from mathesar.api.serializers.data_files import DataFileProgressSerializer
 from mathesar.api.serializers.tables import (
     SplitTableRequestSerializer,
     SplitTableResponseSerializer,
@@ -46,6 +47,18 @@ class TableViewSet(AccessViewSetMixin, CreateModelMixin, RetrieveModelMixin, Lis
         # then prefetch column properties like `column name` using prefetch library.
         return self.access_policy.scope_viewset_queryset(self.request, Table.objects.prefetch_related('schema', 'schema__database', 'columns').prefetch('_sa_table', 'columns').order_by('-created_at'))
 
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.is_background_import():
+            # Large files are imported in the background; the response tells how to follow along.
+            data_file = serializer.start_background_import()
+            progress_serializer = DataFileProgressSerializer(data_file, context={'request': request})
+            return Response(progress_serializer.data, status=status.HTTP_202_ACCEPTED)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
     def partial_update(self, request, pk=None):
         table = self.get_object()
         serializer = TableSerializer(
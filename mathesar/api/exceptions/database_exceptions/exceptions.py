@@ -413,6 +413,24 @@ class InvalidDateFormatAPIException(MathesarAPIException):
         super().__init__(exception, self.error_code, message, field, details, status_code)
 
 
+class QueryBudgetExceededAPIException(MathesarAPIException):
+    """
+    Exception raised when a query runs into the statement_timeout of its endpoint's budget (see
+    settings.MATHESAR_QUERY_BUDGETS).
+    """
+    error_code = ErrorCodes.QueryBudgetExceeded.value
+
+    def __init__(
+            self,
+            exception,
+            message="The query took too long to run. Try narrowing it down with a filter, or removing its grouping or search.",
+            field=None,
+            details=None,
+            status_code=status.HTTP_400_BAD_REQUEST
+    ):
+        super().__init__(exception, self.error_code, message, field, details, status_code)
+
+
 class ColumnMappingsNotFound(MathesarAPIException):
     error_code = ErrorCodes.MappingsNotFound.value
 
@@ -425,3 +443,30 @@ class ColumnMappingsNotFound(MathesarAPIException):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
     ):
         super().__init__(exception, self.error_code, message, field, details, status_code)
+
+
+class BulkRecordOperationsAPIException(MathesarAPIException):
+    """
+    Exception raised when operations of a bulk record request are invalid, or fail to apply. None
+    of the request's operations is applied then.
+    """
+
+    def __init__(
+            self,
+            operation_errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+    ):
+        # operation_errors maps operation indices to lists of error bodies, which get the indices
+        # added to their details.
+        self.detail = [
+            {**error, 'details': {**self._get_details(error), 'operation_index': index}}
+            for index, errors in sorted(operation_errors.items())
+            for error in errors
+        ]
+        self.status_code = status_code
+
+    @staticmethod
+    def _get_details(error):
+        details = error.get('details')
+        # Validation errors stringify their (empty) details.
+        return details if isinstance(details, dict) else {}
@@ -27,6 +27,7 @@ class ErrorCodes(Enum):
     InvalidDefault = 4211
     NonClassifiedIntegrityError = 4201
     NotNullViolation = 4204
+    QueryBudgetExceeded = 4216
     RaiseException = 4202
     TypeMismatchViolation = 4214
     UndefinedFunction = 4207
@@ -61,3 +62,4 @@ class ErrorCodes(Enum):
     IncorrectOldPassword = 4419
     EditingPublicSchema = 4421
     DuplicateUIQueryInSchema = 4422
+    InvalidCursor = 4423
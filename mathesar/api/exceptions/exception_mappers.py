@@ -1,9 +1,20 @@
-from psycopg2.errors import CheckViolation, UniqueViolation
+from django.conf import settings
+from psycopg2.errors import (
+    CheckViolation, DatetimeFieldOverflow, ForeignKeyViolation, InvalidDatetimeFormat,
+    NotNullViolation, QueryCanceled, UniqueViolation,
+)
+from rest_framework import status
+from sqlalchemy.exc import DataError, IntegrityError
+
+from db.records.exceptions import RecordNotFound
 
 from mathesar.api.exceptions.database_exceptions import (
     exceptions as database_api_exceptions,
     base_exceptions as base_database_api_exceptions,
 )
+from mathesar.api.exceptions.error_codes import ErrorCodes
+from mathesar.api.exceptions.generic_exceptions import base_exceptions as generic_api_exceptions
+from mathesar.api.exceptions.generic_exceptions.base_exceptions import get_default_api_exception
 
 
 def integrity_error_mapper(exc):
@@ -14,3 +25,55 @@ def integrity_error_mapper(exc):
         return database_api_exceptions.UniqueViolationAPIException(exc)
     else:
         return base_database_api_exceptions.IntegrityAPIException(exc)
+
+
+def operational_error_mapper(exc):
+    if isinstance(getattr(exc, 'orig', None), QueryCanceled):
+        return database_api_exceptions.QueryBudgetExceededAPIException(exc)
+    # Other operational errors are handled like exceptions without a mapper.
+    if getattr(settings, 'MATHESAR_CAPTURE_UNHANDLED_EXCEPTION', False):
+        return get_default_api_exception(exc)
+    raise exc
+
+
+def record_operation_error_mapper(exc, table):
+    """
+    Maps an error of one of the operations of a bulk record request on the given table, the way
+    the single record endpoints report it.
+    """
+    orig_type = type(exc.orig) if hasattr(exc, 'orig') else None
+    if isinstance(exc, RecordNotFound):
+        return generic_api_exceptions.NotFoundAPIException(
+            exc,
+            error_code=ErrorCodes.RecordNotFound.value,
+            message="Record doesn't exist",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    elif isinstance(exc, IntegrityError) and orig_type == NotNullViolation:
+        return database_api_exceptions.NotNullViolationAPIException(
+            exc, status_code=status.HTTP_400_BAD_REQUEST, table=table
+        )
+    elif isinstance(exc, IntegrityError) and orig_type == UniqueViolation:
+        return database_api_exceptions.UniqueViolationAPIException(
+            exc,
+            message="The requested operation violates a uniqueness constraint",
+            table=table,
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    elif isinstance(exc, IntegrityError) and orig_type == CheckViolation:
+        return database_api_exceptions.CheckViolationAPIException(
+            exc, status_code=status.HTTP_400_BAD_REQUEST
+        )
+    elif isinstance(exc, IntegrityError) and orig_type == ForeignKeyViolation:
+        return database_api_exceptions.ForeignKeyViolationAPIException(
+            exc, status_code=status.HTTP_400_BAD_REQUEST, referent_table=table
+        )
+    elif isinstance(exc, DataError) and orig_type == DatetimeFieldOverflow:
+        return database_api_exceptions.InvalidDateAPIException(
+            exc, status_code=status.HTTP_400_BAD_REQUEST
+        )
+    elif isinstance(exc, DataError) and orig_type == InvalidDatetimeFormat:
+        return database_api_exceptions.InvalidDateFormatAPIException(
+            exc, status_code=status.HTTP_400_BAD_REQUEST
+        )
+    return generic_api_exceptions.MathesarAPIException(exc, status_code=status.HTTP_400_BAD_REQUEST)
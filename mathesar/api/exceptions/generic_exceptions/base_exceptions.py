@@ -116,3 +116,17 @@ class NetworkException(MathesarAPIException):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE
     ):
         super().__init__(exception, error_code, message, field, details, status_code)
+
+
+class InvalidCursorAPIException(MathesarAPIException):
+
+    def __init__(
+            self,
+            exception=None,
+            error_code=ErrorCodes.InvalidCursor.value,
+            message="Invalid pagination cursor.",
+            field='cursor',
+            details=None,
+            status_code=status.HTTP_400_BAD_REQUEST
+    ):
+        super().__init__(exception, error_code, message, field, details, status_code)
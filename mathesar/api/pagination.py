@@ -1,13 +1,35 @@
+import base64
+import binascii
+import json
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 
 from db.records.operations.group import GroupBy
+from db.records.operations.sort import get_sort_key_names
+from db.utils import connect_with_shared_snapshot
+import mathesar.api.exceptions.generic_exceptions.base_exceptions as generic_api_exceptions
 from mathesar.api.utils import get_table_or_404, process_annotated_records
 from mathesar.models.base import Column, Table
 from mathesar.models.query import UIQuery
 from mathesar.utils.preview import get_preview_info
+from mathesar.utils.query_budgets import connect_within_budget, set_budget
+from mathesar.utils.record_counts import COUNT_EXACT, COUNT_NONE, get_record_count
+
+# Records are fetched on these threads while their count is computed on the request's thread, so
+# a page takes a second pooled connection. Bounding the threads bounds the extra connections: the
+# engines' pools need RECORDS_FETCH_WORKERS connections on top of one per concurrent request. When
+# every thread is busy, records are fetched on the request's thread after counting instead.
+_records_fetch_executor = ThreadPoolExecutor(
+    max_workers=max(settings.MATHESAR_RECORDS_FETCH_WORKERS, 1), thread_name_prefix='records-fetch'
+)
+_records_fetch_slots = threading.BoundedSemaphore(settings.MATHESAR_RECORDS_FETCH_WORKERS or 1)
 
 
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
@@ -39,20 +61,54 @@ class ColumnLimitOffsetPagination(DefaultLimitOffsetPagination):
 
 
 class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
+    """
+    Besides limit/offset, table records can be paginated with a cursor (keyset pagination): pass
+    an empty `cursor` parameter to get the first page, then the `next_cursor` of each page to get
+    the next one. Unlike an offset, a cursor doesn't make Postgres scan the rows of the previous
+    pages, so deep pages are as cheap as the first one.
+    """
+    cursor_query_param = 'cursor'
+    cursor_mode = False
+    next_cursor = None
+    approximate = None
+
     def get_paginated_response(self, data):
         return Response(
             self.get_wrapped_with_metadata(data)
         )
 
     def get_wrapped_with_metadata(self, data):
-        return OrderedDict(
-            [
-                ('count', self.count),
-                ('grouping', self.grouping),
-                ('preview_data', self.preview_data),
-                ('results', data)
-            ]
-        )
+        metadata = [('count', self.count)]
+        # Only table records can be counted approximately.
+        if self.approximate is not None:
+            metadata.append(('approximate', self.approximate))
+        metadata += [
+            ('grouping', self.grouping),
+            ('preview_data', self.preview_data),
+        ]
+        if self.cursor_mode:
+            metadata.append(('next_cursor', self.next_cursor))
+        return OrderedDict(metadata + [('results', data)])
+
+    @staticmethod
+    def encode_cursor(sort_key):
+        cursor_json = json.dumps(sort_key, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Returns the sort key encoded in the cursor, or None for an empty cursor (the first page).
+        """
+        if not cursor:
+            return None
+        try:
+            sort_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise generic_api_exceptions.InvalidCursorAPIException()
+        if not isinstance(sort_key, list):
+            raise generic_api_exceptions.InvalidCursorAPIException()
+        return sort_key
 
     def paginate_queryset(
         self,
@@ -65,7 +121,22 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         grouping=None,
         search=None,
         duplicate_only=None,
+        count_strategy=COUNT_EXACT,
+        use_snapshot=False,
+        query_budget=None,
     ):
+        """
+        count_strategy is one of the strategies in mathesar.utils.record_counts; queries are always
+        counted exactly (unless the strategy is COUNT_NONE).
+
+        If use_snapshot is True, the count and the records are guaranteed to be consistent with
+        each other, i.e. to reflect the same state of the database.
+
+        query_budget limits the queries that count and fetch the records (see
+        mathesar.utils.query_budgets).
+        """
+        if query_budget is None:
+            query_budget = {}
         if order_by is None:
             order_by = []
         if grouping is None:
@@ -77,8 +148,19 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         if self.limit is None:
             self.limit = self.default_limit
         self.offset = self.get_offset(request)
-        # TODO: Cache count value somewhere, since calculating it is expensive.
-        self.count = table.sa_num_records(filter=filters, search=search)
+        # Only tables can be paginated with a cursor, since queries may define their own ordering.
+        self.cursor_mode = (
+            isinstance(table, Table) and self.cursor_query_param in request.query_params
+        )
+        seek_after = None
+        if self.cursor_mode:
+            if search:
+                raise generic_api_exceptions.InvalidCursorAPIException(
+                    message="Cursor pagination can't be combined with a fuzzy search, since the "
+                    "search orders records by relevance."
+                )
+            seek_after = self.decode_cursor(request.query_params[self.cursor_query_param])
+            self.offset = 0
         self.request = request
 
         preview_metadata = None
@@ -92,18 +174,144 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
             query = UIQuery(name="preview", base_table=table, initial_columns=columns_to_fetch)
         else:
             query = table
-        records = query.get_records(
+        # Built here, since building it queries Django models, which shouldn't happen on the
+        # thread that fetches the records.
+        db_query = query.db_query
+        records = self.count_and_get_records(
+            table,
+            db_query,
+            count_strategy,
+            use_snapshot,
+            query_budget,
+            filter=filters,
+            search=search,
             limit=self.limit,
             offset=self.offset,
-            filter=filters,
             order_by=order_by,
             group_by=group_by,
-            search=search,
-            duplicate_only=duplicate_only
+            duplicate_only=duplicate_only,
+            seek_after=seek_after,
         )
+        if self.cursor_mode:
+            self.next_cursor = self.get_next_cursor(records, db_query, order_by)
 
         return self.process_records(records, column_name_id_bidirectional_map, group_by, preview_metadata)
 
+    def paginate_written_record(self, request, table, record, column_name_id_bidirectional_map):
+        """
+        Returns a page of the record just inserted or updated, as returned by the write itself (a
+        dict of column names to values), without reading or counting it again. Only the previews of
+        the record's foreign keys are fetched, if the table has any.
+        """
+        self.request = request
+        self.count = 1
+        self.approximate = False
+        self.grouping = None
+        self.preview_data = None
+        preview_metadata, preview_columns = get_preview_info(table.id)
+        if not preview_metadata:
+            return [record]
+        pk_column_name = table.primary_key_column_name
+        referrer_column_names = [pk_column_name] + [
+            column_name_id_bidirectional_map.inverse[column_id]
+            for column_id in preview_metadata
+            if column_name_id_bidirectional_map.inverse[column_id] != pk_column_name
+        ]
+        referrer_columns = [
+            {'id': column_name_id_bidirectional_map[column_name], 'alias': column_name}
+            for column_name in referrer_column_names
+        ]
+        query = UIQuery(
+            name="preview", base_table=table, initial_columns=referrer_columns + preview_columns
+        )
+        preview_records = query.db_query.get_records(
+            filter={
+                "equal": [
+                    {"column_name": [pk_column_name]},
+                    {"literal": [record[pk_column_name]]}
+                ]
+            },
+        )
+        if preview_records:
+            _, _, self.preview_data = process_annotated_records(
+                preview_records, column_name_id_bidirectional_map, preview_metadata
+            )
+        return [record]
+
+    def count_and_get_records(
+        self, table, db_query, count_strategy, use_snapshot, query_budget, filter, search,
+        **records_kwargs
+    ):
+        """
+        Sets the count and returns the records. The two are independent queries, so the records are
+        fetched on a records fetch thread (and pooled connection) while counting if one is free,
+        which makes the page take as long as the slower of the two rather than their sum.
+        """
+        if count_strategy == COUNT_NONE:
+            self.count = None
+            if isinstance(table, Table):
+                self.approximate = False
+            return _get_records_within_budget(
+                db_query, query_budget, None, filter=filter, search=search, **records_kwargs
+            )
+        if not use_snapshot:
+            return self._count_and_get_records_concurrently(
+                table, db_query, count_strategy, query_budget, filter, search, records_kwargs
+            )
+        with connect_with_shared_snapshot(db_query.engine, 2) as connections:
+            for connection in connections:
+                set_budget(connection, query_budget)
+            count_connection, records_connection = connections
+            return self._count_and_get_records_concurrently(
+                table, db_query, count_strategy, query_budget, filter, search, records_kwargs,
+                count_connection=count_connection,
+                records_connection=records_connection,
+            )
+
+    def _count_and_get_records_concurrently(
+        self, table, db_query, count_strategy, query_budget, filter, search, records_kwargs,
+        count_connection=None, records_connection=None,
+    ):
+        get_records = partial(
+            _get_records_within_budget,
+            db_query,
+            query_budget,
+            records_connection,
+            filter=filter,
+            search=search,
+            **records_kwargs,
+        )
+        records_future = _submit_records_fetch(get_records)
+        # Counting may use Django models, so it stays on this thread.
+        if isinstance(table, Table):
+            self.count, self.approximate = get_record_count(
+                table,
+                filter=filter,
+                search=search,
+                strategy=count_strategy,
+                connection_to_use=count_connection,
+                query_budget=query_budget,
+            )
+        elif count_connection is not None:
+            self.count = table.sa_num_records(
+                filter=filter, search=search, connection_to_use=count_connection
+            )
+        else:
+            with connect_within_budget(db_query.engine, query_budget) as connection:
+                self.count = table.sa_num_records(
+                    filter=filter, search=search, connection_to_use=connection
+                )
+        if records_future is None:
+            return get_records()
+        return records_future.result()
+
+    def get_next_cursor(self, records, db_query, order_by):
+        if len(records) < self.limit:
+            return None
+        sort_key_names = get_sort_key_names(db_query.transformed_relation, order_by)
+        last_record = records[-1]._mapping
+        return self.encode_cursor([last_record[name] for name in sort_key_names])
+
     def process_records(self, records, column_name_id_bidirectional_map, group_by, preview_metadata):
         if records:
             processed_records, groups, preview_data = process_annotated_records(
@@ -146,3 +354,25 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         else:
             self.preview_data = None
         return processed_records
+
+
+def _submit_records_fetch(get_records):
+    """
+    Returns a future of get_records() run on a records fetch thread, or None if they're all busy.
+    """
+    if settings.MATHESAR_RECORDS_FETCH_WORKERS < 1 or not _records_fetch_slots.acquire(blocking=False):
+        return None
+    future = _records_fetch_executor.submit(get_records)
+    future.add_done_callback(lambda _: _records_fetch_slots.release())
+    return future
+
+
+def _get_records_within_budget(db_query, query_budget, connection_to_use, **kwargs):
+    """
+    Fetches the records on connection_to_use, which should already be within the budget, or on a
+    new connection within it.
+    """
+    if connection_to_use is not None:
+        return db_query.get_records(connection_to_use=connection_to_use, **kwargs)
+    with connect_within_budget(db_query.engine, query_budget) as connection:
+        return db_query.get_records(connection_to_use=connection, **kwargs)
@@ -1,5 +1,6 @@
 import requests
 
+from django.urls import reverse
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -70,3 +71,30 @@ class DataFileSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer)
         if content_type not in SUPPORTED_URL_CONTENT_TYPES:
             raise URLInvalidContentTypeError(content_type)
         return url
+
+
+class DataFileProgressSerializer(serializers.ModelSerializer):
+    """
+    The progress of importing a data file into a table.
+    """
+    status = serializers.CharField(source='import_status')
+    bytes_processed = serializers.IntegerField(source='import_bytes_processed')
+    bytes_total = serializers.SerializerMethodField()
+    rows_processed = serializers.IntegerField(source='import_rows_processed')
+    error = serializers.CharField(source='import_error')
+    progress_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DataFile
+        fields = [
+            'id', 'status', 'bytes_processed', 'bytes_total', 'rows_processed',
+            'table_imported_to', 'error', 'progress_url',
+        ]
+        read_only_fields = fields
+
+    def get_bytes_total(self, obj):
+        return obj.file.size
+
+    def get_progress_url(self, obj):
+        request = self.context['request']
+        return request.build_absolute_uri(reverse('data-file-progress', kwargs={'pk': obj.pk}))
@@ -48,7 +48,7 @@ class OneToOneSerializer(MathesarErrorMessageMixin, serializers.Serializer):
             validated_data.get('referent_table').oid,
             unique_link=self.is_link_unique()
         )
-        reset_reflection(db_name=reference_table.schema.database.name)
+        reset_reflection(db_name=reference_table.schema.database.name, incremental=True)
         return validated_data
 
 
@@ -97,7 +97,7 @@ class ManyToManySerializer(MathesarErrorMessageMixin, serializers.Serializer):
             validated_data.get('mapping_table_name'),
             referent_tables_oid,
         )
-        reset_reflection(db_name=referents[0]['referent_table'].schema.database.name)
+        reset_reflection(db_name=referents[0]['referent_table'].schema.database.name, incremental=True)
         return validated_data
 
 
@@ -1,25 +1,57 @@
 from psycopg2.errors import NotNullViolation, UniqueViolation, CheckViolation
 from rest_framework import serializers
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from sqlalchemy.exc import IntegrityError
 from db.records.exceptions import InvalidDate, InvalidDateFormat
+from db.records.operations.bulk import DELETE, INSERT, OPERATION_TYPES
 
 import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
+import mathesar.api.exceptions.generic_exceptions.base_exceptions as generic_api_exceptions
+from mathesar.api.exceptions.error_codes import ErrorCodes
+from mathesar.api.exceptions.generic_exceptions.base_exceptions import MathesarAPIException
 from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
-from mathesar.models.base import Column
+from mathesar.api.exceptions.validation_exceptions.exceptions import DictHasBadKeys, InvalidValueType
 from mathesar.api.utils import follows_json_number_spec
 from mathesar.database.types import UIType
+from mathesar.utils.record_counts import COUNT_EXACT, COUNT_STRATEGIES
 
 
-class RecordListParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+class RecordExportParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
     filter = serializers.JSONField(required=False, default=None)
     order_by = serializers.JSONField(required=False, default=[])
+    search_fuzzy = serializers.JSONField(required=False, default=[])
+
+
+class RecordListParameterSerializer(RecordExportParameterSerializer):
     grouping = serializers.JSONField(required=False, default={})
     duplicate_only = serializers.JSONField(required=False, default=None)
-    search_fuzzy = serializers.JSONField(required=False, default=[])
+    count = serializers.ChoiceField(choices=COUNT_STRATEGIES, required=False, default=COUNT_EXACT)
+    # Whether the count has to be consistent with the returned records.
+    snapshot = serializers.BooleanField(required=False, default=False)
+
+
+class RecordListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        """
+        All records of a page have the same columns, so their names are mapped to ids once,
+        rather than for each record by RecordSerializer.to_representation.
+        """
+        records = [
+            record._asdict() if not isinstance(record, dict) else record
+            for record in data
+        ]
+        if not records:
+            return []
+        columns_map = self.context['columns_map']
+        column_ids = [columns_map[column_name] for column_name in records[0]]
+        return [dict(zip(column_ids, record.values())) for record in records]
 
 
 class RecordSerializer(MathesarErrorMessageMixin, serializers.BaseSerializer):
+    class Meta:
+        list_serializer_class = RecordListSerializer
+
     def update(self, instance, validated_data):
         table = self.context['table']
         try:
@@ -55,6 +87,12 @@ class RecordSerializer(MathesarErrorMessageMixin, serializers.BaseSerializer):
                 )
             else:
                 raise database_api_exceptions.MathesarAPIException(e, status_code=status.HTTP_400_BAD_REQUEST)
+        if record is None:
+            raise generic_api_exceptions.NotFoundAPIException(
+                NotFound,
+                error_code=ErrorCodes.RecordNotFound.value,
+                message="Record doesn't exist"
+            )
         return record
 
     def create(self, validated_data):
@@ -92,13 +130,14 @@ class RecordSerializer(MathesarErrorMessageMixin, serializers.BaseSerializer):
 
     def to_internal_value(self, data):
         columns_map = self.context['columns_map'].inverse
+        column_descriptors = self.context['column_descriptors']
         data = {columns_map[int(column_id)]: value for column_id, value in data.items()}
         # If the data type of the column is number then the value must be an integer
         # or a string which follows JSON number spec.
         # TODO consider moving below routine to a DRF validate function
         for column_name, value in data.items():
-            column = Column.objects.get(id=columns_map.inverse[column_name])
-            is_number = column.ui_type == UIType.NUMBER
+            column_descriptor = column_descriptors[columns_map.inverse[column_name]]
+            is_number = column_descriptor.ui_type == UIType.NUMBER
             value_is_string = type(value) is str
             if is_number and value_is_string and not follows_json_number_spec(value):
                 raise database_api_exceptions.MathesarAPIException(
@@ -108,3 +147,63 @@ class RecordSerializer(MathesarErrorMessageMixin, serializers.BaseSerializer):
                     field=column_name
                 )
         return data
+
+
+class BulkRecordOperationSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    """
+    One of the operations of a bulk record request. Like the data of RecordSerializer, its record
+    is keyed by column ids.
+    """
+    type = serializers.ChoiceField(choices=OPERATION_TYPES)
+    id = serializers.JSONField(required=False)
+    record = serializers.DictField(required=False)
+
+    def validate(self, data):
+        if data['type'] != INSERT:
+            if 'id' not in data:
+                raise serializers.ValidationError({'id': [self.fields['id'].error_messages['required']]})
+            if type(data['id']) not in (str, int):
+                raise InvalidValueType('Record ids have to be strings or integers.', field='id')
+        if data['type'] == DELETE:
+            data.pop('record', None)
+            return data
+        if 'record' not in data:
+            if data['type'] != INSERT:
+                raise serializers.ValidationError(
+                    {'record': [self.fields['record'].error_messages['required']]}
+                )
+            # Every column gets its default.
+            data['record'] = {}
+        try:
+            data['record'] = RecordSerializer(context=self.context).to_internal_value(data['record'])
+        except (KeyError, ValueError):
+            raise DictHasBadKeys("Records have to be keyed by the ids of their table's columns.", field='record')
+        return data
+
+
+class BulkRecordOperationsSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    MAX_OPERATIONS = 10000
+
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_OPERATIONS
+    )
+
+    def validate_operations(self, operations):
+        """
+        Validates each operation, reporting the errors of all invalid operations at once.
+        """
+        validated_operations = []
+        operation_errors = {}
+        for index, operation in enumerate(operations):
+            operation_serializer = BulkRecordOperationSerializer(data=operation, context=self.context)
+            try:
+                if operation_serializer.is_valid():
+                    validated_operations.append(operation_serializer.validated_data)
+                else:
+                    operation_errors[index] = list(operation_serializer.errors)
+            except MathesarAPIException as e:
+                # Raised by RecordSerializer for invalid record values.
+                operation_errors[index] = e.detail
+        if operation_errors:
+            raise database_api_exceptions.BulkRecordOperationsAPIException(operation_errors)
+        return validated_operations
@@ -22,6 +22,7 @@ from mathesar.api.exceptions.generic_exceptions import base_exceptions as base_a
 from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
 from mathesar.api.serializers.columns import SimpleColumnSerializer
 from mathesar.api.serializers.table_settings import TableSettingsSerializer
+from mathesar.imports.background import is_background_import, start_background_import
 from mathesar.models.base import Column, Schema, Table, DataFile
 from mathesar.utils.tables import gen_table_name, create_table_from_datafile, create_empty_table
 
@@ -150,6 +151,35 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
             raise ProgrammingAPIException(e)
         return table
 
+    def is_background_import(self):
+        data_files = self.validated_data.get('data_files')
+        return bool(data_files) and is_background_import(data_files[0])
+
+    def start_background_import(self):
+        """
+        Starts importing the table's data file in the background, and returns the data file, which
+        reports the import's progress.
+        """
+        validated_data = self.validated_data
+        schema = validated_data['schema']
+        data_files = validated_data['data_files']
+        name = validated_data.get('name') or gen_table_name(schema, data_files)
+        try:
+            return start_background_import(
+                data_files[0],
+                name,
+                schema,
+                comment=validated_data.get('description'),
+                import_target=validated_data.get('import_target', None),
+            )
+        except DuplicateTable as e:
+            raise DuplicateTableAPIException(
+                e,
+                message=f"Relation {validated_data['name']} already exists in schema {schema.id}",
+                field="name",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
     def update(self, instance, validated_data):
         if self.partial:
             # Save the fields that are stored in the model.
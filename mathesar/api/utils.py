@@ -7,9 +7,6 @@ from mathesar.api.exceptions.error_codes import ErrorCodes
 from mathesar.models.base import Table
 from mathesar.utils.preview import column_alias_from_preview_template
 
-DATA_KEY = 'data'
-METADATA_KEY = 'metadata'
-
 
 def get_table_or_404(pk):
     """
@@ -32,25 +29,23 @@ def get_table_or_404(pk):
     return table
 
 
-def process_annotated_records(record_list, column_name_id_map=None, preview_metadata=None):
-
-    RESULT_IDX = 'result_indices'
+def _get_record_dicts(record_list):
+    """
+    Converts records to dicts, looking their keys up once rather than per record.
+    """
+    first_record = record_list[0]
+    if isinstance(first_record, dict):
+        return [dict(record) for record in record_list]
+    keys = first_record._fields
+    return [dict(zip(keys, record)) for record in record_list]
 
-    def _get_record_dict(record):
-        return record._asdict() if not isinstance(record, dict) else record
 
-    split_records = (
-        {DATA_KEY: record_dict}
-        for record_dict in (_get_record_dict(record) for record in record_list)
-    )
+def process_annotated_records(record_list, column_name_id_map=None, preview_metadata=None):
 
-    combined_records, groups = group.extract_group_metadata(
-        split_records, data_key=DATA_KEY, metadata_key=METADATA_KEY
-    )
+    RESULT_IDX = 'result_indices'
 
-    processed_records, record_metadata = zip(
-        *tuple(tuple(d.values()) for d in combined_records)
-    )
+    processed_records = _get_record_dicts(record_list)
+    record_metadata, groups = group.extract_group_metadata(processed_records)
 
     def _replace_column_names_with_ids(group_metadata_item):
         try:
@@ -106,7 +101,8 @@ def process_annotated_records(record_list, column_name_id_map=None, preview_meta
         }
 
         for i, meta in enumerate(record_metadata):
-            groups_by_id[meta[group.GroupMetadataField.GROUP_ID.value]][RESULT_IDX].append(i)
+            if meta is not None:
+                groups_by_id[meta[group.GroupMetadataField.GROUP_ID.value]][RESULT_IDX].append(i)
 
         output_groups = sorted(list(groups_by_id.values()), key=lambda x: x[RESULT_IDX][0])
     else:
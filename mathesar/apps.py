@@ -16,6 +16,13 @@ def _prepare_database_model(**kwargs):
         make_sure_initial_reflection_happened()
 
 
+def _clean_up_interrupted_imports(**kwargs):
+    from mathesar.imports.background import clean_up_interrupted_imports  # noqa
+    # TODO fix test DB loading to make this unnecessary
+    if not settings.TEST:
+        clean_up_interrupted_imports()
+
+
 class MathesarConfig(AppConfig):
     """Initialization manager."""
 
@@ -25,3 +32,5 @@ class MathesarConfig(AppConfig):
         """Perform initialization tasks."""
         import mathesar.signals  # noqa
         post_migrate.connect(_prepare_database_model)
+        # Migrations are run whenever Mathesar is (re)started (see install.py).
+        post_migrate.connect(_clean_up_interrupted_imports, sender=self)
@@ -1,3 +1,5 @@
+import threading
+
 from django.conf import settings
 
 from db import engine
@@ -5,8 +7,90 @@ from db import engine
 DEFAULT_DB = 'default'
 
 
-def create_mathesar_engine(db_name):
-    """Create an SQLAlchemy engine using stored credentials."""
+def get_mathesar_engine(db_name):
+    """
+    Get the process-wide SQLAlchemy engine for the given database, creating it if needed.
+
+    The engine (and its connection pool) is shared, so callers must not dispose it. Use
+    create_mathesar_engine for a dedicated engine, e.g. one that holds a connection indefinitely.
+    """
+    # Reading a dict is atomic, so we only lock when an engine has to be created.
+    mathesar_engine = _engines.get(db_name)
+    if mathesar_engine is None:
+        with _engines_lock:
+            mathesar_engine = _engines.get(db_name)
+            if mathesar_engine is None:
+                mathesar_engine = create_mathesar_engine(db_name, **_get_pool_options())
+                _engines[db_name] = mathesar_engine
+    return mathesar_engine
+
+
+def get_mathesar_replica_engines(db_name):
+    """
+    Get the process-wide SQLAlchemy engines for the read replicas of the given database (see
+    settings.MATHESAR_REPLICA_DATABASES), creating them if needed. The list is empty if the
+    database has no replicas.
+    """
+    replica_engines = _replica_engines.get(db_name)
+    if replica_engines is None:
+        with _engines_lock:
+            replica_engines = _replica_engines.get(db_name)
+            if replica_engines is None:
+                replica_engines = [
+                    engine.create_future_engine_with_custom_types(
+                        **_get_credentials_from_settings_entry(settings_entry),
+                        **_get_pool_options(),
+                    )
+                    for settings_entry in settings.MATHESAR_REPLICA_DATABASES.get(db_name, [])
+                ]
+                _replica_engines[db_name] = replica_engines
+    return replica_engines
+
+
+def dispose_mathesar_engines(db_name=None):
+    """
+    Dispose the shared engines of the given database (or of all databases), including those of
+    its replicas, and forget them, so that the next get_mathesar_engine call creates a fresh one.
+    """
+    with _engines_lock:
+        db_names = (set(_engines) | set(_replica_engines)) if db_name is None else [db_name]
+        for name in db_names:
+            mathesar_engine = _engines.pop(name, None)
+            if mathesar_engine is not None:
+                mathesar_engine.dispose()
+            for replica_engine in _replica_engines.pop(name, []):
+                replica_engine.dispose()
+
+
+def get_engine_pool_stats():
+    """
+    Returns connection pool metrics of each shared engine, keyed by database name. Replicas are
+    keyed by their database's name and their index, e.g. 'mathesar_tables_replica_0'.
+    """
+    pool_stats = {
+        db_name: _get_pool_stats(mathesar_engine)
+        for db_name, mathesar_engine in list(_engines.items())
+    }
+    for db_name, replica_engines in list(_replica_engines.items()):
+        for index, replica_engine in enumerate(replica_engines):
+            pool_stats[f'{db_name}_replica_{index}'] = _get_pool_stats(replica_engine)
+    return pool_stats
+
+
+def _get_pool_stats(mathesar_engine):
+    return {
+        'size': mathesar_engine.pool.size(),
+        'checked_in': mathesar_engine.pool.checkedin(),
+        'checked_out': mathesar_engine.pool.checkedout(),
+        'overflow': mathesar_engine.pool.overflow(),
+    }
+
+
+def create_mathesar_engine(db_name, **kwargs):
+    """
+    Create an SQLAlchemy engine using stored credentials. Prefer get_mathesar_engine; each engine
+    created here has its own connection pool.
+    """
     import logging
     logger = logging.getLogger('create_mathesar_engine')
     logger.debug('enter')
@@ -14,11 +98,14 @@ def create_mathesar_engine(db_name):
         credentials = _get_credentials_for_db_name_in_settings(db_name)
     except KeyError:
         credentials = _get_credentials_for_db_name_not_in_settings(db_name)
-    return engine.create_future_engine_with_custom_types(**credentials)
+    return engine.create_future_engine_with_custom_types(**credentials, **kwargs)
 
 
 def _get_credentials_for_db_name_in_settings(db_name):
-    settings_entry = settings.DATABASES[db_name]
+    return _get_credentials_from_settings_entry(settings.DATABASES[db_name])
+
+
+def _get_credentials_from_settings_entry(settings_entry):
     return dict(
         username=settings_entry["USER"],
         password=settings_entry["PASSWORD"],
@@ -37,3 +124,22 @@ def _get_credentials_for_db_name_not_in_settings(db_name):
         database=db_name,
         port=settings_entry["PORT"],
     )
+
+
+def _get_pool_options():
+    return dict(
+        pool_size=settings.MATHESAR_DB_POOL_SIZE,
+        max_overflow=settings.MATHESAR_DB_MAX_OVERFLOW,
+        # Connections are checked before use, so that the engine survives its database being
+        # restarted (or dropped and recreated).
+        pool_pre_ping=settings.MATHESAR_DB_POOL_PRE_PING,
+        pool_recycle=settings.MATHESAR_DB_POOL_RECYCLE,
+        connect_args={'connect_timeout': settings.MATHESAR_DB_CONNECT_TIMEOUT},
+    )
+
+
+# Maps database names to their shared engines.
+_engines = {}
+# Maps database names to the shared engines of their replicas.
+_replica_engines = {}
+_engines_lock = threading.Lock()
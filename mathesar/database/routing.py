@@ -0,0 +1,57 @@
+"""
+Routes reads to the read replicas of their database, if it has any (see
+settings.MATHESAR_REPLICA_DATABASES).
+
+Only reads that can tolerate replication lag are routed: listing, counting and grouping records,
+running queries and finding joinable tables, while handling GET (and other safe) requests.
+Everything else, including DDL, writes and the reads made while handling a write, uses the primary.
+"""
+import random
+
+from django.conf import settings
+from django.core.cache import caches
+from django_userforeignkey.request import get_current_request
+from rest_framework.permissions import SAFE_METHODS
+
+from mathesar.database.base import get_mathesar_engine, get_mathesar_replica_engines
+
+
+def get_read_engine(db_name):
+    """
+    Returns an engine for reads that can tolerate replication lag: one of the database's replicas
+    if it may be used, and the primary otherwise.
+    """
+    replica_engines = get_mathesar_replica_engines(db_name)
+    if not replica_engines or not _can_read_from_replica():
+        return get_mathesar_engine(db_name)
+    return random.choice(replica_engines)
+
+
+def note_write(user):
+    """
+    Makes the user's reads use the primary for the next settings.MATHESAR_REPLICA_LAG_GUARD
+    seconds, so that they see their own write. Call after the user writes.
+    """
+    if settings.MATHESAR_REPLICA_LAG_GUARD and user.is_authenticated:
+        _get_lag_guard_cache().set(
+            _get_lag_guard_cache_key(user), True, settings.MATHESAR_REPLICA_LAG_GUARD
+        )
+
+
+def _can_read_from_replica():
+    request = get_current_request()
+    # Reads made outside requests (e.g. while importing data) may have to see preceding writes.
+    if request is None or request.method not in SAFE_METHODS:
+        return False
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return not _get_lag_guard_cache().get(_get_lag_guard_cache_key(user))
+    return True
+
+
+def _get_lag_guard_cache():
+    return caches['replica_lag_guard']
+
+
+def _get_lag_guard_cache_key(user):
+    return f"replica_lag_guard_{user.id}"
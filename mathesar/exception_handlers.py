@@ -6,7 +6,7 @@ from django.db import IntegrityError as DjangoIntegrityError
 from django.utils.encoding import force_str
 from rest_framework.views import exception_handler
 from rest_framework_friendly_errors.settings import FRIENDLY_EXCEPTION_DICT
-from sqlalchemy.exc import IntegrityError, ProgrammingError
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 
 from db.types.exceptions import UnsupportedTypeException
 from mathesar.api.exceptions.database_exceptions import (
@@ -15,7 +15,7 @@ from mathesar.api.exceptions.database_exceptions import (
 )
 from mathesar.api.exceptions.data_import_exceptions import exceptions as data_import_api_exceptions
 from mathesar.api.exceptions.error_codes import ErrorCodes
-from mathesar.api.exceptions.exception_mappers import integrity_error_mapper
+from mathesar.api.exceptions.exception_mappers import integrity_error_mapper, operational_error_mapper
 from mathesar.api.exceptions.generic_exceptions.base_exceptions import get_default_api_exception
 from mathesar.errors import URLDownloadError, URLNotReachable, URLInvalidContentTypeError
 
@@ -24,6 +24,7 @@ exception_map = {
     DjangoIntegrityError: integrity_error_mapper,
     UnsupportedTypeException: lambda exc: database_api_exceptions.UnsupportedTypeAPIException(exc),
     ProgrammingError: lambda exc: base_api_exceptions.ProgrammingAPIException(exc),
+    OperationalError: operational_error_mapper,
     URLDownloadError: lambda exc: data_import_api_exceptions.URLDownloadErrorAPIException(exc),
     URLNotReachable: lambda exc: data_import_api_exceptions.URLNotReachableAPIException(exc),
     URLInvalidContentTypeError: lambda exc: data_import_api_exceptions.URLInvalidContentTypeAPIException(exc)
@@ -0,0 +1,125 @@
+"""
+Imports of large data files, which run on a thread of their own rather than while handling the
+request that creates their table. Their progress is recorded on the data file (see
+mathesar.imports.csv), and reported by the data file API.
+
+Enabled for files of at least the BACKGROUND_IMPORT_MIN_SIZE setting, which is off by default.
+
+Imports don't survive a restart of Mathesar: the ones it interrupts are marked as failed, and their
+staging tables dropped, when Mathesar's migrations are next run (see clean_up_interrupted_imports).
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection as dj_connection
+from django.utils import timezone
+from sqlalchemy import MetaData, Table as SATable
+from sqlalchemy.exc import OperationalError
+
+from db.tables.operations.staging import IMPORT_SCHEMA, drop_staging_table, get_staging_table_keys
+from mathesar.imports.csv import (
+    IMPORT_HEARTBEAT_INTERVAL, check_table_name_is_free, create_table_from_csv,
+)
+from mathesar.models.base import DataFile, Database, Schema, Table
+
+logger = logging.getLogger(__name__)
+
+# Imports whose data file hasn't been touched for this long are no longer running (see
+# mathesar.imports.csv._import_heartbeat).
+INTERRUPTED_IMPORT_AGE = timedelta(seconds=4 * IMPORT_HEARTBEAT_INTERVAL)
+INTERRUPTED_IMPORT_ERROR = 'The import was interrupted by a restart of Mathesar.'
+
+
+def is_background_import(data_file):
+    min_size = settings.MATHESAR_BACKGROUND_IMPORT_MIN_SIZE
+    return bool(min_size) and data_file.file.size >= min_size
+
+
+def start_background_import(data_file, name, schema, comment=None, import_target=None):
+    """
+    Starts creating a table from the data file on another thread, and returns the data file. Its
+    import_status tells when the table is created (as its table_imported_to) or if it failed.
+    """
+    # Checked here as well, so that a taken name is reported right away.
+    check_table_name_is_free(name, schema)
+    data_file.import_status = DataFile.import_status_choices.PENDING
+    data_file.import_bytes_processed = 0
+    data_file.import_rows_processed = 0
+    data_file.import_error = ''
+    data_file.save()
+    ImportWorker(
+        data_file.id,
+        name,
+        schema.id,
+        comment=comment,
+        import_target_id=import_target.id if import_target is not None else None,
+    ).start()
+    return data_file
+
+
+class ImportWorker(threading.Thread):
+    """
+    Creates a table from a data file. Takes ids rather than models, so that it doesn't share model
+    instances with the thread that started it.
+    """
+
+    def __init__(self, data_file_id, name, schema_id, comment=None, import_target_id=None):
+        super().__init__(name=f'import-worker-{data_file_id}', daemon=True)
+        self.data_file_id = data_file_id
+        self.table_name = name
+        self.schema_id = schema_id
+        self.comment = comment
+        self.import_target_id = import_target_id
+
+    def run(self):
+        try:
+            data_file = DataFile.objects.get(id=self.data_file_id)
+            schema = Schema.current_objects.select_related('database').get(id=self.schema_id)
+            table = create_table_from_csv(data_file, self.table_name, schema, comment=self.comment)
+            if self.import_target_id is not None:
+                table.import_target = Table.current_objects.get(id=self.import_target_id)
+                table.is_temp = True
+                table.save()
+        except Exception:
+            # The failure is recorded on the data file by create_table_from_csv.
+            logger.exception(f'Import of data file {self.data_file_id} failed')
+        finally:
+            # Django opens a connection per thread; this thread's won't be closed otherwise.
+            dj_connection.close()
+
+
+def clean_up_interrupted_imports():
+    """
+    Marks the imports that were interrupted (e.g. by a restart) as failed, and drops the staging
+    tables of imports that aren't running. Imports running in other processes are left alone.
+    """
+    unfinished_statuses = [
+        DataFile.import_status_choices.PENDING, DataFile.import_status_choices.RUNNING,
+    ]
+    DataFile.objects.filter(
+        import_status__in=unfinished_statuses,
+        updated_at__lt=timezone.now() - INTERRUPTED_IMPORT_AGE,
+    ).update(
+        import_status=DataFile.import_status_choices.FAILED,
+        import_error=INTERRUPTED_IMPORT_ERROR,
+    )
+    for database in Database.current_objects.filter(deleted=False):
+        engine = database._sa_engine
+        try:
+            # Listed before the running imports are, so that a staging table created in between
+            # belongs to one of them.
+            staging_table_keys = get_staging_table_keys(engine)
+            running_keys = {
+                str(data_file_id) for data_file_id in DataFile.objects.filter(
+                    import_status__in=unfinished_statuses
+                ).values_list('id', flat=True)
+            }
+            for staging_table_name, key in staging_table_keys.items():
+                # Staging tables without a key weren't created by imports.
+                if key is not None and key not in running_keys:
+                    staging_table = SATable(staging_table_name, MetaData(), schema=IMPORT_SCHEMA)
+                    drop_staging_table(staging_table, engine)
+        except OperationalError as e:
+            logger.warning(f'Could not drop the staging tables of {database.name}: {e}')
@@ -1,38 +1,108 @@
-from io import TextIOWrapper
+import codecs
+import threading
+from contextlib import contextmanager
+from functools import partial
+from io import SEEK_END, StringIO, TextIOWrapper
 
 import clevercsv as csv
+from django.conf import settings
+from django.db import connection as dj_connection
+from django.utils import timezone
+from sqlalchemy import inspect
 
-from db.tables.operations.alter import update_pk_sequence_to_latest
-from mathesar.database.base import create_mathesar_engine
-from mathesar.models.base import Table
-from db.records.operations.insert import insert_records_from_csv
-from db.tables.operations.create import create_string_column_table
+from mathesar.database.base import get_mathesar_engine
+from mathesar.models.base import DataFile, Table
+from db.records.operations.insert import insert_records_from_csv_chunks
+from db.tables.operations.create import DuplicateTable
 from db.tables.operations.select import get_oid_from_table
-from db.tables.operations.drop import drop_table
+from db.tables.operations.staging import (
+    create_staging_table, drop_staging_table, prepare_staging_connection, swap_in_staging_table,
+)
 from mathesar.errors import InvalidTableError
-from db.constants import ID, ID_ORIGINAL, COLUMN_NAME_TEMPLATE
-from psycopg2.errors import IntegrityError, DataError
+from db.constants import COLUMN_NAME_TEMPLATE
 
 from mathesar.state import reset_reflection
 
 ALLOWED_DELIMITERS = ",\t:|"
 SAMPLE_SIZE = 20000
 CHECK_ROWS = 10
+# How often (in seconds) the data file of a running import is touched, so that imports interrupted
+# by a restart can be told apart from running ones.
+IMPORT_HEARTBEAT_INTERVAL = 30
 
 
 def get_file_encoding(file):
     """
-    Given a file, uses charset_normalizer if installed or chardet which is installed as part of clevercsv module to
-    detect the file encoding. Returns a default value of utf-8-sig if encoding could not be detected or detection
-    libraries are missing.
+    Given a binary file, uses charset_normalizer to detect its encoding from a sample of it (see
+    sniff_file). Returns a default value of utf-8 if the encoding could not be detected.
     """
-    from charset_normalizer import detect
-    # Sample Size reduces the accuracy
-    encoding = detect(file.read()).get('encoding', None)
+    encoding, _ = _get_file_encoding_and_sample(file)
+    return encoding
+
+
+def sniff_file(file):
+    """
+    Detects the encoding and dialect of a binary file in a single pass over a sample of it, so that
+    neither the memory nor the time this takes depends on the size of the file.
+
+    The sample is the first SNIFF_SAMPLE_SIZE bytes of the file. If SNIFF_SPOT_CHECK is enabled, a
+    sample from the middle of the file is also checked to be in the encoding detected from the
+    first, and the encoding is detected from both if it isn't.
+
+    Returns:
+        tuple: the encoding, and the csv.Dialect object to parse the file
+
+    Raises:
+        InvalidTableError: If the generated dialect was unable to parse the sample
+    """
+    encoding, sample = _get_file_encoding_and_sample(file)
+    dialect = get_sv_dialect(StringIO(sample.decode(encoding, errors='replace')))
+    return encoding, dialect
+
+
+def _get_file_encoding_and_sample(file):
+    sample_size = settings.MATHESAR_SNIFF_SAMPLE_SIZE
+    file.seek(0, SEEK_END)
+    file_size = file.tell()
+    file.seek(0)
+    sample = _trim_to_last_line(file.read(sample_size), file_size > sample_size)
+    encoding = _detect_encoding(sample)
+    # A sample from the middle of a UTF-16 or UTF-32 file may not be aligned to its characters.
+    is_wide_encoding = codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32'))
+    if settings.MATHESAR_SNIFF_SPOT_CHECK and file_size > 2 * sample_size and not is_wide_encoding:
+        file.seek(file_size // 2)
+        # The line the sample starts in is skipped, since it's most likely cut.
+        file.readline()
+        middle_sample = _trim_to_last_line(file.read(sample_size), True)
+        try:
+            middle_sample.decode(encoding)
+        except UnicodeDecodeError:
+            encoding = _detect_encoding(sample + middle_sample)
     file.seek(0)
-    if encoding is not None:
-        return encoding
-    return "utf-8"
+    return encoding, sample
+
+
+def _detect_encoding(sample):
+    from charset_normalizer import detect
+    encoding = detect(sample).get('encoding', None)
+    # A sample can be ASCII even when the rest of the file isn't, and UTF-8 is a superset of it.
+    if encoding is None or codecs.lookup(encoding).name == 'ascii':
+        return "utf-8"
+    return encoding
+
+
+def _trim_to_last_line(sample, is_cut):
+    """
+    Trims a sample that was cut off from the rest of the file to its last line break, so that it
+    doesn't end in a partial character or record.
+    """
+    end = sample.rfind(b'\n') + 1
+    if not is_cut or end == 0:
+        return sample
+    # The line break may be the first byte of a UTF-16 or UTF-32 (little-endian) character.
+    while end < len(sample) and end % 4 != 0 and sample[end] == 0:
+        end += 1
+    return sample[:end]
 
 
 def check_dialect(file, dialect):
@@ -92,8 +162,9 @@ def get_sv_dialect(file):
         raise InvalidTableError
 
 
-def get_sv_reader(file, header, dialect=None):
-    encoding = get_file_encoding(file)
+def get_sv_reader(file, header, dialect=None, encoding=None):
+    if encoding is None:
+        encoding = get_file_encoding(file)
     file = TextIOWrapper(file, encoding=encoding)
     if dialect:
         reader = csv.DictReader(file, dialect=dialect)
@@ -109,34 +180,31 @@ def get_sv_reader(file, header, dialect=None):
 
 
 def create_db_table_from_data_file(data_file, name, schema, comment=None):
+    """
+    Copies the data file in parallel chunks into a staging table, which is then swapped in as the
+    new table (see db.tables.operations.staging), and records the progress on the data file.
+    """
     db_name = schema.database.name
-    engine = create_mathesar_engine(db_name)
+    engine = get_mathesar_engine(db_name)
     sv_filename = data_file.file.path
     header = data_file.header
     dialect = csv.dialect.SimpleDialect(data_file.delimiter, data_file.quotechar,
                                         data_file.escapechar)
-    encoding = get_file_encoding(data_file.file)
     with open(sv_filename, 'rb') as sv_file:
-        sv_reader = get_sv_reader(sv_file, header, dialect=dialect)
+        # Data files created before the encoding was stored on them don't have it.
+        encoding = data_file.encoding or get_file_encoding(sv_file)
+        sv_reader = get_sv_reader(sv_file, header, dialect=dialect, encoding=encoding)
         column_names = [column_name.strip() for column_name in sv_reader.fieldnames]
         column_names = [
             f"{COLUMN_NAME_TEMPLATE}{i}" if name == '' else name
             for i, name in enumerate(column_names)
         ]
-        column_names_alt = [
-            fieldname if fieldname != ID else ID_ORIGINAL
-            for fieldname in column_names
-        ]
-        table = create_string_column_table(
-            name=name,
-            schema=schema.name,
-            column_names=column_names,
-            engine=engine,
-            comment=comment,
-        )
+    # The table is created after the file is copied, so a taken name is checked for beforehand.
+    check_table_name_is_free(name, schema)
+    staging_table = create_staging_table(column_names, engine, key=data_file.id)
     try:
-        insert_records_from_csv(
-            table,
+        chunk_row_counts = insert_records_from_csv_chunks(
+            staging_table,
             engine,
             sv_filename,
             column_names,
@@ -144,47 +212,96 @@ def create_db_table_from_data_file(data_file, name, schema, comment=None):
             delimiter=dialect.delimiter,
             escape=dialect.escapechar,
             quote=dialect.quotechar,
-            encoding=encoding
-        )
-        update_pk_sequence_to_latest(engine, table)
-    except (IntegrityError, DataError):
-        drop_table(name=name, schema=schema.name, engine=engine)
-        table = create_string_column_table(
-            name=name,
-            schema=schema.name,
-            column_names=column_names_alt,
-            engine=engine,
-            comment=comment,
+            encoding=encoding,
+            chunk_size=settings.MATHESAR_IMPORT_CHUNK_SIZE,
+            max_workers=settings.MATHESAR_IMPORT_WORKERS,
+            prepare_connection=prepare_staging_connection,
+            on_progress=partial(_save_import_progress, data_file),
         )
-        insert_records_from_csv(
-            table,
+        table = swap_in_staging_table(
+            staging_table,
+            name,
+            schema.name,
+            column_names,
+            chunk_row_counts,
             engine,
-            sv_filename,
-            column_names_alt,
-            header,
-            delimiter=dialect.delimiter,
-            escape=dialect.escapechar,
-            quote=dialect.quotechar,
-            encoding=encoding
+            comment=comment,
         )
-    reset_reflection(db_name=db_name)
+    finally:
+        drop_staging_table(staging_table, engine)
+    reset_reflection(db_name=db_name, incremental=True)
     return table
 
 
-def create_table_from_csv(data_file, name, schema, comment=None):
-    engine = create_mathesar_engine(schema.database.name)
-    db_table = create_db_table_from_data_file(
-        data_file, name, schema, comment=comment
-    )
-    db_table_oid = get_oid_from_table(db_table.name, db_table.schema, engine)
-    # Using current_objects to create the table instead of objects. objects
-    # triggers re-reflection, which will cause a race condition to create the table
-    table = Table.current_objects.get(
-        oid=db_table_oid,
-        schema=schema,
+def check_table_name_is_free(name, schema):
+    """
+    Raises DuplicateTable if the schema has a table of the given name.
+    """
+    engine = get_mathesar_engine(schema.database.name)
+    if inspect(engine).has_table(name, schema=schema.name):
+        raise DuplicateTable
+
+
+def _save_import_progress(data_file, bytes_processed, rows_processed):
+    DataFile.objects.filter(id=data_file.id).update(
+        import_bytes_processed=bytes_processed,
+        import_rows_processed=rows_processed,
     )
-    table.import_verified = False
-    table.save()
+
+
+def _save_import_status(data_file, status, error=''):
+    data_file.import_status = status
+    data_file.import_error = error
+    data_file.save(update_fields=['import_status', 'import_error', 'updated_at'])
+
+
+@contextmanager
+def _import_heartbeat(data_file):
+    """
+    Touches the data file every IMPORT_HEARTBEAT_INTERVAL seconds, on another thread, while the
+    import runs.
+    """
+    stopped = threading.Event()
+
+    def _beat():
+        try:
+            while not stopped.wait(IMPORT_HEARTBEAT_INTERVAL):
+                DataFile.objects.filter(id=data_file.id).update(updated_at=timezone.now())
+        finally:
+            # Django opens a connection per thread; this thread's won't be closed otherwise.
+            dj_connection.close()
+
+    heartbeat = threading.Thread(target=_beat, name=f'import-heartbeat-{data_file.id}', daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+
+def create_table_from_csv(data_file, name, schema, comment=None):
+    _save_import_status(data_file, DataFile.import_status_choices.RUNNING)
+    try:
+        engine = get_mathesar_engine(schema.database.name)
+        with _import_heartbeat(data_file):
+            db_table = create_db_table_from_data_file(
+                data_file, name, schema, comment=comment
+            )
+        db_table_oid = get_oid_from_table(db_table.name, db_table.schema, engine)
+        # Using current_objects to create the table instead of objects. objects
+        # triggers re-reflection, which will cause a race condition to create the table
+        table = Table.current_objects.get(
+            oid=db_table_oid,
+            schema=schema,
+        )
+        table.import_verified = False
+        table.save()
+    except Exception as e:
+        _save_import_status(data_file, DataFile.import_status_choices.FAILED, error=str(e))
+        raise
+    data_file.refresh_from_db(fields=['import_bytes_processed', 'import_rows_processed'])
     data_file.table_imported_to = table
+    data_file.import_status = DataFile.import_status_choices.DONE
     data_file.save()
     return table
@@ -3,8 +3,11 @@ import warnings
 
 from django.http import HttpResponseRedirect
 from django.urls import reverse
+from rest_framework.permissions import SAFE_METHODS
 from sqlalchemy.exc import InterfaceError
 
+from mathesar.database.routing import note_write
+
 
 class CursorClosedHandlerMiddleware:
     def __init__(self, get_response):
@@ -33,3 +36,18 @@ class PasswordChangeNeededMiddleware:
             return HttpResponseRedirect(reverse('password_reset_confirm'))
         response = self.get_response(request)
         return response
+
+
+class ReplicaLagGuardMiddleware:
+    """
+    Makes users read from primaries right after they write, so that they see their own writes. See
+    mathesar.database.routing.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            note_write(request.user)
+        return response
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='import_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], max_length=128),
+        ),
+        migrations.AddField(
+            model_name='datafile',
+            name='import_bytes_processed',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datafile',
+            name='import_rows_processed',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datafile',
+            name='import_error',
+            field=models.TextField(blank=True),
+        ),
+    ]
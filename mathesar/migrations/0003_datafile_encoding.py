@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0002_datafile_import_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='encoding',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
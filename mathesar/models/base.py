@@ -1,3 +1,4 @@
+from collections import namedtuple
 from functools import reduce
 
 from bidict import bidict
@@ -25,9 +26,10 @@ from db.constraints.operations.select import (
 from db.constraints import utils as constraint_utils
 from db.dependents.dependents_utils import get_dependents_graph, has_dependents
 from db.metadata import get_empty_metadata
+from db.records.operations.bulk import apply_record_operations
 from db.records.operations.delete import delete_record
 from db.records.operations.insert import insert_record_or_records
-from db.records.operations.select import get_column_cast_records, get_count, get_record
+from db.records.operations.select import get_column_cast_records, get_count, get_count_estimate, get_record
 from db.records.operations.select import get_records
 from db.records.operations.update import update_record
 from db.schemas.operations.drop import drop_schema
@@ -49,7 +51,9 @@ from db.tables.utils import get_primary_key_column
 from mathesar.models.relation import Relation
 from mathesar.utils import models as model_utils
 from mathesar.utils.prefetch import PrefetchManager, Prefetcher
-from mathesar.database.base import create_mathesar_engine
+from mathesar.utils.record_counts import invalidate_record_counts
+from mathesar.database.base import get_mathesar_engine
+from mathesar.database.routing import get_read_engine
 from mathesar.database.types import UIType, get_ui_type_from_db_type
 from mathesar.state import make_sure_initial_reflection_happened, get_cached_metadata, reset_reflection
 from mathesar.state.cached_property import cached_property
@@ -58,6 +62,9 @@ from mathesar.api.exceptions.database_exceptions.base_exceptions import Programm
 
 NAME_CACHE_INTERVAL = 60 * 5
 
+# What validating a record's values needs to know about a column (see Table.get_column_descriptors).
+ColumnDescriptor = namedtuple('ColumnDescriptor', ['name', 'ui_type', 'db_type'])
+
 
 class BaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -106,11 +113,6 @@ class DatabaseObject(ReflectionManagerMixin, BaseModel):
         return f'<{self.__class__.__name__}: {self.oid}>'
 
 
-# TODO: Replace with a proper form of caching
-# See: https://github.com/centerofci/mathesar/issues/280
-_engine_cache = {}
-
-
 class Database(ReflectionManagerMixin, BaseModel):
     current_objects = models.Manager()
     # TODO does this need to be defined, given that ReflectionManagerMixin defines an identical attribute?
@@ -120,17 +122,14 @@ class Database(ReflectionManagerMixin, BaseModel):
 
     @property
     def _sa_engine(self):
-        global _engine_cache
-        # We're caching this since the engine is used frequently.
-        db_name = self.name
-        was_cached = db_name in _engine_cache
-        if was_cached:
-            engine = _engine_cache.get(db_name)
-            model_utils.ensure_cached_engine_ready(engine)
-        else:
-            engine = create_mathesar_engine(db_name=db_name)
-            _engine_cache[db_name] = engine
-        return engine
+        return get_mathesar_engine(self.name)
+
+    @property
+    def _sa_read_engine(self):
+        """
+        An engine for reads that can tolerate replication lag. See mathesar.database.routing.
+        """
+        return get_read_engine(self.name)
 
     @property
     def supported_ui_types(self):
@@ -157,6 +156,10 @@ class Schema(DatabaseObject):
     def _sa_engine(self):
         return self.database._sa_engine
 
+    @property
+    def _sa_read_engine(self):
+        return self.database._sa_read_engine
+
     @property
     def name(self):
         cache_key = f"{self.database.name}_schema_name_{self.oid}"
@@ -204,12 +207,12 @@ class Schema(DatabaseObject):
 
     def update_sa_schema(self, update_params):
         result = model_utils.update_sa_schema(self, update_params)
-        reset_reflection(db_name=self.database.name)
+        reset_reflection(db_name=self.database.name, incremental=True)
         return result
 
     def delete_sa_schema(self):
         result = drop_schema(self.name, self._sa_engine, cascade=True)
-        reset_reflection(db_name=self.database.name)
+        reset_reflection(db_name=self.database.name, incremental=True)
         return result
 
     def clear_name_cache(self):
@@ -372,6 +375,21 @@ class Table(DatabaseObject, Relation):
     def _sa_engine(self):
         return self.schema._sa_engine
 
+    @property
+    def _sa_read_engine(self):
+        return self.schema._sa_read_engine
+
+    @property
+    def _cache_partition(self):
+        # Partitions this instance's cached properties by database. See cached_property.
+        return self.schema.database.name
+
+    @property
+    def _cache_tag(self):
+        # Lets the cached properties of this table's objects be cleared when it changes. See
+        # cached_property.
+        return self.oid
+
     @property
     def name(self):
         return self._sa_table.name
@@ -419,7 +437,7 @@ class Table(DatabaseObject, Relation):
             self.oid,
             column_data,
         )
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, table_oids=[self.oid])
         return result
 
     def alter_column(self, column_attnum, column_data):
@@ -429,7 +447,7 @@ class Table(DatabaseObject, Relation):
             column_attnum,
             column_data,
         )
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, table_oids=[self.oid])
         return result
 
     def drop_column(self, column_attnum):
@@ -438,7 +456,7 @@ class Table(DatabaseObject, Relation):
             column_attnum,
             self.schema._sa_engine,
         )
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, incremental=True)
 
     def duplicate_column(self, column_attnum, copy_data, copy_constraints, name=None):
         result = duplicate_column(
@@ -449,7 +467,7 @@ class Table(DatabaseObject, Relation):
             copy_data=copy_data,
             copy_constraints=copy_constraints,
         )
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, table_oids=[self.oid])
         return result
 
     def get_preview(self, column_definitions):
@@ -466,24 +484,36 @@ class Table(DatabaseObject, Relation):
             fallback_to_default_ordering=True,
         )
 
-    def sa_num_records(self, filter=None, search=None):
+    def sa_num_records(self, filter=None, search=None, connection_to_use=None):
         if search is None:
             search = []
         return get_count(
             table=self._sa_table,
-            engine=self.schema._sa_engine,
+            engine=self.schema._sa_read_engine,
+            filter=filter,
+            search=search,
+            connection_to_use=connection_to_use,
+        )
+
+    def sa_count_estimate(self, filter=None, search=None, connection_to_use=None):
+        if search is None:
+            search = []
+        return get_count_estimate(
+            table=self._sa_table,
+            engine=self.schema._sa_read_engine,
             filter=filter,
             search=search,
+            connection_to_use=connection_to_use,
         )
 
     def update_sa_table(self, update_params):
         result = model_utils.update_sa_table(self, update_params)
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, incremental=True)
         return result
 
     def delete_sa_table(self):
         result = drop_table(self.name, self.schema.name, self.schema._sa_engine, cascade=True)
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, incremental=True)
         return result
 
     def get_record(self, id_value):
@@ -506,7 +536,7 @@ class Table(DatabaseObject, Relation):
             search = []
         return get_records(
             table=self._sa_table,
-            engine=self.schema._sa_engine,
+            engine=self.schema._sa_read_engine,
             limit=limit,
             offset=offset,
             filter=filter,
@@ -518,13 +548,24 @@ class Table(DatabaseObject, Relation):
         )
 
     def create_record_or_records(self, record_data):
-        return insert_record_or_records(self._sa_table, self.schema._sa_engine, record_data)
+        result = insert_record_or_records(self._sa_table, self.schema._sa_engine, record_data)
+        invalidate_record_counts(self)
+        return result
 
     def update_record(self, id_value, record_data):
-        return update_record(self._sa_table, self.schema._sa_engine, id_value, record_data)
+        result = update_record(self._sa_table, self.schema._sa_engine, id_value, record_data)
+        invalidate_record_counts(self)
+        return result
 
     def delete_record(self, id_value):
-        return delete_record(self._sa_table, self.schema._sa_engine, id_value)
+        result = delete_record(self._sa_table, self.schema._sa_engine, id_value)
+        invalidate_record_counts(self)
+        return result
+
+    def apply_record_operations(self, operations):
+        result = apply_record_operations(self._sa_table, self.schema._sa_engine, operations)
+        invalidate_record_counts(self)
+        return result
 
     def add_constraint(self, constraint_obj):
         create_constraint(
@@ -549,7 +590,7 @@ class Table(DatabaseObject, Relation):
             )
         constraint_oid = get_constraint_oid_by_name_and_table_oid(name, self.oid, engine)
         result = Constraint.current_objects.create(oid=constraint_oid, table=self)
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, table_oids=[self.oid])
         return result
 
     def get_column_name_id_bidirectional_map(self):
@@ -557,6 +598,20 @@ class Table(DatabaseObject, Relation):
         columns_map = bidict({column.name: column.id for column in columns})
         return columns_map
 
+    def get_column_descriptors(self):
+        """
+        Returns a dict of the ids of the table's columns to their ColumnDescriptor, from a single
+        query, rather than from a query per column as Column.objects.get(id=...).ui_type would.
+        """
+        columns = Column.objects.filter(table_id=self.id).select_related('table__schema__database').prefetch('name')
+        sa_columns = self.sa_columns
+        column_descriptors = {}
+        for column in columns:
+            db_type = sa_columns[column.name].db_type
+            ui_type = get_ui_type_from_db_type(db_type) if db_type else None
+            column_descriptors[column.id] = ColumnDescriptor(column.name, ui_type, db_type)
+        return column_descriptors
+
     def get_column_name_type_map(self):
         columns = Column.objects.filter(table_id=self.id)
         columns_map = [(column.name, column.db_type) for column in columns]
@@ -612,7 +667,7 @@ class Table(DatabaseObject, Relation):
         self.save()
         remainder_column_names = column_names_id_map.keys() - column_names_to_move
         self.update_column_reference(remainder_column_names, column_names_id_map)
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, incremental=True)
         return extracted_sa_table, remainder_sa_table
 
     def split_table(
@@ -648,7 +703,7 @@ class Table(DatabaseObject, Relation):
         extracted_table.update_column_reference(extracted_column_names, column_names_id_map)
         remainder_table = Table.current_objects.get(schema__database=self.schema.database, oid=remainder_table_oid)
         remainder_table.update_column_reference(remainder_column_names, column_names_id_map)
-        reset_reflection(db_name=self.schema.database.name)
+        reset_reflection(db_name=self.schema.database.name, incremental=True)
         remainder_fk_column = Column.objects.get(table=remainder_table, attnum=linking_fk_column_attnum)
 
         return extracted_table, remainder_table, remainder_fk_column
@@ -684,6 +739,7 @@ class Table(DatabaseObject, Relation):
         data_file = data_files[0]
         try:
             table, _ = insert_from_select(from_table, target_table, engine, col_mappings)
+            invalidate_record_counts(existing_table)
             data_file.table_imported_to = existing_table
         except Exception as e:
             # ToDo raise specific exceptions.
@@ -730,6 +786,14 @@ class Column(ReflectionManagerMixin, BaseModel):
     def _sa_engine(self):
         return self.table._sa_engine
 
+    @property
+    def _cache_partition(self):
+        return self.table._cache_partition
+
+    @property
+    def _cache_tag(self):
+        return self.table._cache_tag
+
     # TODO probably shouldn't be private: a lot of code already references it.
     @property
     def _sa_column(self):
@@ -799,6 +863,14 @@ class Constraint(DatabaseObject):
             models.UniqueConstraint(fields=["oid", "table"], name="unique_constraint")
         ]
 
+    @property
+    def _cache_partition(self):
+        return self.table._cache_partition
+
+    @property
+    def _cache_tag(self):
+        return self.table._cache_tag
+
     # TODO try to cache this for an entire request
     @property
     def _constraint_record(self):
@@ -857,7 +929,7 @@ class Constraint(DatabaseObject):
             self.name
         )
         self.delete()
-        reset_reflection(db_name=self.table.schema.database.name)
+        reset_reflection(db_name=self.table.schema.database.name, incremental=True)
 
 
 class DataFile(BaseModel):
@@ -874,6 +946,15 @@ class DataFile(BaseModel):
     delimiter = models.CharField(max_length=1, default=',', blank=True)
     escapechar = models.CharField(max_length=1, blank=True)
     quotechar = models.CharField(max_length=1, default='"', blank=True)
+    # Detected when the file is uploaded (see mathesar.imports.csv.sniff_file).
+    encoding = models.CharField(max_length=64, blank=True)
+
+    # The progress of importing the file into a table (see mathesar.imports.csv).
+    import_status_choices = models.TextChoices("import_status", "PENDING RUNNING DONE FAILED")
+    import_status = models.CharField(max_length=128, choices=import_status_choices.choices, blank=True)
+    import_bytes_processed = models.BigIntegerField(default=0)
+    import_rows_processed = models.BigIntegerField(default=0)
+    import_error = models.TextField(blank=True)
 
 
 class PreviewColumnSettings(BaseModel):
@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.db import models
 from frozendict import frozendict
 
@@ -14,7 +16,7 @@ from mathesar.models.validators import DictValidator, InitialColumnsValidator, L
 from mathesar.state.cached_property import cached_property
 from mathesar.models.base import BaseModel, Column
 from mathesar.models.relation import Relation
-from mathesar.state import get_cached_metadata
+from mathesar.state import get_cached_metadata, get_reflected_table_fingerprints
 
 
 class UIQuery(BaseModel, Relation):
@@ -209,10 +211,11 @@ class UIQuery(BaseModel, Relation):
         return DBQuery(
             base_table_oid=self.base_table.oid,
             initial_columns=self._db_initial_columns,
-            engine=self._sa_engine,
+            engine=self._sa_read_engine,
             transformations=self._db_transformations,
             name=self.name,
-            metadata=get_cached_metadata()
+            metadata=get_cached_metadata(),
+            get_table_fingerprints=partial(get_reflected_table_fingerprints, self._database.name),
         )
 
     # TODO reused; consider using cached_property
@@ -265,6 +268,14 @@ class UIQuery(BaseModel, Relation):
     def _sa_engine(self):
         return self.base_table._sa_engine
 
+    @property
+    def _sa_read_engine(self):
+        return self.base_table._sa_read_engine
+
+    @property
+    def _cache_partition(self):
+        return self.base_table._cache_partition
+
     @property
     def _database(self):
         return self.base_table.schema.database
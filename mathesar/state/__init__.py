@@ -1,2 +1,3 @@
 from mathesar.state.base import make_sure_initial_reflection_happened, reset_reflection  # noqa: F401
 from mathesar.state.metadata import get_cached_metadata  # noqa: F401
+from mathesar.state.django import get_reflected_table_fingerprints  # noqa: F401
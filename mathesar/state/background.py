@@ -0,0 +1,122 @@
+"""
+An optional background reflection service. It keeps our reflection up-to-date with DDL changes
+made by anyone (not only by Mathesar) by listening for notifications emitted by event triggers on
+each user database. See db/ddl_events.py.
+
+Enabled by the BACKGROUND_REFLECTION setting. Workers are only started by the web server's entry
+points (see config/wsgi.py), rather than by every process that loads Mathesar (e.g. management
+commands). Each web server process needs its own, since each keeps its own reflection caches.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection as dj_connection
+from psycopg2.errors import InsufficientPrivilege
+from sqlalchemy.exc import DBAPIError
+
+from db.ddl_events import install_ddl_event_triggers, listen_for_ddl_events, merge_ddl_events
+from mathesar.database.base import create_mathesar_engine
+from mathesar.state.base import reset_reflection
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before restarting a worker that lost its database, doubling with each consecutive
+# failure, up to the maximum.
+MIN_RETRY_DELAY = 1
+MAX_RETRY_DELAY = 60
+
+
+class ReflectionWorker(threading.Thread):
+    """
+    Listens for DDL events on a single database and re-reflects the affected objects.
+    """
+
+    def __init__(self, db_name):
+        super().__init__(name=f'reflection-worker-{db_name}', daemon=True)
+        self.db_name = db_name
+        self._stop_event = threading.Event()
+
+    def run(self):
+        engine = create_mathesar_engine(self.db_name)
+        retry_delay = MIN_RETRY_DELAY
+        try:
+            while not self._stop_event.is_set():
+                started_at = time.monotonic()
+                try:
+                    self._install_reflect_and_listen(engine)
+                except DBAPIError as e:
+                    if isinstance(e.orig, InsufficientPrivilege):
+                        # Retrying won't help if we can't create event triggers.
+                        logger.warning(f'Background reflection disabled for {self.db_name}: {e}')
+                        return
+                    if time.monotonic() - started_at > MAX_RETRY_DELAY:
+                        # The worker was up for a while, so this isn't a consecutive failure.
+                        retry_delay = MIN_RETRY_DELAY
+                    # E.g. the database is unreachable, or restarted while we were listening.
+                    logger.warning(
+                        f'Background reflection for {self.db_name} failed, retrying in'
+                        f' {retry_delay}s: {e}'
+                    )
+                    self._stop_event.wait(retry_delay)
+                    retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+        except Exception:
+            logger.exception(f'Background reflection worker for {self.db_name} crashed')
+        finally:
+            engine.dispose()
+            # Django opens a connection per thread; this thread's won't be closed otherwise.
+            dj_connection.close()
+
+    def _install_reflect_and_listen(self, engine):
+        """
+        Returns once the worker is stopped. Reflects on (re)starting, since we may have missed DDL
+        events while we weren't listening.
+        """
+        install_ddl_event_triggers(engine)
+        reset_reflection(db_name=self.db_name, incremental=True)
+        listen_for_ddl_events(engine, self.handle_ddl_events, self._stop_event.is_set)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def handle_ddl_events(self, events):
+        table_oids, full = merge_ddl_events(events)
+        logger.debug(f'DDL events on {self.db_name}: table_oids={table_oids}, full={full}')
+        try:
+            if full:
+                reset_reflection(db_name=self.db_name, incremental=True)
+            elif table_oids:
+                reset_reflection(db_name=self.db_name, table_oids=list(table_oids))
+        except Exception:
+            # A failed reflection must not kill the worker; the next event will retry.
+            logger.exception(f'Background reflection failed for {self.db_name}')
+
+
+def start_reflection_workers():
+    """
+    Starts a ReflectionWorker for each user database in settings, if background reflection is
+    enabled. Idempotent.
+    """
+    if not settings.MATHESAR_BACKGROUND_REFLECTION or settings.TEST:
+        return
+    dbs_in_settings = set(settings.DATABASES)
+    dbs_in_settings.discard('default')
+    for db_name in dbs_in_settings:
+        worker = _workers.get(db_name)
+        if worker is None or not worker.is_alive():
+            worker = ReflectionWorker(db_name)
+            _workers[db_name] = worker
+            worker.start()
+
+
+def stop_reflection_workers():
+    for worker in _workers.values():
+        worker.stop()
+    for worker in _workers.values():
+        worker.join()
+    _workers.clear()
+
+
+# Maps database names to their ReflectionWorker.
+_workers = {}
@@ -1,4 +1,9 @@
-from mathesar.state.django import reflect_db_objects, clear_dj_cache
+import threading
+
+from mathesar.state.django import (
+    reflect_db_objects, reflect_db_objects_by_oids, clear_dj_cache, clear_catalog_snapshots,
+    clear_database_statuses, clear_reflection_of_database,
+)
 from mathesar.state.metadata import reset_cached_metadata, get_cached_metadata
 from mathesar.state.cached_property import clear_cached_property_cache
 
@@ -8,7 +13,7 @@ def make_sure_initial_reflection_happened():
         reset_reflection()
 
 
-def reset_reflection(db_name=None):
+def reset_reflection(db_name=None, incremental=False, table_oids=None, schema_oids=None):
     """
     Resets our reflection of what's on Postgres databases. Reset meaning that information is
     either deleted (to be refreshed on demand) or is preemptively refreshed.
@@ -16,19 +21,53 @@ def reset_reflection(db_name=None):
     We have following forms of state (aka reflection), and all are reset by this routine:
         - Django cache (django.core.cache),
         - Django models (mathesar.models namespace),
+        - cached properties (mathesar.state.cached_property),
         - SQLAlchemy MetaData.
 
-    Note, this causes immediate calls to Postgres.
+    If db_name is given, only the state of that database is reset; that of other databases is left
+    as is (unless the database was never reflected, which resets everything). Of the Django cache,
+    only its schema names are reset then.
+
+    If incremental is True, only the state derived from schemas and tables whose catalog entries
+    changed since the last reflection is reset; the rest is left as is. This is what should be
+    used after a mutation, since a full reset scales with the size of the database.
+
+    If table_oids or schema_oids are given (together with db_name), only the state derived from
+    those tables and schemas is reset. That's cheaper still, but it's up to the caller to know
+    which objects a mutation affected.
+
+    Note, this causes immediate calls to Postgres. Resets are serialized, since they may be
+    triggered concurrently by request threads and by the background reflection service.
     """
-    clear_dj_cache()
-    clear_cached_property_cache()
-    set_initial_reflection_happened()
-    reset_cached_metadata()
-    _trigger_django_model_reflection(db_name)
+    with _reflection_lock:
+        is_scoped = table_oids is not None or schema_oids is not None
+        if is_scoped and db_name is None:
+            raise ValueError("A scoped reflection reset requires db_name.")
+        if is_scoped and _has_initial_reflection_happened():
+            reflect_db_objects_by_oids(
+                metadata=get_cached_metadata(),
+                db_name=db_name,
+                table_oids=table_oids,
+                schema_oids=schema_oids,
+            )
+            return
+        if incremental and _has_initial_reflection_happened():
+            _trigger_django_model_reflection(db_name, incremental=True)
+            return
+        if db_name is not None and clear_reflection_of_database(db_name, get_cached_metadata()):
+            clear_cached_property_cache(db_name)
+        else:
+            clear_dj_cache()
+            clear_cached_property_cache()
+            clear_catalog_snapshots()
+            clear_database_statuses()
+            reset_cached_metadata()
+        set_initial_reflection_happened()
+        _trigger_django_model_reflection(db_name)
 
 
-def _trigger_django_model_reflection(db_name):
-    reflect_db_objects(metadata=get_cached_metadata(), db_name=db_name)
+def _trigger_django_model_reflection(db_name, incremental=False):
+    reflect_db_objects(metadata=get_cached_metadata(), db_name=db_name, incremental=incremental)
 
 
 def set_initial_reflection_happened(has_it_happened=True):
@@ -50,3 +89,5 @@ def _has_initial_reflection_happened():
 
 
 _initial_reflection_happened = False
+# Reentrant, since a reset can trigger queryset evaluation that checks for the initial reflection.
+_reflection_lock = threading.RLock()
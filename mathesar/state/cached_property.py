@@ -1,5 +1,9 @@
+import threading
 import uuid
 import logging
+from collections import OrderedDict
+
+from django.conf import settings
 
 # A globally unique object that's used to signal a cache-miss.
 NO_VALUE = object()
@@ -12,6 +16,12 @@ def cached_property(fn):
     Caches property values, similarly to django.utils.functional.cached_property, but in a central
     cache, which means we can clear all property caches via a central method call, which is
     necessary for managing our state.
+
+    The central cache is bounded (least recently used values are evicted past
+    settings.MATHESAR_CACHED_PROPERTY_CACHE_SIZE entries) and partitioned by the instance's
+    `_cache_partition` attribute (typically its database's name), if it has one. Within a
+    partition, values are tagged with the instance's `_cache_tag` attribute (typically the oid of
+    the table it's derived from), if it has one, so that they can be cleared one tag at a time.
     """
     return _cached_property(fn)
 
@@ -25,13 +35,26 @@ def key_cached_property(key_fn):
     return lambda fn: _cached_property(fn, key_fn=key_fn)
 
 
-def clear_cached_property_cache():
+def clear_cached_property_cache(partition=None, tags=None):
+    """
+    Clear caches of all cached properties, or only those of the given partition (i.e. of the given
+    database's objects), or only those of the given partition's objects with one of the given tags
+    (e.g. of the given tables).
+    """
+    logger.debug(f"clear_cached_property_cache partition={partition} tags={tags}")
+    if partition is None:
+        _central_cache.clear()
+    elif tags is None:
+        _central_cache.clear_partition(partition)
+    else:
+        _central_cache.clear_tags(partition, tags)
+
+
+def get_cached_property_cache_stats():
     """
-    Clear caches of all cached properties.
+    Returns a dict with the central cache's size and its hit, miss and eviction counts.
     """
-    logger.debug("clear_cached_property_cache")
-    global _central_ache
-    _central_cache = {}  # noqa: F841
+    return _central_cache.get_stats()
 
 
 class _cached_property:
@@ -53,31 +76,33 @@ class _cached_property:
             )
 
     def __get__(self, instance, _):
+        if instance is None:
+            return self
         key = self._get_ip_key(instance=instance)
-        cached_value = _get_from_central_cache(key=key)
+        cached_value = _central_cache.get(key)
         if cached_value is not NO_VALUE:
             return cached_value
         else:
             assert self.original_get_fn is not None
             new_value = self.original_get_fn(instance)
-            _set_on_central_cache(key=key, value=new_value)
+            _central_cache.set(key, new_value, tag=_get_tag(instance))
             return new_value
 
     def __set__(self, instance, value):
         key = self._get_ip_key(instance)
-        _set_on_central_cache(key=key, value=value)
+        _central_cache.set(key, value, tag=_get_tag(instance))
 
     def __delete__(self, instance):
         key = self._get_ip_key(instance)
-        _delete_from_central_cache(key)
+        _central_cache.delete(key)
 
     def _get_ip_key(self, instance):
         """
         Gets an instance-and-property-specific key (abbreviated instance-property key or ip key)
-        for indexing in the central cache.
+        for indexing in the central cache. It's a (partition, key) tuple.
         """
         if self._should_derive_ip_keys_from_key_fn():
-            ip_key = self._get_key_fn_derived_ip_key(instance)
+            ip_key = (_get_partition(instance), self._get_key_fn_derived_ip_key(instance))
         else:
             ip_key = self._get_random_ip_key(instance)
         return ip_key
@@ -112,7 +137,8 @@ class _cached_property:
         if ip_key is not NO_VALUE:
             return ip_key
         else:
-            ip_key = uuid.uuid4()
+            # The partition is looked up once per instance, since that might take a query.
+            ip_key = (_get_partition(instance), uuid.uuid4())
             self._set_ip_key_on_instance_cache(instance, ip_key)
             return ip_key
 
@@ -146,19 +172,115 @@ class _cached_property:
         return f'_property_key__{self.attribute_name}'
 
 
-def _get_from_central_cache(key):
-    global _central_cache
-    return _central_cache.get(key, NO_VALUE)
+def _get_partition(instance):
+    return getattr(instance, '_cache_partition', None)
+
+
+def _get_tag(instance):
+    return getattr(instance, '_cache_tag', None)
+
+
+class _CentralCache:
+    """
+    A thread-safe LRU cache of (partition, key) tuples to values, whose entries can be cleared one
+    partition, or one tag within a partition, at a time.
+    """
+
+    def __init__(self, max_size=None):
+        # If max_size is None, settings.MATHESAR_CACHED_PROPERTY_CACHE_SIZE is used.
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._keys_by_partition = {}
+        # Maps (partition, tag) tuples to the keys of the entries tagged with them, and those keys
+        # to their tags.
+        self._keys_by_tag = {}
+        self._tags_by_key = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, ip_key):
+        with self._lock:
+            value = self._entries.get(ip_key, NO_VALUE)
+            if value is NO_VALUE:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(ip_key)
+            return value
+
+    def set(self, ip_key, value, tag=None):
+        with self._lock:
+            if ip_key in self._entries:
+                self._discard_from_partition(ip_key)
+            self._entries[ip_key] = value
+            self._entries.move_to_end(ip_key)
+            partition, _ = ip_key
+            self._keys_by_partition.setdefault(partition, set()).add(ip_key)
+            if tag is not None:
+                self._keys_by_tag.setdefault((partition, tag), set()).add(ip_key)
+                self._tags_by_key[ip_key] = tag
+            max_size = self._get_max_size()
+            while len(self._entries) > max_size:
+                evicted_ip_key, _ = self._entries.popitem(last=False)
+                self._discard_from_partition(evicted_ip_key)
+                self._evictions += 1
+
+    def delete(self, ip_key):
+        with self._lock:
+            if self._entries.pop(ip_key, NO_VALUE) is not NO_VALUE:
+                self._discard_from_partition(ip_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_partition.clear()
+            self._keys_by_tag.clear()
+            self._tags_by_key.clear()
+
+    def clear_partition(self, partition):
+        with self._lock:
+            for ip_key in list(self._keys_by_partition.get(partition, ())):
+                self._entries.pop(ip_key, None)
+                self._discard_from_partition(ip_key)
+
+    def clear_tags(self, partition, tags):
+        with self._lock:
+            for tag in tags:
+                for ip_key in list(self._keys_by_tag.get((partition, tag), ())):
+                    self._entries.pop(ip_key, None)
+                    self._discard_from_partition(ip_key)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self._get_max_size(),
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+            }
 
+    def _get_max_size(self):
+        if self.max_size is not None:
+            return self.max_size
+        return settings.MATHESAR_CACHED_PROPERTY_CACHE_SIZE
 
-def _set_on_central_cache(key, value):
-    global _central_cache
-    _central_cache[key] = value
+    def _discard_from_partition(self, ip_key):
+        partition, _ = ip_key
+        _discard_from_index(self._keys_by_partition, partition, ip_key)
+        tag = self._tags_by_key.pop(ip_key, None)
+        if tag is not None:
+            _discard_from_index(self._keys_by_tag, (partition, tag), ip_key)
 
 
-def _delete_from_central_cache(key):
-    global _central_cache
-    _central_cache[key] = NO_VALUE
+def _discard_from_index(index, index_key, ip_key):
+    ip_keys = index.get(index_key)
+    if ip_keys is not None:
+        ip_keys.discard(ip_key)
+        if len(ip_keys) == 0:
+            del index[index_key]
 
 
-_central_cache = {}
+_central_cache = _CentralCache()
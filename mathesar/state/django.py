@@ -1,21 +1,30 @@
 import logging
-from collections import defaultdict
-from functools import reduce
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
-import operator
+from django.conf import settings
 from django.core.cache import cache as dj_cache
-from django.db.models import Prefetch, Q
+from django.db import connection as dj_connection
+from django.db.models import Prefetch
 from sqlalchemy.exc import OperationalError
 
 from db.columns.operations.select import get_column_attnums_from_tables
-from db.constraints.operations.select import get_constraints_with_oids
+from db.constraints.operations.select import (
+    get_constraints_with_oids, get_constraints_with_oids_from_tables
+)
 from db.schemas.operations.select import get_mathesar_schemas_with_oids
-from db.tables.operations.select import get_table_oids_from_schemas
+from db.tables.operations.select import (
+    get_table_oids_from_schemas, get_table_fingerprints_from_schemas,
+    get_table_fingerprints_from_oids,
+)
 # We import the entire models.base module to avoid a circular import error
 from mathesar.models import base as models
 from mathesar.api.serializers.shared_serializers import DisplayOptionsMappingSerializer, \
     DISPLAY_OPTIONS_SERIALIZER_MAPPING_KEY
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
+from mathesar.state.cached_property import clear_cached_property_cache
+from mathesar.state.metadata import evict_tables_from_cached_metadata
 
 
 logger = logging.getLogger(__name__)
@@ -31,7 +40,16 @@ def clear_dj_cache():
 # queryset is created, and will recurse if used in these functions.
 
 
-def reflect_db_objects(metadata, db_name=None):
+def reflect_db_objects(metadata, db_name=None, incremental=False):
+    """
+    Reflects the schemas, tables, columns and constraints of the given database (or of all
+    databases, if db_name is None) into our Django models.
+
+    When incremental is True, only the schemas and tables that were created, changed or deleted
+    since the last reflection of their database are reflected, as told by comparing a new
+    snapshot of its catalog with the one taken then (see _update_catalog_snapshot). Databases that
+    haven't been reflected before are reflected in full.
+    """
     sync_databases_status()
     databases = models.Database.current_objects.all()
     if db_name is not None:
@@ -39,50 +57,382 @@ def reflect_db_objects(metadata, db_name=None):
 
     for database in databases:
         if database.deleted is False:
-            reflect_schemas_from_database(database)
-            schemas = models.Schema.current_objects.filter(database=database).prefetch_related(
-                Prefetch('database', queryset=databases)
-            )
-            reflect_tables_from_schemas(schemas, metadata=metadata)
-            tables = models.Table.current_objects.filter(schema__in=schemas).prefetch_related(
-                Prefetch('schema', queryset=schemas)
-            )
-            reflect_columns_from_tables(tables, metadata=metadata)
-            reflect_constraints_from_database(database)
+            if incremental and database.name in _catalog_snapshots:
+                _reflect_changed_db_objects(database, metadata)
+            else:
+                _reflect_all_db_objects(database, databases, metadata)
         else:
             models.Schema.current_objects.filter(database=database).delete()
+            _catalog_snapshots.pop(database.name, None)
+
+
+def _reflect_all_db_objects(database, databases, metadata):
+    schema_oids_to_names = reflect_schemas_from_database(database)
+    schemas = models.Schema.current_objects.filter(database=database).prefetch_related(
+        Prefetch('database', queryset=databases)
+    )
+    reflect_tables_from_schemas(schemas, metadata=metadata)
+    _update_catalog_snapshot(database, schema_oids_to_names, metadata)
+    clear_cached_property_cache(database.name)
+    tables = models.Table.current_objects.filter(schema__in=schemas).prefetch_related(
+        Prefetch('schema', queryset=schemas)
+    )
+    reflect_columns_from_tables(tables, metadata=metadata)
+    reflect_constraints_from_database(database)
+
+
+def _reflect_changed_db_objects(database, metadata):
+    """
+    Reflects the schemas and tables of the database that were created, changed or deleted since
+    its catalog snapshot was taken. The Django models of the others are left as they are.
+    """
+    schema_oids_to_names = {
+        schema['oid']: schema['schema']
+        for schema in get_mathesar_schemas_with_oids(database._sa_engine)
+    }
+    old_schema_oids = _catalog_snapshots[database.name].schema_names.keys()
+    models.Schema.current_objects.bulk_create(
+        [
+            models.Schema(oid=oid, database=database)
+            for oid in schema_oids_to_names.keys() - old_schema_oids
+        ],
+        ignore_conflicts=True,
+    )
+    deleted_schema_oids = old_schema_oids - schema_oids_to_names.keys()
+    if len(deleted_schema_oids) > 0:
+        models.Schema.current_objects.filter(
+            database=database, oid__in=deleted_schema_oids
+        ).delete()
+    changed_table_oids, deleted_table_oids = _update_catalog_snapshot(
+        database, schema_oids_to_names, metadata
+    )
+    table_infos = _catalog_snapshots[database.name].tables
+    _reflect_changed_tables(
+        database,
+        {oid: table_infos[oid].schema_oid for oid in changed_table_oids},
+        deleted_table_oids,
+    )
+    tables = models.Table.current_objects.filter(
+        schema__database=database, oid__in=changed_table_oids
+    ).select_related('schema__database')
+    reflect_columns_from_tables(tables, metadata=metadata)
+    reflect_constraints_from_tables(tables)
+
+
+def _reflect_changed_tables(database, changed_tables_schema_oids, deleted_table_oids):
+    """
+    Creates the Table models of changed tables (given as a dict of their oids to their schemas'
+    oids) that don't have one in their current schema, and deletes those of deleted tables and of
+    tables that were moved to another schema.
+    """
+    if len(changed_tables_schema_oids) == 0 and len(deleted_table_oids) == 0:
+        return
+    stale_table_ids = [
+        table_id
+        for table_id, oid, schema_oid in models.Table.current_objects.filter(
+            schema__database=database,
+            oid__in=[*changed_tables_schema_oids.keys(), *deleted_table_oids],
+        ).values_list('id', 'oid', 'schema__oid')
+        if changed_tables_schema_oids.get(oid) != schema_oid
+    ]
+    if len(stale_table_ids) > 0:
+        models.Table.current_objects.filter(id__in=stale_table_ids).delete()
+    schemas_by_oid = {
+        schema.oid: schema
+        for schema in models.Schema.current_objects.filter(
+            database=database, oid__in=set(changed_tables_schema_oids.values())
+        )
+    }
+    models.Table.current_objects.bulk_create(
+        [
+            models.Table(oid=oid, schema=schemas_by_oid[schema_oid])
+            for oid, schema_oid in changed_tables_schema_oids.items()
+        ],
+        ignore_conflicts=True,
+    )
+    # Calling signals manually because bulk create does not emit any signals
+    models._create_table_settings(
+        models.Table.current_objects.filter(
+            schema__database=database,
+            oid__in=changed_tables_schema_oids.keys(),
+            settings__isnull=True,
+        )
+    )
+
+
+def reflect_db_objects_by_oids(metadata, db_name, table_oids=None, schema_oids=None):
+    """
+    A scoped variant of reflect_db_objects. Only reflects the given tables and the tables of the
+    given schemas, which makes it suitable for use after a DDL change that's known to only affect
+    those objects.
+
+    If any of the given tables is new or was moved to another schema, the Table models can't be
+    updated in a scoped way, so this falls back to an incremental reflection of the database.
+    """
+    database = models.Database.current_objects.get(name=db_name)
+    if table_oids and not _are_tables_reflected(database, table_oids):
+        reflect_db_objects(metadata, db_name=db_name, incremental=True)
+        return
+    tables = models.Table.current_objects.none()
+    if schema_oids:
+        schemas = models.Schema.current_objects.filter(
+            database=database, oid__in=schema_oids
+        ).select_related('database')
+        reflect_tables_from_schemas(schemas, metadata=metadata)
+        tables = tables | models.Table.current_objects.filter(schema__in=schemas)
+    if table_oids:
+        tables = tables | models.Table.current_objects.filter(
+            schema__database=database, oid__in=table_oids
+        )
+    tables = tables.select_related('schema__database')
+    _update_catalog_snapshot_for_tables(database, [table.oid for table in tables], metadata)
+    reflect_columns_from_tables(tables, metadata=metadata)
+    reflect_constraints_from_tables(tables)
+
+
+def _are_tables_reflected(database, table_oids):
+    """
+    Checks whether each of the given tables has a Table model in the schema it's currently in.
+    """
+    db_table_oids = {
+        (row['oid'], row['schema_oid'])
+        for row in get_table_fingerprints_from_oids(table_oids, database._sa_engine)
+    }
+    reflected_table_oids = set(
+        models.Table.current_objects.filter(
+            schema__database=database, oid__in=table_oids
+        ).values_list('oid', 'schema__oid')
+    )
+    return db_table_oids.issubset(reflected_table_oids)
+
+
+def clear_catalog_snapshots():
+    """
+    Forget all catalog snapshots, so that the next incremental reflection reflects everything.
+    """
+    _catalog_snapshots.clear()
+
+
+def get_reflected_table_fingerprints(db_name, table_oids):
+    """
+    Returns the fingerprints of those of the given tables that were reflected, as of their last
+    reflection, by their oids.
+    """
+    snapshot = _catalog_snapshots.get(db_name)
+    if snapshot is None:
+        return {}
+    table_infos = {oid: snapshot.tables.get(oid) for oid in table_oids}
+    return {
+        oid: table_info.fingerprint
+        for oid, table_info in table_infos.items()
+        if table_info is not None
+    }
+
+
+def clear_reflection_of_database(db_name, metadata):
+    """
+    Forgets the catalog snapshot, health probe result and cached schema names of the given
+    database, and evicts its tables from the given MetaData, leaving those of other databases as
+    they are.
+
+    Returns False, without forgetting anything, if the database has no catalog snapshot, since
+    then there's no telling which of the MetaData's tables are its.
+    """
+    snapshot = _catalog_snapshots.get(db_name)
+    if snapshot is None:
+        return False
+    evict_tables_from_cached_metadata(
+        [(table_info.schema_name, table_info.table_name) for table_info in snapshot.tables.values()],
+        metadata=metadata,
+    )
+    for schema in models.Schema.current_objects.filter(database__name=db_name).select_related('database'):
+        schema.clear_name_cache()
+    del _catalog_snapshots[db_name]
+    _database_statuses.pop(db_name, None)
+    return True
+
+
+def _update_catalog_snapshot(database, schema_oids_to_names, metadata):
+    """
+    Takes a new snapshot of the database's catalog and compares it with the previous one.
+
+    Evicts the state derived from tables and schemas that changed (or disappeared) since the
+    previous snapshot and returns the oids of the tables that are new or changed, and of those
+    that were deleted.
+    """
+    rows = get_table_fingerprints_from_schemas(
+        list(schema_oids_to_names.keys()), database._sa_engine
+    )
+    new_snapshot = _CatalogSnapshot(
+        schema_names=schema_oids_to_names,
+        tables={row['oid']: _get_table_info(row) for row in rows},
+    )
+    old_snapshot = _catalog_snapshots.get(database.name, _CatalogSnapshot(schema_names={}, tables={}))
+    _catalog_snapshots[database.name] = new_snapshot
+
+    changed_table_oids = {
+        oid for oid, table_info in new_snapshot.tables.items()
+        if old_snapshot.tables.get(oid) != table_info
+    }
+    deleted_table_oids = old_snapshot.tables.keys() - new_snapshot.tables.keys()
+    stale_table_names = [
+        (table_info.schema_name, table_info.table_name)
+        for oid, table_info in old_snapshot.tables.items()
+        if oid in changed_table_oids or oid in deleted_table_oids
+    ]
+    # Tables created since the previous snapshot may have been reflected in the meantime, too.
+    stale_table_names += [
+        (table_info.schema_name, table_info.table_name)
+        for oid, table_info in new_snapshot.tables.items()
+        if oid in changed_table_oids
+    ]
+    evicted_table_names = evict_tables_from_cached_metadata(stale_table_names, metadata=metadata)
+    _clear_cached_properties_of_tables(
+        database, changed_table_oids | deleted_table_oids, evicted_table_names,
+        [old_snapshot, new_snapshot],
+    )
+
+    changed_schema_oids = {
+        oid for oid, name in old_snapshot.schema_names.items()
+        if new_snapshot.schema_names.get(oid) != name
+    }
+    for schema in models.Schema.current_objects.filter(
+        database=database, oid__in=changed_schema_oids
+    ).select_related('database'):
+        schema.clear_name_cache()
+    return changed_table_oids, deleted_table_oids
+
+
+def _update_catalog_snapshot_for_tables(database, table_oids, metadata):
+    """
+    Like _update_catalog_snapshot, but only for the given tables, which are always considered
+    changed.
+    """
+    rows = get_table_fingerprints_from_oids(table_oids, database._sa_engine)
+    stale_table_names = [(row['schema_name'], row['table_name']) for row in rows]
+    snapshot = _catalog_snapshots.get(database.name)
+    snapshots = []
+    if snapshot is not None:
+        for oid in table_oids:
+            old_table_info = snapshot.tables.pop(oid, None)
+            if old_table_info is not None:
+                stale_table_names.append((old_table_info.schema_name, old_table_info.table_name))
+        snapshot.tables.update({row['oid']: _get_table_info(row) for row in rows})
+        snapshots.append(snapshot)
+    evicted_table_names = evict_tables_from_cached_metadata(stale_table_names, metadata=metadata)
+    _clear_cached_properties_of_tables(database, set(table_oids), evicted_table_names, snapshots)
+
+
+def _clear_cached_properties_of_tables(database, table_oids, evicted_table_names, snapshots):
+    """
+    Clears the cached properties of the objects of the given tables, and of the tables that were
+    evicted from the cached MetaData along with them (e.g. because of their foreign keys), which
+    are looked up in the given snapshots.
+    """
+    evicted_table_names = set(evicted_table_names)
+    if len(evicted_table_names) > 0:
+        table_oids = table_oids | {
+            oid
+            for snapshot in snapshots
+            for oid, table_info in snapshot.tables.items()
+            if (table_info.schema_name, table_info.table_name) in evicted_table_names
+        }
+    clear_cached_property_cache(database.name, tags=table_oids)
+
+
+def _get_table_info(fingerprint_row):
+    return _TableInfo(
+        fingerprint=fingerprint_row['fingerprint'],
+        schema_oid=fingerprint_row['schema_oid'],
+        schema_name=fingerprint_row['schema_name'],
+        table_name=fingerprint_row['table_name'],
+    )
+
+
+# schema_names maps schema oids to schema names; tables maps table oids to _TableInfo tuples.
+_CatalogSnapshot = namedtuple('_CatalogSnapshot', ['schema_names', 'tables'])
+_TableInfo = namedtuple('_TableInfo', ['fingerprint', 'schema_oid', 'schema_name', 'table_name'])
+
+
+# Maps database names to the _CatalogSnapshot taken during their last reflection.
+_catalog_snapshots = {}
 
 
 def sync_databases_status():
-    """Update status and check health for current Database Model instances."""
-    for db in models.Database.current_objects.all():
-        try:
-            db._sa_engine.connect()
-            db._sa_engine.dispose()
-            db.deleted = False
-        except (OperationalError, KeyError):
-            db.deleted = True
-        finally:
-            db.save()
-
-
-# TODO pass in a cached engine instead of creating a new one
+    """
+    Update status and check health for current Database Model instances.
+
+    Databases are probed concurrently, and a probe's result is reused for
+    settings.MATHESAR_DB_HEALTH_CHECK_TTL seconds, so that an unreachable database only costs one
+    (short) connection timeout per TTL instead of one per reflection. A Database instance is only
+    saved when its status changes.
+    """
+    databases = list(models.Database.current_objects.all())
+    now = time.monotonic()
+    db_names_to_probe = [
+        database.name for database in databases
+        if not _is_database_status_fresh(database.name, now)
+    ]
+    if len(db_names_to_probe) > 0:
+        max_workers = min(len(db_names_to_probe), _MAX_HEALTH_PROBE_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            is_healthy_results = executor.map(_probe_database, db_names_to_probe)
+            for db_name, is_healthy in zip(db_names_to_probe, is_healthy_results):
+                _database_statuses[db_name] = (is_healthy, now)
+    for database in databases:
+        is_healthy, _ = _database_statuses[database.name]
+        deleted = not is_healthy
+        if database.deleted != deleted:
+            database.deleted = deleted
+            database.save()
+
+
+def clear_database_statuses():
+    """
+    Forget all database health probe results, so that the next reflection probes again.
+    """
+    _database_statuses.clear()
+
+
+def _is_database_status_fresh(db_name, now):
+    status = _database_statuses.get(db_name)
+    if status is None:
+        return False
+    _, checked_at = status
+    return now - checked_at < settings.MATHESAR_DB_HEALTH_CHECK_TTL
+
+
+def _probe_database(db_name):
+    try:
+        # The engine is shared, so it must not be disposed here. Its connection timeout is
+        # configured by settings.MATHESAR_DB_CONNECT_TIMEOUT.
+        with get_mathesar_engine(db_name).connect():
+            return True
+    except (OperationalError, KeyError):
+        return False
+
+
+_MAX_HEALTH_PROBE_WORKERS = 8
+
+
+# Maps database names to (is healthy, time.monotonic() of the probe) tuples.
+_database_statuses = {}
+
+
 def reflect_schemas_from_database(database):
-    engine = create_mathesar_engine(database.name)
-    db_schema_oids = {
-        schema['oid'] for schema in get_mathesar_schemas_with_oids(engine)
+    engine = database._sa_engine
+    db_schema_oids_to_names = {
+        schema['oid']: schema['schema'] for schema in get_mathesar_schemas_with_oids(engine)
     }
+    db_schema_oids = db_schema_oids_to_names.keys()
 
-    schemas = []
-    for oid in db_schema_oids:
-        schema = models.Schema(oid=oid, database=database)
-        schemas.append(schema)
+    schemas = [models.Schema(oid=oid, database=database) for oid in db_schema_oids]
     models.Schema.current_objects.bulk_create(schemas, ignore_conflicts=True)
-    for schema in models.Schema.current_objects.all().select_related('database'):
-        if schema.database == database and schema.oid not in db_schema_oids:
-            # Deleting Schemas are a rare occasion, not worth deleting in bulk
-            schema.delete()
-    engine.dispose()
+    _delete_stale_objects(
+        models.Schema, 'database', [database.id],
+        [(oid, database.id) for oid in db_schema_oids],
+    )
+    return db_schema_oids_to_names
 
 
 def reflect_tables_from_schemas(schemas, metadata):
@@ -94,20 +444,18 @@ def reflect_tables_from_schemas(schemas, metadata):
         (table['oid'], table['schema_oid'])
         for table in get_table_oids_from_schemas(schema_oids, engine, metadata=metadata)
     }
-    tables = []
-    for oid, schema_oid in db_table_oids:
-        schema = next(schema for schema in schemas if schema.oid == schema_oid)
-        table = models.Table(oid=oid, schema=schema)
-        tables.append(table)
+    schemas_by_oid = {schema.oid: schema for schema in schemas}
+    tables = [
+        models.Table(oid=oid, schema=schemas_by_oid[schema_oid])
+        for oid, schema_oid in db_table_oids
+    ]
     models.Table.current_objects.bulk_create(tables, ignore_conflicts=True)
     # Calling signals manually because bulk create does not emit any signals
     models._create_table_settings(models.Table.current_objects.filter(settings__isnull=True))
-    deleted_tables = []
-    for table in models.Table.current_objects.filter(schema__in=schemas).select_related('schema'):
-        if (table.oid, table.schema.oid) not in db_table_oids:
-            deleted_tables.append(table.id)
-
-    models.Table.current_objects.filter(id__in=deleted_tables).delete()
+    _delete_stale_objects(
+        models.Table, 'schema', list(schemas_by_oid.values()),
+        [(oid, schemas_by_oid[schema_oid]) for oid, schema_oid in db_table_oids],
+    )
 
 
 def reflect_columns_from_tables(tables, metadata):
@@ -144,66 +492,115 @@ def _invalidate_columns_with_incorrect_display_options(tables):
 
 
 def _create_reflected_columns(attnum_tuples, tables):
-    columns = []
-    for attnum, table_oid in attnum_tuples:
-        table = next(table for table in tables if table.oid == table_oid)
-        column = models.Column(attnum=attnum, table=table, display_options=None)
-        columns.append(column)
+    tables_by_oid = {table.oid: table for table in tables}
+    columns = [
+        models.Column(attnum=attnum, table=tables_by_oid[table_oid], display_options=None)
+        for attnum, table_oid in attnum_tuples
+    ]
     models.Column.current_objects.bulk_create(columns, ignore_conflicts=True)
 
 
 def _delete_stale_columns(attnum_tuples, tables):
-    attnums_mapped_by_table_oid = defaultdict(list)
-    for table in tables:
-        # Incase a table does not contain any column, it won't show up in the `attnum_tuples`
-        # In such cases we should delete all the column on Django
-        attnums_mapped_by_table_oid[table.oid] = []
-    for attnum, table_oid in attnum_tuples:
-        attnums_mapped_by_table_oid[table_oid].append(attnum)
-    stale_columns_conditions = []
-    for table_oid, attnums in attnums_mapped_by_table_oid.items():
-        table = next(table for table in tables if table.oid == table_oid)
-        stale_columns_conditions.append(Q(table=table) & ~Q(attnum__in=attnums))
-    stale_columns_query = reduce(
-        operator.or_,
-        stale_columns_conditions
-    )
-    models.Column.objects.filter(stale_columns_query).delete()
-
-
-# TODO pass in a cached engine instead of creating a new one
+    tables_by_oid = {table.oid: table for table in tables}
+    # Incase a table does not contain any column, it won't show up in the `attnum_tuples`, but all
+    # of its columns on Django should still be deleted, hence the parents are all of `tables`.
+    _delete_stale_objects(
+        models.Column, 'table', list(tables_by_oid.values()),
+        [(attnum, tables_by_oid[table_oid]) for attnum, table_oid in attnum_tuples],
+        oid_field_name='attnum',
+    )
+
+
+def _delete_stale_objects(model, parent_field_name, parents, reflected_tuples, oid_field_name='oid'):
+    """
+    Deletes the objects of the given model that belong to one of the given parents, but aren't in
+    reflected_tuples, a list of (oid, parent) tuples found in the user database.
+
+    The reflected tuples are passed to Postgres as a pair of arrays and anti-joined against the
+    model's table, so finding the stale objects takes a single query no matter how many objects
+    there are. Deleting them goes through the ORM so that cascades are still handled.
+    """
+    if len(parents) < 1:
+        return
+    opts = model._meta
+    quote_name = dj_connection.ops.quote_name
+    parent_column = quote_name(opts.get_field(parent_field_name).column)
+    oid_column = quote_name(opts.get_field(oid_field_name).column)
+    query = f"""
+    SELECT o.{quote_name(opts.pk.column)} FROM {quote_name(opts.db_table)} AS o
+    WHERE o.{parent_column} = ANY(%s)
+    AND NOT EXISTS (
+      SELECT 1 FROM unnest(%s::bigint[], %s::bigint[]) AS r(oid, parent_id)
+      WHERE r.oid = o.{oid_column} AND r.parent_id = o.{parent_column}
+    )
+    """
+    parent_ids = [_get_id(parent) for parent in parents]
+    reflected_oids = [oid for oid, _ in reflected_tuples]
+    reflected_parent_ids = [_get_id(parent) for _, parent in reflected_tuples]
+    with dj_connection.cursor() as cursor:
+        cursor.execute(query, [parent_ids, reflected_oids, reflected_parent_ids])
+        stale_ids = [row[0] for row in cursor.fetchall()]
+    if len(stale_ids) > 0:
+        model.current_objects.filter(id__in=stale_ids).delete()
+
+
+def _get_id(obj):
+    return obj if isinstance(obj, int) else obj.id
+
+
 def reflect_constraints_from_database(database):
-    engine = create_mathesar_engine(database.name)
+    engine = database._sa_engine
     db_constraints = get_constraints_with_oids(engine)
-    map_of_table_oid_to_constraint_oids = defaultdict(list)
-    for db_constraint in db_constraints:
-        table_oid = db_constraint['conrelid']
-        constraint_oid = db_constraint['oid']
-        map_of_table_oid_to_constraint_oids[table_oid].append(constraint_oid)
-
-    table_oids = map_of_table_oid_to_constraint_oids.keys()
-    tables = models.Table.current_objects.filter(oid__in=table_oids)
-    constraint_objs_to_create = []
-    for table in tables:
-        constraint_oids = map_of_table_oid_to_constraint_oids.get(table.oid, [])
-        for constraint_oid in constraint_oids:
-            constraint_obj = models.Constraint(oid=constraint_oid, table=table)
-            constraint_objs_to_create.append(constraint_obj)
-    models.Constraint.current_objects.bulk_create(constraint_objs_to_create, ignore_conflicts=True)
-
-    stale_constraint_ids = []
-    for constraint in models.Constraint.current_objects.all():
-        if constraint.oid not in [db_constraint['oid'] for db_constraint in db_constraints]:
-            stale_constraint_ids.append(constraint.id)
-    models.Constraint.current_objects.filter(
-        table__schema__database=database, id__in=stale_constraint_ids
-    ).delete()
-    engine.dispose()
-
-
-# TODO pass in a cached engine instead of creating a new one
+    tables_by_oid = {
+        table.oid: table
+        for table in models.Table.current_objects.filter(schema__database=database)
+    }
+    # Constraints of tables that aren't reflected (e.g. those in internal schemas) are skipped.
+    reflected_tuples = [
+        (db_constraint['oid'], tables_by_oid[db_constraint['conrelid']])
+        for db_constraint in db_constraints
+        if db_constraint['conrelid'] in tables_by_oid
+    ]
+    models.Constraint.current_objects.bulk_create(
+        [models.Constraint(oid=oid, table=table) for oid, table in reflected_tuples],
+        ignore_conflicts=True
+    )
+    _delete_stale_objects(
+        models.Constraint, 'table', list(tables_by_oid.values()), reflected_tuples
+    )
+
+
+def reflect_constraints_from_tables(tables):
+    """
+    Like reflect_constraints_from_database, but only for the constraints attached to the given
+    tables.
+    """
+    if len(tables) < 1:
+        return
+    engine = tables[0]._sa_engine
+    table_oids_to_tables = {table.oid: table for table in tables}
+    db_constraints = get_constraints_with_oids_from_tables(list(table_oids_to_tables.keys()), engine)
+    models.Constraint.current_objects.bulk_create(
+        [
+            models.Constraint(
+                oid=db_constraint['oid'],
+                table=table_oids_to_tables[db_constraint['conrelid']]
+            )
+            for db_constraint in db_constraints
+        ],
+        ignore_conflicts=True
+    )
+    _delete_stale_objects(
+        models.Constraint, 'table', list(table_oids_to_tables.values()),
+        [
+            (db_constraint['oid'], table_oids_to_tables[db_constraint['conrelid']])
+            for db_constraint in db_constraints
+        ],
+    )
+
+
 def reflect_new_table_constraints(table):
-    engine = create_mathesar_engine(table.schema.database.name)
+    engine = table._sa_engine
     db_constraints = get_constraints_with_oids(engine, table_oid=table.oid)
     constraints = [
         models.Constraint.current_objects.get_or_create(
@@ -212,5 +609,4 @@ def reflect_new_table_constraints(table):
         )
         for db_constraint in db_constraints
     ]
-    engine.dispose()
     return constraints
@@ -1,3 +1,5 @@
+from sqlalchemy.exc import NoReferenceError
+
 from db.metadata import get_empty_metadata
 from django_request_cache import cache_for_request
 
@@ -19,3 +21,51 @@ def reset_cached_metadata():
 
 
 _metadata_cache = get_empty_metadata()
+
+
+def evict_tables_from_cached_metadata(schema_and_table_names, metadata=None):
+    """
+    Removes the given tables, identified by (schema name, table name) tuples, from the cached
+    MetaData, so that they're reflected anew the next time they're needed.
+
+    Tables that have foreign keys to an evicted table are evicted too (recursively), since their
+    foreign keys stay bound to the evicted Table object, which breaks reflecting it anew.
+
+    Returns the (schema name, table name) tuples of all evicted tables.
+    """
+    if metadata is None:
+        metadata = _metadata_cache
+    keys_to_evict = {
+        f'{schema_name}.{table_name}' for schema_name, table_name in schema_and_table_names
+    } & set(metadata.tables.keys())
+    new_keys_to_evict = keys_to_evict
+    while new_keys_to_evict:
+        new_keys_to_evict = {
+            key for key, sa_table in metadata.tables.items()
+            if key not in keys_to_evict
+            and _get_referred_table_keys(sa_table) & new_keys_to_evict
+        }
+        keys_to_evict |= new_keys_to_evict
+    evicted_table_names = []
+    for key in keys_to_evict:
+        sa_table = metadata.tables[key]
+        evicted_table_names.append((sa_table.schema, sa_table.name))
+        metadata.remove(sa_table)
+    # SQLAlchemy memoizes foreign keys by the table they refer to. Foreign keys replaced by
+    # reflecting a table again (with extend_existing) aren't forgotten when it's removed, and
+    # would be linked to the evicted tables once they're reflected anew.
+    for fk_memo_key in list(metadata._fk_memos.keys()):
+        table_key, _ = fk_memo_key
+        if table_key in keys_to_evict:
+            del metadata._fk_memos[fk_memo_key]
+    return evicted_table_names
+
+
+def _get_referred_table_keys(sa_table):
+    referred_table_keys = set()
+    for foreign_key in sa_table.foreign_keys:
+        try:
+            referred_table_keys.add(foreign_key.column.table.key)
+        except NoReferenceError:
+            pass
+    return referred_table_keys
@@ -189,6 +189,21 @@ def test_data_file_404(client, data_file):
     assert response.json()[0]['code'] == ErrorCodes.NotFound.value
 
 
+def test_data_file_progress(client, data_file):
+    response = client.get(f'/api/db/v0/data_files/{data_file.id}/progress/')
+    assert response.status_code == 200
+    assert response.json() == {
+        'id': data_file.id,
+        'status': '',
+        'bytes_processed': 0,
+        'bytes_total': data_file.file.size,
+        'rows_processed': 0,
+        'table_imported_to': None,
+        'error': '',
+        'progress_url': f'http://testserver/api/db/v0/data_files/{data_file.id}/progress/',
+    }
+
+
 def test_data_file_create_invalid_file(client):
     file = 'mathesar/tests/data/csv_parsing/patents_invalid.csv'
     with patch.object(csv, "get_sv_dialect") as mock_infer:
@@ -204,6 +219,7 @@ def test_data_file_create_non_unicode_file(client, non_unicode_csv_filepath):
     with open(non_unicode_csv_filepath, 'rb') as non_unicode_file:
         response = client.post('/api/db/v0/data_files/', data={'file': non_unicode_file}, format='multipart')
     assert response.status_code == 201
+    assert DataFile.objects.get(id=response.json()['id']).encoding == 'utf_16_le'
 
 
 def test_data_file_create_url_invalid_format(client):
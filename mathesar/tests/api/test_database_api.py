@@ -5,7 +5,7 @@ from sqlalchemy import text
 from db.metadata import get_empty_metadata
 from mathesar.database.base import create_mathesar_engine
 from mathesar.models.users import DatabaseRole
-from mathesar.state.django import reflect_db_objects
+from mathesar.state.django import clear_database_statuses, reflect_db_objects
 from mathesar.models.base import Table, Schema, Database
 
 
@@ -22,6 +22,8 @@ def _remove_db(db_name):
     with root_engine.connect() as conn:
         conn.execution_options(isolation_level="AUTOCOMMIT")
         conn.execute(text(f"DROP DATABASE IF EXISTS {db_name} WITH (FORCE);"))
+    # Otherwise the database's health would be cached as of before it was removed.
+    clear_database_statuses()
 
 
 @pytest.fixture
@@ -1,16 +1,29 @@
+import csv
+import io
 import json
+import threading
 import pytest
 from copy import deepcopy
 from unittest.mock import patch
 
+from psycopg2.errors import QueryCanceled
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
 from db.constraints.base import ForeignKeyConstraint, UniqueConstraint
 from db.functions.exceptions import UnknownDBFunctionID
 from db.records.exceptions import BadGroupFormat, GroupFieldNotFound
 from db.records.operations.group import GroupBy
 from db.records.operations.sort import BadSortFormat, SortFieldNotFound
+from db.types.base import PostgresType
 
+from mathesar.api import pagination
+from mathesar.api.db.viewsets.records import RecordViewSet
 from mathesar.api.exceptions.error_codes import ErrorCodes
+from mathesar.api.exceptions.generic_exceptions.base_exceptions import MathesarAPIException
+from mathesar.api.serializers.records import RecordSerializer
 from mathesar.api.utils import follows_json_number_spec
+from mathesar.database.types import UIType
 from mathesar.functions.operations.convert import rewrite_db_function_spec_column_ids_to_names
 from mathesar.models import base as models_base
 from mathesar.models.base import compute_default_preview_template
@@ -790,6 +803,157 @@ def test_record_list_pagination_offset(create_patents_table, client):
     assert record_1_data[str(columns_id[5])] != record_2_data[str(columns_id[5])]
 
 
+def test_record_list_pagination_cursor(create_patents_table, client):
+    table_name = 'NASA Record List Pagination Cursor'
+    table = create_patents_table(table_name)
+    column_id = table.columns.all().order_by('id').values_list('id', flat=True)[1]
+    order_by = json.dumps([{'field': column_id, 'direction': 'desc'}])
+    base_url = f'/api/db/v0/tables/{table.id}/records/?limit=5&order_by={order_by}'
+
+    response_1 = client.get(f'{base_url}&cursor=')
+    response_1_data = response_1.json()
+    response_2 = client.get(f'{base_url}&cursor={response_1_data["next_cursor"]}')
+    response_2_data = response_2.json()
+    offset_response = client.get(f'{base_url}&offset=5')
+
+    assert response_1.status_code == 200
+    assert response_2.status_code == 200
+    assert response_1_data['count'] == 1393
+    assert response_1_data['results'] == client.get(base_url).json()['results']
+    assert response_2_data['results'] == offset_response.json()['results']
+    assert response_2_data['next_cursor'] is not None
+    assert 'next_cursor' not in offset_response.json()
+
+
+def test_record_list_pagination_cursor_last_page(create_patents_table, client):
+    table_name = 'NASA Record List Pagination Cursor Last Page'
+    table = create_patents_table(table_name)
+    base_url = f'/api/db/v0/tables/{table.id}/records/?limit=500'
+    response_data = {'next_cursor': ''}
+    num_records = 0
+    num_pages = 0
+    while response_data['next_cursor'] is not None:
+        response = client.get(f'{base_url}&cursor={response_data["next_cursor"]}')
+        assert response.status_code == 200
+        response_data = response.json()
+        num_records += len(response_data['results'])
+        num_pages += 1
+    assert num_records == 1393
+    assert num_pages == 3
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'eyJhIjogMX0=', 'WzEsIDIsIDNd'])
+def test_record_list_pagination_invalid_cursor(create_patents_table, client, cursor):
+    table_name = 'NASA Record List Pagination Invalid Cursor'
+    table = create_patents_table(table_name)
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?cursor={cursor}')
+    response_data = response.json()
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.InvalidCursor.value
+    assert response_data[0]['field'] == 'cursor'
+
+
+def test_record_list_count_none(create_patents_table, client):
+    table_name = 'NASA Record List Count None'
+    table = create_patents_table(table_name)
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=5&count=none')
+    response_data = response.json()
+    assert response.status_code == 200
+    assert response_data['count'] is None
+    assert len(response_data['results']) == 5
+
+
+def test_record_list_count_approximate(create_patents_table, client, settings):
+    table_name = 'NASA Record List Count Approximate'
+    table = create_patents_table(table_name)
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(f'ANALYZE "{table.schema.name}"."{table.name}"'))
+    url = f'/api/db/v0/tables/{table.id}/records/?limit=5&count=approx'
+
+    settings.MATHESAR_APPROXIMATE_COUNT_THRESHOLD = 1000
+    response_data = client.get(url).json()
+    assert response_data['count'] == 1393
+    assert response_data['approximate'] is True
+
+    # Small tables are counted exactly.
+    settings.MATHESAR_APPROXIMATE_COUNT_THRESHOLD = 10000
+    response_data = client.get(url).json()
+    assert response_data['count'] == 1393
+    assert response_data['approximate'] is False
+
+
+def test_record_list_count_approximate_with_filter_is_exact(create_patents_table, client, settings):
+    settings.MATHESAR_APPROXIMATE_COUNT_THRESHOLD = 0
+    table_name = 'NASA Record List Count Approximate Filter'
+    table = create_patents_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    filter = json.dumps(
+        {"equal": [{"column_id": [columns_name_id_map['Center']]}, {"literal": ["NASA Ames Research Center"]}]}
+    )
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?count=approx&filter={filter}')
+    response_data = response.json()
+    assert response.status_code == 200
+    assert response_data['approximate'] is False
+    assert response_data['count'] == len(
+        table.get_records(filter={"equal": [{"column_name": ["Center"]}, {"literal": ["NASA Ames Research Center"]}]})
+    )
+
+
+def test_record_list_count_is_invalidated_by_record_create(create_patents_table, client):
+    table_name = 'NASA Record List Count Invalidation'
+    table = create_patents_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    url = f'/api/db/v0/tables/{table.id}/records/?limit=5'
+    assert client.get(url).json()['count'] == 1393
+    data = {columns_name_id_map['Center']: 'NASA Example Space Center'}
+    response = client.post(f'/api/db/v0/tables/{table.id}/records/', data=data)
+    assert response.status_code == 201
+    assert client.get(url).json()['count'] == 1394
+
+
+def test_record_list_snapshot(create_patents_table, client):
+    table_name = 'NASA Record List Snapshot'
+    table = create_patents_table(table_name)
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=5&snapshot=true')
+    response_data = response.json()
+    assert response.status_code == 200
+    assert response_data['count'] == 1393
+    assert response_data['results'] == client.get(
+        f'/api/db/v0/tables/{table.id}/records/?limit=5'
+    ).json()['results']
+
+
+def test_record_list_count_estimated_over_budget(create_patents_table, client, settings):
+    table_name = 'NASA Record List Count Over Budget'
+    table = create_patents_table(table_name)
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(f'ANALYZE "{table.schema.name}"."{table.name}"'))
+    url = f'/api/db/v0/tables/{table.id}/records/?limit=5'
+
+    settings.MATHESAR_QUERY_BUDGETS = {'table_records': {'approximate_count_cost': 1}}
+    response_data = client.get(url).json()
+    assert response_data['count'] == 1393
+    assert response_data['approximate'] is True
+
+    settings.MATHESAR_QUERY_BUDGETS = {'table_records': {'approximate_count_cost': 0}}
+    response_data = client.get(url).json()
+    assert response_data['count'] == 1393
+    assert response_data['approximate'] is False
+
+
+def test_record_list_query_budget_exceeded(create_patents_table, client):
+    table_name = 'NASA Record List Query Budget Exceeded'
+    table = create_patents_table(table_name)
+    query_canceled = OperationalError(
+        'SELECT', {}, QueryCanceled('canceling statement due to statement timeout')
+    )
+    with patch.object(DBQuery, 'get_records', side_effect=query_canceled):
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/')
+    response_data = response.json()
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.QueryBudgetExceeded.value
+
+
 def test_self_referential_column_preview(self_referential_table, engine, client):
     table = self_referential_table
     pk_column = table.get_column_by_name("Id")
@@ -1067,6 +1231,65 @@ def test_record_partial_update_based_on_permission(create_patents_table, request
     assert response.status_code == expected_status_code
 
 
+@pytest.mark.parametrize('fetch_workers,slots_free,fetched_on_request_thread', [
+    (4, True, False),
+    (4, False, True),
+    (0, True, True),
+])
+def test_record_list_fetches_records_on_bounded_threads(
+    create_patents_table, client, settings, fetch_workers, slots_free, fetched_on_request_thread
+):
+    settings.MATHESAR_RECORDS_FETCH_WORKERS = fetch_workers
+    table = create_patents_table('NASA Record List Fetch Threads')
+    get_records_within_budget = pagination._get_records_within_budget
+    thread_ids = []
+
+    def _get_records(*args, **kwargs):
+        thread_ids.append(threading.get_ident())
+        return get_records_within_budget(*args, **kwargs)
+
+    busy_slots = threading.BoundedSemaphore(1)
+    busy_slots.acquire()
+    with patch.object(pagination, '_get_records_within_budget', _get_records), \
+            patch.object(pagination, '_records_fetch_slots', pagination._records_fetch_slots if slots_free else busy_slots):
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=5')
+    assert response.status_code == 200
+    assert response.json()['count'] == 1393
+    assert len(response.json()['results']) == 5
+    assert (thread_ids == [threading.get_ident()]) == fetched_on_request_thread
+
+
+def test_record_partial_update_preview_data(publication_tables, client):
+    author_table, publisher_table, publication_table, checkouts_table = publication_tables
+    columns_name_id_map = checkouts_table.get_column_name_id_bidirectional_map()
+    data = {columns_name_id_map['acquisition_price']: 7.5}
+    with patch('mathesar.api.pagination.get_record_count') as mock_count:
+        response = client.patch(f'/api/db/v0/tables/{checkouts_table.id}/records/1/', data=data)
+    assert response.status_code == 200
+    # The updated record isn't read or counted again.
+    mock_count.assert_not_called()
+    response_data = response.json()
+    assert response_data['count'] == 1
+    detail_response_data = client.get(f'/api/db/v0/tables/{checkouts_table.id}/records/1/').json()
+    assert response_data['results'] == detail_response_data['results']
+    assert response_data['preview_data'] == detail_response_data['preview_data']
+    publication_preview = next(
+        preview
+        for preview in response_data['preview_data']
+        if preview['column'] == columns_name_id_map['publication']
+    )
+    assert list(publication_preview['data']) == ['1']
+
+
+def test_record_partial_update_missing_record(create_patents_table, client):
+    table = create_patents_table('NASA Record Patch Missing')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    data = {columns_name_id_map['Center']: 'NASA Example Space Center'}
+    response = client.patch(f'/api/db/v0/tables/{table.id}/records/100000/', data=data)
+    assert response.status_code == 404
+    assert response.json()[0]['code'] == ErrorCodes.RecordNotFound.value
+
+
 def test_record_partial_update(create_patents_table, client):
     table_name = 'NASA Record Patch'
     table = create_patents_table(table_name)
@@ -1138,6 +1361,74 @@ def test_record_delete(create_patents_table, client):
     assert len(table.get_records()) == original_num_records - 1
 
 
+def test_record_bulk(create_patents_table, client):
+    table_name = 'NASA Record Bulk'
+    table = create_patents_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    center_id = columns_name_id_map['Center']
+    records = table.get_records(order_by=[{'field': 'id', 'direction': 'asc'}])
+    url = f'/api/db/v0/tables/{table.id}/records/'
+    assert client.get(url).json()['count'] == 1393
+    data = {
+        'operations': [
+            {'type': 'insert', 'record': {center_id: 'NASA Example Space Center'}},
+            {'type': 'update', 'id': records[0]['id'], 'record': {center_id: 'NASA Updated Center'}},
+            {'type': 'update', 'id': records[1]['id'], 'record': {center_id: 'NASA Updated Center'}},
+            {'type': 'delete', 'id': records[2]['id']},
+        ]
+    }
+    response = client.post(f'{url}bulk/', data=data, format='json')
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['type'] for result in results] == ['insert', 'update', 'update', 'delete']
+    assert results[0]['record'][str(center_id)] == 'NASA Example Space Center'
+    assert results[1]['record'][str(columns_name_id_map['id'])] == records[0]['id']
+    assert results[1]['record'][str(center_id)] == 'NASA Updated Center'
+    assert results[3] == {'type': 'delete', 'id': records[2]['id']}
+    assert table.get_record(records[1]['id'])['Center'] == 'NASA Updated Center'
+    assert table.get_record(records[2]['id']) is None
+    assert client.get(url).json()['count'] == 1393
+
+
+def test_record_bulk_is_atomic(create_patents_table, client):
+    table_name = 'NASA Record Bulk Atomic'
+    table = create_patents_table(table_name)
+    records = table.get_records()
+    data = {
+        'operations': [
+            {'type': 'delete', 'id': records[0]['id']},
+            {'type': 'delete', 'id': 1000000},
+        ]
+    }
+    response = client.post(f'/api/db/v0/tables/{table.id}/records/bulk/', data=data, format='json')
+    response_data = response.json()
+    assert response.status_code == 400
+    assert len(response_data) == 1
+    assert response_data[0]['code'] == ErrorCodes.RecordNotFound.value
+    assert response_data[0]['detail']['operation_index'] == 1
+    assert table.get_record(records[0]['id']) is not None
+
+
+def test_record_bulk_invalid_operations(create_patents_table, client):
+    table_name = 'NASA Record Bulk Invalid'
+    table = create_patents_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    data = {
+        'operations': [
+            {'type': 'insert', 'record': {columns_name_id_map['Center']: 'NASA Example Space Center'}},
+            {'type': 'update', 'record': {columns_name_id_map['Center']: 'NASA Example Space Center'}},
+            {'type': 'upsert', 'id': 1},
+            {'type': 'insert', 'record': {-1: 'Nowhere'}},
+        ]
+    }
+    response = client.post(f'/api/db/v0/tables/{table.id}/records/bulk/', data=data, format='json')
+    response_data = response.json()
+    assert response.status_code == 400
+    assert [error['detail']['operation_index'] for error in response_data] == [1, 2, 3]
+    assert [error['field'] for error in response_data] == ['id', 'type', 'record']
+    assert len(table.get_records()) == 1393
+
+
 def test_record_delete_fkey_violation(library_ma_tables, client):
     publications = library_ma_tables['Publications']
 
@@ -1277,6 +1568,21 @@ def test_number_input_api_validation(empty_nasa_table, client):
         assert response.status_code == status_code
 
 
+def test_record_validation_uses_column_descriptors(empty_nasa_table, django_assert_num_queries):
+    table = empty_nasa_table
+    table.add_column({"name": 'Nonce', "type": 'REAL'})
+    context = RecordViewSet().get_serializer_context(table)
+    nonce_id = context['columns_map']['Nonce']
+    assert context['column_descriptors'][nonce_id].ui_type == UIType.NUMBER
+    assert context['column_descriptors'][nonce_id].db_type == PostgresType.REAL
+    serializer = RecordSerializer(context=context)
+    # The columns aren't queried for each validated value.
+    with django_assert_num_queries(0):
+        assert serializer.to_internal_value({str(nonce_id): '314.0e-3'}) == {'Nonce': '314.0e-3'}
+        with pytest.raises(MathesarAPIException):
+            serializer.to_internal_value({str(nonce_id): '-0314'})
+
+
 def test_invalid_email_post_api_validation(empty_nasa_table, client):
     table = empty_nasa_table
     column_name = 'Email'
@@ -1371,3 +1677,51 @@ def test_record_patch_unique_violation(create_patents_table, client):
         f'/api/db/v0/tables/{table.id}/constraints/{constraint_id}/'
     ).json()
     assert actual_constraint_details['name'] == 'NASA unique record PATCH_pkey'
+
+
+def test_record_export_csv(create_patents_table, client):
+    table_name = 'NASA Record Export CSV'
+    table = create_patents_table(table_name)
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/export/?format=csv')
+    content = b''.join(response.streaming_content).decode()
+    rows = list(csv.reader(io.StringIO(content)))
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    assert response['Content-Disposition'] == (
+        "attachment; filename*=UTF-8''NASA%20Record%20Export%20CSV.csv"
+    )
+    assert rows[0] == [column.name for column in table.sa_columns]
+    assert len(rows) == 1394
+
+
+def test_record_export_json_lines_filter(create_patents_table, client):
+    table_name = 'NASA Record Export JSON Lines'
+    table = create_patents_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    filter = json.dumps({"equal": [
+        {"column_id": [columns_name_id_map['Center']]},
+        {"literal": ["NASA Kennedy Space Center"]}
+    ]})
+    response = client.get(
+        f'/api/db/v0/tables/{table.id}/records/export/?format=jsonl&filter={filter}'
+    )
+    content = b''.join(response.streaming_content).decode()
+    records = [json.loads(line) for line in content.splitlines()]
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson; charset=utf-8'
+    assert len(records) > 0
+    assert all(record['Center'] == 'NASA Kennedy Space Center' for record in records)
+
+
+def test_record_export_bad_filter(create_patents_table, client):
+    table_name = 'NASA Record Export Bad Filter'
+    table = create_patents_table(table_name)
+    filter = json.dumps({"not_a_function": [{"literal": ["a"]}]})
+    response = client.get(
+        f'/api/db/v0/tables/{table.id}/records/export/?format=csv&filter={filter}'
+    )
+    response_data = response.json()
+    assert response.status_code == 400
+    assert response['Content-Type'] == 'application/json'
+    assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
+    assert response_data[0]['field'] == 'filters'
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 
 from django.core.cache import cache
 from django.core.files.base import File, ContentFile
@@ -11,6 +12,7 @@ from mathesar.models.users import DatabaseRole, SchemaRole
 from mathesar.models.query import UIQuery
 
 from mathesar.state import reset_reflection
+from mathesar.imports.background import ImportWorker
 from mathesar.api.exceptions.error_codes import ErrorCodes
 from mathesar.models.base import Column, Table, DataFile
 
@@ -570,6 +572,37 @@ def test_table_create_from_datafile(client, data_file, schema, table_name):
     )
 
 
+def test_table_create_from_datafile_in_background(client, data_file, schema, settings):
+    settings.MATHESAR_BACKGROUND_IMPORT_MIN_SIZE = 1
+    # The import runs on the request's thread, which keeps its connection.
+    with patch.object(ImportWorker, 'start', ImportWorker.run), \
+            patch('mathesar.imports.background.dj_connection'):
+        response = client.post('/api/db/v0/tables/', {
+            'name': 'NASA Background Import', 'schema': schema.id, 'data_files': [data_file.id],
+        })
+    assert response.status_code == 202
+    assert response.json()['status'] == DataFile.import_status_choices.PENDING
+    progress = client.get(response.json()['progress_url']).json()
+    assert progress['status'] == DataFile.import_status_choices.DONE
+    assert progress['bytes_processed'] == progress['bytes_total'] == data_file.file.size
+    assert progress['rows_processed'] == 1393
+    table = Table.objects.get(id=progress['table_imported_to'])
+    assert table.name == 'NASA Background Import'
+    assert table.sa_num_records() == 1393
+
+
+def test_table_create_from_datafile_in_background_duplicate_name(client, data_file, schema, settings):
+    settings.MATHESAR_BACKGROUND_IMPORT_MIN_SIZE = 1
+    _create_table(client, None, 'NASA Background Duplicate', schema, import_target_table=None)
+    with patch.object(ImportWorker, 'start') as mock_start:
+        response = client.post('/api/db/v0/tables/', {
+            'name': 'NASA Background Duplicate', 'schema': schema.id, 'data_files': [data_file.id],
+        })
+    assert response.status_code == 400
+    assert response.json()[0]['code'] == ErrorCodes.DuplicateTableError.value
+    mock_start.assert_not_called()
+
+
 @pytest.mark.parametrize('table_name', ['Test Table Create From Datafile', ''])
 def test_table_create_from_datafile_with_import_target(client, data_file, schema, table_name):
     _, _, import_target_table = _create_table(client, None, 'target_table', schema, import_target_table=None)
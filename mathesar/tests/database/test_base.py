@@ -0,0 +1,29 @@
+from mathesar.database.base import (
+    dispose_mathesar_engines, get_engine_pool_stats, get_mathesar_engine
+)
+from mathesar.models.base import Database
+from mathesar.utils.models import attempt_dumb_query
+
+
+def test_get_mathesar_engine_is_shared(test_db_name):
+    assert get_mathesar_engine(test_db_name) is get_mathesar_engine(test_db_name)
+
+
+def test_database_model_uses_shared_engine(test_db_name):
+    db_model, _ = Database.current_objects.get_or_create(name=test_db_name)
+    assert db_model._sa_engine is get_mathesar_engine(test_db_name)
+
+
+def test_dispose_mathesar_engines_creates_fresh_engine(test_db_name):
+    engine = get_mathesar_engine(test_db_name)
+    dispose_mathesar_engines(test_db_name)
+    new_engine = get_mathesar_engine(test_db_name)
+    assert new_engine is not engine
+    attempt_dumb_query(new_engine)
+
+
+def test_get_engine_pool_stats_counts_checked_out_connections(test_db_name):
+    engine = get_mathesar_engine(test_db_name)
+    with engine.connect():
+        assert get_engine_pool_stats()[test_db_name]['checked_out'] == 1
+    assert get_engine_pool_stats()[test_db_name]['checked_out'] == 0
@@ -0,0 +1,130 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+from django_userforeignkey.request import current_request, set_current_request
+
+from mathesar.database.base import (
+    dispose_mathesar_engines, get_engine_pool_stats, get_mathesar_engine,
+    get_mathesar_replica_engines,
+)
+from mathesar.database.routing import get_read_engine, note_write
+from mathesar.state import reset_reflection
+from mathesar.utils.record_counts import _get_count_cache_key, get_record_count
+
+
+@pytest.fixture
+def replica_settings(settings, test_db_name):
+    # The "replica" is the test database itself, through an engine of its own.
+    dispose_mathesar_engines(test_db_name)
+    settings.MATHESAR_REPLICA_DATABASES = {
+        test_db_name: [dict(settings.DATABASES['default'], NAME=test_db_name)],
+    }
+    yield settings
+    dispose_mathesar_engines(test_db_name)
+
+
+@pytest.fixture
+def make_current_request():
+    tokens = []
+
+    def _make_current_request(method, user=None):
+        request = RequestFactory().generic(method, '/')
+        request.user = AnonymousUser() if user is None else user
+        tokens.append(set_current_request(request))
+        return request
+
+    yield _make_current_request
+    for token in reversed(tokens):
+        current_request.reset(token)
+
+
+def test_get_read_engine_without_replicas_uses_primary(test_db_name, make_current_request):
+    make_current_request('GET')
+    assert get_read_engine(test_db_name) is get_mathesar_engine(test_db_name)
+
+
+def test_get_read_engine_uses_replica_for_safe_requests(
+    replica_settings, test_db_name, make_current_request
+):
+    make_current_request('GET')
+    replica_engines = get_mathesar_replica_engines(test_db_name)
+    assert len(replica_engines) == 1
+    assert get_read_engine(test_db_name) is replica_engines[0]
+
+
+@pytest.mark.parametrize('method', ['POST', 'PATCH', 'DELETE'])
+def test_get_read_engine_uses_primary_for_writes(
+    replica_settings, test_db_name, make_current_request, method
+):
+    make_current_request(method)
+    assert get_read_engine(test_db_name) is get_mathesar_engine(test_db_name)
+
+
+def test_get_read_engine_uses_primary_outside_requests(replica_settings, test_db_name):
+    assert get_read_engine(test_db_name) is get_mathesar_engine(test_db_name)
+
+
+def test_get_read_engine_uses_primary_after_users_write(
+    replica_settings, test_db_name, make_current_request, admin_user, django_user_model
+):
+    replica_settings.MATHESAR_REPLICA_LAG_GUARD = 60
+    note_write(admin_user)
+    make_current_request('GET', admin_user)
+    assert get_read_engine(test_db_name) is get_mathesar_engine(test_db_name)
+    # Other users' reads aren't affected.
+    other_user = django_user_model.objects.create(username='other')
+    make_current_request('GET', other_user)
+    assert get_read_engine(test_db_name) is get_mathesar_replica_engines(test_db_name)[0]
+
+
+def test_lag_guard_survives_reflection_reset(
+    replica_settings, test_db_name, make_current_request, admin_user
+):
+    replica_settings.MATHESAR_REPLICA_LAG_GUARD = 60
+    note_write(admin_user)
+    reset_reflection()
+    make_current_request('GET', admin_user)
+    assert get_read_engine(test_db_name) is get_mathesar_engine(test_db_name)
+
+
+def test_dispose_mathesar_engines_disposes_replicas(replica_settings, test_db_name):
+    replica_engine = get_mathesar_replica_engines(test_db_name)[0]
+    dispose_mathesar_engines(test_db_name)
+    assert get_mathesar_replica_engines(test_db_name)[0] is not replica_engine
+
+
+def test_record_list_reads_from_replica(replica_settings, test_db_name, create_patents_table, client):
+    table = create_patents_table('NASA Record List Replica')
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=5')
+    assert response.status_code == 200
+    assert response.json()['count'] == 1393
+    assert get_engine_pool_stats()[f'{test_db_name}_replica_0']['checked_in'] > 0
+
+
+def test_record_list_reads_from_primary_after_write(
+    replica_settings, test_db_name, create_patents_table, client
+):
+    replica_settings.MATHESAR_REPLICA_LAG_GUARD = 60
+    table = create_patents_table('NASA Record List Replica Lag Guard')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    data = {columns_name_id_map['Center']: 'NASA Example Space Center'}
+    response = client.post(f'/api/db/v0/tables/{table.id}/records/', data=data)
+    assert response.status_code == 201
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=5')
+    assert response.json()['count'] == 1394
+    assert get_engine_pool_stats()[f'{test_db_name}_replica_0']['checked_in'] == 0
+
+
+def test_record_counts_are_only_cached_from_primary(
+    replica_settings, create_patents_table, make_current_request
+):
+    table = create_patents_table('NASA Record Count Replica Cache')
+    cache_key = _get_count_cache_key(table, None, None)
+    make_current_request('GET')
+    assert get_record_count(table) == (1393, False)
+    # The replica's count may predate a write, so it isn't served to others.
+    assert cache.get(cache_key) is None
+    make_current_request('POST')
+    assert get_record_count(table) == (1393, False)
+    assert cache.get(cache_key) == 1393
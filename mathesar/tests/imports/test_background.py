@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import pytest
+from django.core.files import File
+from django.utils import timezone
+from sqlalchemy import inspect
+
+from db.tables.operations.staging import create_staging_table
+from mathesar.imports.background import (
+    INTERRUPTED_IMPORT_AGE, INTERRUPTED_IMPORT_ERROR, clean_up_interrupted_imports,
+)
+from mathesar.models.base import DataFile
+
+
+@pytest.fixture
+def create_data_file(patents_csv_filepath):
+    def _create_data_file(import_status, age):
+        with open(patents_csv_filepath, "rb") as csv_file:
+            data_file = DataFile.objects.create(file=File(csv_file), import_status=import_status)
+        # Bypasses auto_now.
+        DataFile.objects.filter(id=data_file.id).update(updated_at=timezone.now() - age)
+        return data_file
+    return _create_data_file
+
+
+def test_clean_up_interrupted_imports(create_data_file, engine):
+    statuses = DataFile.import_status_choices
+    interrupted_age = INTERRUPTED_IMPORT_AGE + timedelta(seconds=1)
+    interrupted_data_file = create_data_file(statuses.RUNNING, interrupted_age)
+    interrupted_pending_data_file = create_data_file(statuses.PENDING, interrupted_age)
+    running_data_file = create_data_file(statuses.RUNNING, timedelta())
+    done_data_file = create_data_file(statuses.DONE, interrupted_age)
+    interrupted_staging_table = create_staging_table(['name'], engine, key=interrupted_data_file.id)
+    running_staging_table = create_staging_table(['name'], engine, key=running_data_file.id)
+    unkeyed_staging_table = create_staging_table(['name'], engine)
+
+    clean_up_interrupted_imports()
+
+    for data_file in [interrupted_data_file, interrupted_pending_data_file]:
+        data_file.refresh_from_db()
+        assert data_file.import_status == statuses.FAILED
+        assert data_file.import_error == INTERRUPTED_IMPORT_ERROR
+    running_data_file.refresh_from_db()
+    assert running_data_file.import_status == statuses.RUNNING
+    done_data_file.refresh_from_db()
+    assert done_data_file.import_status == statuses.DONE
+    inspector = inspect(engine)
+    schema = interrupted_staging_table.schema
+    assert not inspector.has_table(interrupted_staging_table.name, schema=schema)
+    assert inspector.has_table(running_staging_table.name, schema=schema)
+    assert inspector.has_table(unkeyed_staging_table.name, schema=schema)
@@ -1,11 +1,14 @@
-import pytest
+from io import BytesIO
+from unittest.mock import patch
 
+import pytest
+from charset_normalizer import detect
 from django.core.files import File
 from sqlalchemy import text
 
 from mathesar.models.base import DataFile, Schema
 from mathesar.errors import InvalidTableError
-from mathesar.imports.csv import create_table_from_csv, get_sv_dialect, get_sv_reader
+from mathesar.imports.csv import create_table_from_csv, get_sv_dialect, get_sv_reader, sniff_file
 from db.schemas.operations.create import create_schema
 from db.schemas.utils import get_schema_oid_from_name
 from db.constants import COLUMN_NAME_TEMPLATE
@@ -160,6 +163,30 @@ def test_csv_upload_table_imported_to(data_file, schema):
     assert data_file.table_imported_to == table
 
 
+def test_csv_upload_in_chunks(data_file, schema, settings):
+    settings.MATHESAR_IMPORT_CHUNK_SIZE = 16 * 1024
+    settings.MATHESAR_IMPORT_WORKERS = 4
+    table = create_table_from_csv(data_file, "NASA Chunks", schema)
+    records = table.get_records()
+    assert len(records) == 1393
+    # Records keep the order of the file, though its chunks are copied concurrently.
+    assert [record[0] for record in records] == list(range(1, 1394))
+    assert records[0][3] == "KSC-12871"
+    assert records[-1][3] == "SSC-00327"
+    data_file.refresh_from_db()
+    assert data_file.import_status == DataFile.import_status_choices.DONE
+    assert data_file.import_bytes_processed == data_file.file.size
+    assert data_file.import_rows_processed == 1393
+
+
+def test_csv_upload_failure_is_recorded(data_file, schema):
+    create_table_from_csv(data_file, "NASA Failure", schema)
+    with pytest.raises(DuplicateTable):
+        create_table_from_csv(data_file, "NASA Failure", schema)
+    data_file.refresh_from_db()
+    assert data_file.import_status == DataFile.import_status_choices.FAILED
+
+
 get_dialect_test_list = [
     (",", '"', "", "mathesar/tests/data/patents.csv"),
     ("\t", '"', "", "mathesar/tests/data/patents.tsv"),
@@ -209,3 +236,32 @@ def test_sv_get_header(file):
             "\"Application SN\"",
             "\"Title,Patent Expiration Date\"",
         ]
+
+
+def test_sniff_file_reads_bounded_samples(patents_csv_filepath, settings):
+    settings.MATHESAR_SNIFF_SAMPLE_SIZE = 4096
+    with open(patents_csv_filepath, "rb") as sv_file:
+        with patch('charset_normalizer.detect', wraps=detect) as mock_detect:
+            encoding, dialect = sniff_file(sv_file)
+        assert sv_file.tell() == 0
+    assert encoding == "utf-8"
+    assert (dialect.delimiter, dialect.quotechar, dialect.escapechar) == (",", '"', "")
+    mock_detect.assert_called_once()
+    assert len(mock_detect.call_args.args[0]) <= 4096
+
+
+def test_sniff_file_spot_check(settings):
+    settings.MATHESAR_SNIFF_SAMPLE_SIZE = 1024
+    # Only the second half of the file has non-ASCII characters.
+    lines = [f"{i},plain text\n" for i in range(200)] + [
+        f"{i},caf\u00e9 cr\u00e8me br\u00fbl\u00e9e\n" for i in range(200, 400)
+    ]
+    sv_file = BytesIO(("id,text\n" + "".join(lines)).encode("cp1252"))
+    settings.MATHESAR_SNIFF_SPOT_CHECK = False
+    encoding, _ = sniff_file(sv_file)
+    assert encoding == "utf-8"
+    settings.MATHESAR_SNIFF_SPOT_CHECK = True
+    encoding, _ = sniff_file(sv_file)
+    # Some single-byte encoding, which can decode the whole file.
+    assert encoding != "utf-8"
+    sv_file.getvalue().decode(encoding)
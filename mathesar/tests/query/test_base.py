@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from mathesar.models.query import UIQuery
 from db.queries.base import DBQuery, InitialColumn
 from db.transforms import base as transforms_base
@@ -78,3 +80,18 @@ def test_convert_to_db_query(create_patents_table, get_uid):
         wanted_db_query.transformations
     ):
         assert actual == wanted
+
+
+def test_db_query_takes_table_fingerprints_from_reflection(create_patents_table, get_uid):
+    base_table_dj = create_patents_table(table_name=get_uid())
+    col_dj = base_table_dj.get_column_by_name('Center')
+    ui_query = UIQuery(
+        name="some query",
+        base_table=base_table_dj,
+        initial_columns=[{'id': col_dj.id, 'alias': 'col1'}],
+        transformations=[],
+    )
+    with patch('db.transforms.operations.cache.get_table_fingerprints_from_oids') as mock_get:
+        records = ui_query.db_query.get_records(limit=5)
+    mock_get.assert_not_called()
+    assert len(records) == 5
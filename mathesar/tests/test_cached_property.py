@@ -0,0 +1,127 @@
+from mathesar.state.cached_property import (
+    NO_VALUE, _CentralCache, cached_property, clear_cached_property_cache, key_cached_property,
+    get_cached_property_cache_stats,
+)
+
+
+class _PartitionedObject:
+    def __init__(self, partition, value, tag=None):
+        self._cache_partition = partition
+        self._cache_tag = tag
+        self.value = value
+        self.computations = 0
+
+    @cached_property
+    def cached_value(self):
+        self.computations += 1
+        return self.value
+
+    @key_cached_property(key_fn=lambda obj: ('shared_value', obj.value))
+    def shared_value(self):
+        self.computations += 1
+        return self.value
+
+
+def test_cached_property_computes_once():
+    obj = _PartitionedObject('db_1', 'a')
+    assert obj.cached_value == 'a'
+    assert obj.cached_value == 'a'
+    assert obj.computations == 1
+
+
+def test_cached_property_set_and_delete():
+    obj = _PartitionedObject('db_1', 'a')
+    obj.cached_value = 'b'
+    assert obj.cached_value == 'b'
+    del obj.cached_value
+    assert obj.cached_value == 'a'
+
+
+def test_key_cached_property_is_shared_between_instances():
+    clear_cached_property_cache('db_1')
+    obj_1 = _PartitionedObject('db_1', 'a')
+    obj_2 = _PartitionedObject('db_1', 'a')
+    assert obj_1.shared_value == obj_2.shared_value == 'a'
+    assert obj_1.computations + obj_2.computations == 1
+
+
+def test_clear_cached_property_cache():
+    obj = _PartitionedObject('db_1', 'a')
+    obj.cached_value
+    clear_cached_property_cache()
+    obj.cached_value
+    assert obj.computations == 2
+
+
+def test_clear_cached_property_cache_partition():
+    obj_1 = _PartitionedObject('db_1', 'a')
+    obj_2 = _PartitionedObject('db_2', 'a')
+    obj_1.cached_value
+    obj_2.cached_value
+    clear_cached_property_cache('db_1')
+    obj_1.cached_value
+    obj_2.cached_value
+    assert obj_1.computations == 2
+    assert obj_2.computations == 1
+
+
+def test_clear_cached_property_cache_tags():
+    obj_1 = _PartitionedObject('db_1', 'a', tag=1)
+    obj_2 = _PartitionedObject('db_1', 'a', tag=2)
+    obj_3 = _PartitionedObject('db_2', 'a', tag=1)
+    for obj in (obj_1, obj_2, obj_3):
+        obj.cached_value
+    clear_cached_property_cache('db_1', tags=[1])
+    for obj in (obj_1, obj_2, obj_3):
+        obj.cached_value
+    assert [obj.computations for obj in (obj_1, obj_2, obj_3)] == [2, 1, 1]
+
+
+def test_cached_property_cache_stats():
+    obj = _PartitionedObject('db_1', 'a')
+    stats_before = get_cached_property_cache_stats()
+    obj.cached_value
+    obj.cached_value
+    stats_after = get_cached_property_cache_stats()
+    assert stats_after['misses'] == stats_before['misses'] + 1
+    assert stats_after['hits'] == stats_before['hits'] + 1
+
+
+def test_central_cache_evicts_least_recently_used():
+    cache = _CentralCache(max_size=2)
+    cache.set(('db_1', 'a'), 1)
+    cache.set(('db_1', 'b'), 2)
+    cache.get(('db_1', 'a'))
+    cache.set(('db_2', 'c'), 3)
+    assert cache.get(('db_1', 'b')) is NO_VALUE
+    assert cache.get(('db_1', 'a')) == 1
+    assert cache.get(('db_2', 'c')) == 3
+    stats = cache.get_stats()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+
+
+def test_central_cache_clear_tags():
+    cache = _CentralCache(max_size=10)
+    cache.set(('db_1', 'a'), 1, tag=1)
+    cache.set(('db_1', 'b'), 2, tag=2)
+    cache.set(('db_1', 'c'), 3)
+    cache.clear_tags('db_1', [1])
+    assert cache.get(('db_1', 'a')) is NO_VALUE
+    assert cache.get(('db_1', 'b')) == 2
+    assert cache.get(('db_1', 'c')) == 3
+    cache.clear_partition('db_1')
+    # Clearing a partition forgets its tags, too.
+    cache.set(('db_1', 'a'), 1)
+    cache.clear_tags('db_1', [1])
+    assert cache.get(('db_1', 'a')) == 1
+
+
+def test_central_cache_clear_partition():
+    cache = _CentralCache(max_size=10)
+    cache.set(('db_1', 'a'), 1)
+    cache.set(('db_2', 'a'), 2)
+    cache.clear_partition('db_1')
+    assert cache.get(('db_1', 'a')) is NO_VALUE
+    assert cache.get(('db_2', 'a')) == 2
+    assert cache.get_stats()['size'] == 1
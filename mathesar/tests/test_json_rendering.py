@@ -0,0 +1,95 @@
+"""
+Tests that rendering a page of records as JSON is unchanged.
+
+The page is synthetic (NUM_RECORDS records with NUM_COLUMNS columns each), with values of the types
+records are made of once fetched. FastJSONRenderer is compared against JSONRenderer, which must
+render the exact same bytes.
+"""
+import datetime
+import decimal
+import uuid
+from unittest.mock import patch
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from mathesar.api.pagination import TableLimitOffsetPagination
+from mathesar.utils import json as json_utils
+from mathesar.utils.json import FastJSONRenderer, MathesarFastJSONRenderer, MathesarJSONRenderer
+
+NUM_RECORDS = TableLimitOffsetPagination.max_limit
+NUM_COLUMNS = 100
+
+_VALUE_FACTORIES = [
+    lambda i: i,
+    lambda i: i * 1.5,
+    lambda i: -i / 7,
+    lambda i: f'value_{i} é中   "quoted" \\ \n',
+    lambda i: f'https://example.com/{i}?q=ü',
+    lambda i: f'user_{i}@example.com',
+    lambda i: f'${i:,}.00',
+    lambda i: i % 2 == 0,
+    lambda i: None,
+    lambda i: decimal.Decimal(f'{i}.25'),
+    lambda i: datetime.date(2000, 1, 1) + datetime.timedelta(days=i),
+    lambda i: datetime.datetime(2000, 1, 1, 12, 30, tzinfo=datetime.timezone.utc) + datetime.timedelta(seconds=i),
+    lambda i: datetime.datetime(2000, 1, 1, 12, 30, 15, 123) + datetime.timedelta(minutes=i),
+    lambda i: datetime.time(12, i % 60, 0, 500),
+    lambda i: datetime.timedelta(days=i, seconds=10),
+    lambda i: uuid.UUID(int=i),
+    lambda i: {'key': [i, 'a', {'nested': None}]},
+    lambda i: [i, i + 1, 'x'],
+]
+
+
+def _get_synthetic_page():
+    results = [
+        {
+            column_id: _VALUE_FACTORIES[column_id % len(_VALUE_FACTORIES)](i)
+            for column_id in range(1, NUM_COLUMNS + 1)
+        }
+        for i in range(NUM_RECORDS)
+    ]
+    return {'count': NUM_RECORDS, 'grouping': None, 'preview_data': [], 'results': results}
+
+
+def test_fast_json_rendering_unchanged():
+    data = _get_synthetic_page()
+    assert MathesarFastJSONRenderer().render(data) == MathesarJSONRenderer().render(data)
+
+
+@pytest.mark.parametrize('value', [
+    1e16,
+    1.5e-7,
+    0.00001,
+    2 ** 64,
+    -2 ** 63 - 1,
+    decimal.Decimal('1E+20'),
+    ' ',
+    {1: 'a', None: 'b', 2.5: 'c'},
+])
+def test_fast_json_rendering_edge_cases_unchanged(value):
+    data = {'results': [{1: value}]}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_json_rendering_indent_unchanged():
+    data = _get_synthetic_page()
+    renderer_context = {'indent': 2}
+    assert MathesarFastJSONRenderer().render(data, renderer_context=renderer_context) == (
+        MathesarJSONRenderer().render(data, renderer_context=renderer_context)
+    )
+
+
+def test_fast_json_rendering_uses_orjson():
+    # orjson is a requirement, so that records are rendered by it rather than by JSONRenderer.
+    assert json_utils.orjson is not None
+    data = _get_synthetic_page()
+    with patch.object(JSONRenderer, 'render', side_effect=AssertionError('fell back to JSONRenderer')):
+        MathesarFastJSONRenderer().render(data)
+
+
+def test_fast_json_rendering_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_utils, 'orjson', None)
+    data = _get_synthetic_page()
+    assert MathesarFastJSONRenderer().render(data) == MathesarJSONRenderer().render(data)
@@ -0,0 +1,85 @@
+"""
+Tests that turning a page of fetched records into the records of an API response is unchanged.
+
+The records are synthetic (a full page of NUM_RECORDS records with NUM_COLUMNS columns each), and
+what process_annotated_records and RecordSerializer make of them is compared against the previous
+implementation, which copied each record into a new dict several times over.
+"""
+import pytest
+
+from db.records.operations import group
+from mathesar.api.pagination import TableLimitOffsetPagination
+from mathesar.api.serializers.records import RecordSerializer
+from mathesar.api.utils import process_annotated_records
+
+NUM_RECORDS = TableLimitOffsetPagination.max_limit
+NUM_COLUMNS = 100
+
+
+class _Record(tuple):
+    """
+    Stands in for a SQLAlchemy Row; a namedtuple can't have the group metadata column's name as a
+    field.
+    """
+    _fields = ()
+
+    def _asdict(self):
+        return dict(zip(self._fields, self))
+
+
+def _get_synthetic_records(grouped=False):
+    column_names = [f'column_{i}' for i in range(NUM_COLUMNS)]
+    if grouped:
+        column_names.append(group.MATHESAR_GROUP_METADATA)
+    Record = type('Record', (_Record,), {'_fields': tuple(column_names)})
+    records = []
+    for i in range(NUM_RECORDS):
+        values = [f'value_{i}_{j}' for j in range(NUM_COLUMNS)]
+        if grouped:
+            group_id = i // 100 + 1
+            values.append({
+                group.GroupMetadataField.GROUP_ID.value: group_id,
+                group.GroupMetadataField.COUNT.value: 100,
+                group.GroupMetadataField.FIRST_VALUE.value: {'column_0': f'value_{i // 100 * 100}_0'},
+            })
+        records.append(Record(values))
+    columns_map = {name: column_id for column_id, name in enumerate(Record._fields, start=1)}
+    return records, columns_map
+
+
+def _get_previous_representation(record_list, columns_map):
+    processed_records = [
+        {
+            column_name: value for column_name, value in record._asdict().items()
+            if column_name != group.MATHESAR_GROUP_METADATA
+        }
+        for record in record_list
+    ]
+    return [
+        {columns_map[column_name]: value for column_name, value in record.items()}
+        for record in processed_records
+    ]
+
+
+def _get_representation(record_list, columns_map):
+    processed_records, _, _ = process_annotated_records(record_list)
+    serializer = RecordSerializer(processed_records, many=True, context={'columns_map': columns_map})
+    return serializer.data
+
+
+@pytest.mark.parametrize('grouped', [False, True])
+def test_record_representation_unchanged(grouped):
+    records, columns_map = _get_synthetic_records(grouped)
+    assert list(_get_representation(records, columns_map)) == (
+        _get_previous_representation(records, columns_map)
+    )
+
+
+def test_groups_with_ungrouped_first_record():
+    records, _ = _get_synthetic_records(grouped=True)
+    # E.g. a row whose group metadata is null.
+    records[0] = type(records[0])([*records[0][:-1], None])
+    _, groups, _ = process_annotated_records(records)
+    result_indices = [grp['result_indices'] for grp in groups]
+    assert result_indices[0] == list(range(1, 100))
+    assert sum(len(indices) for indices in result_indices) == NUM_RECORDS - 1
@@ -0,0 +1,93 @@
+"""
+Benchmarks of how the work done to reflect a database into our Django models scales with the size
+of its catalog.
+
+The catalog is synthetic (N schemas with M tables each). Rather than timing reflection, which is
+too noisy to assert on, each test counts the queries reflection makes to the user database and the
+Django database: a query per object would show up as a count that grows with the catalog, whereas
+reflecting objects in bulk takes the same number of queries whatever its size.
+"""
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection as dj_connection
+from django.test.utils import CaptureQueriesContext
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from mathesar.state import reset_reflection
+
+SMALL_CATALOG = (2, 5)
+LARGE_CATALOG = (4, 20)
+
+
+@pytest.fixture
+def create_catalog(engine, create_db_schema):
+    def _create_catalog(name, num_schemas, num_tables_per_schema):
+        with engine.begin() as conn:
+            for schema_index in range(num_schemas):
+                schema_name = create_db_schema(f'{name}_{schema_index}', engine)
+                for table_index in range(num_tables_per_schema):
+                    conn.execute(text(
+                        f'CREATE TABLE "{schema_name}"."table_{table_index}"'
+                        ' (id serial PRIMARY KEY, name text, created date)'
+                    ))
+    return _create_catalog
+
+
+@contextmanager
+def _count_queries():
+    counts = {'user_db': 0}
+
+    def _count_user_db_query(*args, **kwargs):
+        counts['user_db'] += 1
+
+    event.listen(Engine, 'before_cursor_execute', _count_user_db_query)
+    try:
+        with CaptureQueriesContext(dj_connection) as dj_queries:
+            yield counts
+    finally:
+        event.remove(Engine, 'before_cursor_execute', _count_user_db_query)
+    counts['django_db'] = len(dj_queries)
+
+
+def _count_reflection_queries(db_name, incremental=False):
+    with _count_queries() as counts:
+        reset_reflection(db_name=db_name, incremental=incremental)
+    return counts
+
+
+def _get_catalog_size(catalog):
+    num_schemas, num_tables_per_schema = catalog
+    return num_schemas * num_tables_per_schema
+
+
+def test_full_reflection_query_counts_grow_at_most_linearly(create_catalog, test_db_name):
+    create_catalog('small', *SMALL_CATALOG)
+    small_counts = _count_reflection_queries(test_db_name)
+    create_catalog('large', *LARGE_CATALOG)
+    large_counts = _count_reflection_queries(test_db_name)
+    # The second pass reflects both catalogs.
+    scale_factor = (
+        (_get_catalog_size(SMALL_CATALOG) + _get_catalog_size(LARGE_CATALOG))
+        / _get_catalog_size(SMALL_CATALOG)
+    )
+    for db in ['user_db', 'django_db']:
+        assert large_counts[db] <= small_counts[db] * scale_factor
+
+
+def test_incremental_reflection_query_counts_are_constant(create_catalog, engine, test_db_name):
+    create_catalog('small', *SMALL_CATALOG)
+    _count_reflection_queries(test_db_name)
+    small_unchanged_counts = _count_reflection_queries(test_db_name, incremental=True)
+    with engine.begin() as conn:
+        conn.execute(text('ALTER TABLE "small_0"."table_0" ADD COLUMN added text'))
+    small_changed_counts = _count_reflection_queries(test_db_name, incremental=True)
+    create_catalog('large', *LARGE_CATALOG)
+    _count_reflection_queries(test_db_name)
+    large_unchanged_counts = _count_reflection_queries(test_db_name, incremental=True)
+    with engine.begin() as conn:
+        conn.execute(text('ALTER TABLE "large_0"."table_0" ADD COLUMN added text'))
+    large_changed_counts = _count_reflection_queries(test_db_name, incremental=True)
+    assert large_unchanged_counts == small_unchanged_counts
+    assert large_changed_counts == small_changed_counts
@@ -0,0 +1,336 @@
+import pytest
+from unittest.mock import patch
+
+from django.db import connection as dj_connection
+from django.test.utils import CaptureQueriesContext
+from psycopg2.errors import InsufficientPrivilege
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from db.tables.operations.select import get_oid_from_table
+from mathesar.models.base import Column, Database, Schema, Table
+from mathesar.state import get_cached_metadata, reset_reflection
+from mathesar.state.background import (
+    MIN_RETRY_DELAY, ReflectionWorker, start_reflection_workers, stop_reflection_workers
+)
+from mathesar.state.cached_property import cached_property
+from mathesar.state.django import (
+    _create_reflected_columns, _delete_stale_columns, clear_catalog_snapshots,
+    clear_database_statuses, sync_databases_status
+)
+
+
+class _OtherDatabaseObject:
+    _cache_partition = 'other_db'
+
+    def __init__(self):
+        self.computations = 0
+
+    @cached_property
+    def cached_value(self):
+        self.computations += 1
+        return self.computations
+
+
+def test_incremental_reflection_reflects_only_changed_tables(create_patents_table):
+    table_1 = create_patents_table('incremental_reflection_1')
+    table_2 = create_patents_table('incremental_reflection_2')
+    reset_reflection(db_name=table_1.schema.database.name)
+    with table_1._sa_engine.begin() as conn:
+        conn.execute(text(
+            f'ALTER TABLE "{table_1.schema.name}"."{table_1.name}" ADD COLUMN incremental_col text'
+        ))
+    with patch('mathesar.state.django.reflect_columns_from_tables') as mock_reflect:
+        reset_reflection(db_name=table_1.schema.database.name, incremental=True)
+    reflected_tables = mock_reflect.call_args[0][0]
+    reflected_table_ids = {table.id for table in reflected_tables}
+    assert table_1.id in reflected_table_ids
+    assert table_2.id not in reflected_table_ids
+
+
+def test_incremental_reflection_picks_up_new_column(create_patents_table):
+    table = create_patents_table('incremental_reflection_new_column')
+    reset_reflection(db_name=table.schema.database.name)
+    column_count = Column.current_objects.filter(table=table).count()
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(
+            f'ALTER TABLE "{table.schema.name}"."{table.name}" ADD COLUMN incremental_col text'
+        ))
+    reset_reflection(db_name=table.schema.database.name, incremental=True)
+    assert Column.current_objects.filter(table=table).count() == column_count + 1
+
+
+def test_incremental_reflection_deletes_dropped_table(create_patents_table):
+    table = create_patents_table('incremental_reflection_dropped_table')
+    reset_reflection(db_name=table.schema.database.name)
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(f'DROP TABLE "{table.schema.name}"."{table.name}"'))
+    reset_reflection(db_name=table.schema.database.name, incremental=True)
+    assert not Table.current_objects.filter(id=table.id).exists()
+
+
+def test_incremental_reflection_with_no_changes_reflects_nothing(create_patents_table):
+    table = create_patents_table('incremental_reflection_no_changes')
+    reset_reflection(db_name=table.schema.database.name)
+    with patch('mathesar.state.django.reflect_columns_from_tables') as mock_reflect:
+        reset_reflection(db_name=table.schema.database.name, incremental=True)
+    assert len(mock_reflect.call_args[0][0]) == 0
+
+
+def test_incremental_reflection_only_walks_changed_tables(create_patents_table):
+    table = create_patents_table('incremental_reflection_walk')
+    schema = table.schema
+    reset_reflection(db_name=schema.database.name)
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE "{schema.name}"."incremental_reflection_new" (id int)'))
+    with patch('mathesar.state.django.reflect_schemas_from_database') as mock_reflect_schemas, \
+            patch('mathesar.state.django.reflect_tables_from_schemas') as mock_reflect_tables:
+        reset_reflection(db_name=schema.database.name, incremental=True)
+    mock_reflect_schemas.assert_not_called()
+    mock_reflect_tables.assert_not_called()
+    new_table = Table.current_objects.get(schema=schema, oid=get_oid_from_table(
+        'incremental_reflection_new', schema.name, table._sa_engine
+    ))
+    assert Column.current_objects.filter(table=new_table).count() == 1
+
+
+def test_incremental_reflection_moves_table_to_new_schema(create_patents_table):
+    table = create_patents_table('incremental_reflection_moved')
+    schema = table.schema
+    reset_reflection(db_name=schema.database.name)
+    with table._sa_engine.begin() as conn:
+        conn.execute(text('CREATE SCHEMA "incremental_reflection_other"'))
+        conn.execute(text(
+            f'ALTER TABLE "{schema.name}"."{table.name}" SET SCHEMA "incremental_reflection_other"'
+        ))
+    try:
+        reset_reflection(db_name=schema.database.name, incremental=True)
+        assert not Table.current_objects.filter(id=table.id).exists()
+        moved_table = Table.current_objects.get(oid=table.oid)
+        assert moved_table.schema.name == 'incremental_reflection_other'
+    finally:
+        with table._sa_engine.begin() as conn:
+            conn.execute(text('DROP SCHEMA "incremental_reflection_other" CASCADE'))
+
+
+def test_incremental_reflection_keeps_cached_properties_of_unchanged_tables(create_patents_table):
+    table_1 = create_patents_table('incremental_reflection_cache_1')
+    table_2 = create_patents_table('incremental_reflection_cache_2')
+    reset_reflection(db_name=table_1.schema.database.name)
+    sa_table_1 = table_1._sa_table
+    sa_table_2 = table_2._sa_table
+    with table_1._sa_engine.begin() as conn:
+        conn.execute(text(
+            f'ALTER TABLE "{table_1.schema.name}"."{table_1.name}" ADD COLUMN incremental_col text'
+        ))
+    reset_reflection(db_name=table_1.schema.database.name, incremental=True)
+    assert table_2._sa_table is sa_table_2
+    assert table_1._sa_table is not sa_table_1
+    assert 'incremental_col' in table_1._sa_table.columns
+
+
+def test_scoped_reflection_reflects_only_given_tables(create_patents_table):
+    table_1 = create_patents_table('scoped_reflection_1')
+    table_2 = create_patents_table('scoped_reflection_2')
+    with patch('mathesar.state.django.reflect_columns_from_tables') as mock_reflect:
+        reset_reflection(db_name=table_1.schema.database.name, table_oids=[table_1.oid])
+    reflected_table_ids = {table.id for table in mock_reflect.call_args[0][0]}
+    assert reflected_table_ids == {table_1.id}
+    assert table_2.id not in reflected_table_ids
+
+
+def test_scoped_reflection_reflects_tables_of_given_schemas(create_patents_table):
+    table = create_patents_table('scoped_reflection_schema')
+    schema = table.schema
+    with patch('mathesar.state.django.reflect_columns_from_tables') as mock_reflect:
+        reset_reflection(db_name=schema.database.name, schema_oids=[schema.oid])
+    reflected_table_ids = {table.id for table in mock_reflect.call_args[0][0]}
+    assert table.id in reflected_table_ids
+
+
+def test_scoped_reflection_picks_up_new_column(create_patents_table):
+    table = create_patents_table('scoped_reflection_new_column')
+    column_count = Column.current_objects.filter(table=table).count()
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(
+            f'ALTER TABLE "{table.schema.name}"."{table.name}" ADD COLUMN scoped_col text'
+        ))
+    reset_reflection(db_name=table.schema.database.name, table_oids=[table.oid])
+    assert Column.current_objects.filter(table=table).count() == column_count + 1
+
+
+def test_scoped_reflection_requires_db_name():
+    with pytest.raises(ValueError):
+        reset_reflection(table_oids=[1])
+
+
+class _IterationCountingList(list):
+    """
+    A list that counts how many times it's iterated over, to tell linear scans of it apart.
+    """
+    iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+@pytest.mark.parametrize('num_tables', [10, 1000])
+def test_create_reflected_columns_indexes_tables_once(num_tables):
+    schema = Schema(oid=1)
+    tables = _IterationCountingList(
+        Table(oid=table_oid, schema=schema) for table_oid in range(1, num_tables + 1)
+    )
+    attnum_tuples = [(attnum, table.oid) for table in tables for attnum in range(1, 21)]
+    tables.iterations = 0
+    with patch.object(Column.current_objects, 'bulk_create') as mock_bulk_create:
+        _create_reflected_columns(attnum_tuples, tables)
+    # Looking up the table of each column by scanning the tables would iterate once per column.
+    assert tables.iterations == 1
+    columns = mock_bulk_create.call_args[0][0]
+    assert [(column.attnum, column.table.oid) for column in columns] == attnum_tuples
+
+
+def test_delete_stale_columns_only_deletes_unreflected_columns(create_patents_table):
+    table = create_patents_table('delete_stale_columns')
+    other_table = create_patents_table('delete_stale_columns_other')
+    other_column_count = Column.current_objects.filter(table=other_table).count()
+    attnums = list(Column.current_objects.filter(table=table).values_list('attnum', flat=True))
+    stale_attnum = attnums.pop()
+    _delete_stale_columns([(attnum, table.oid) for attnum in attnums], [table, other_table])
+    remaining_attnums = set(
+        Column.current_objects.filter(table=table).values_list('attnum', flat=True)
+    )
+    assert remaining_attnums == set(attnums)
+    assert stale_attnum not in remaining_attnums
+    # other_table has no reflected columns in the tuples, so all of its columns are stale.
+    assert other_column_count > 0
+    assert not Column.current_objects.filter(table=other_table).exists()
+
+
+def test_full_reflection_of_database_keeps_state_of_other_databases(create_patents_table):
+    table = create_patents_table('full_reflection_of_database')
+    db_name = table.schema.database.name
+    other_db_object = _OtherDatabaseObject()
+    assert other_db_object.cached_value == 1
+    metadata = get_cached_metadata()
+    reset_reflection(db_name=db_name)
+    assert get_cached_metadata() is metadata
+    assert other_db_object.cached_value == 1
+    assert Table.current_objects.get(id=table.id)._sa_table.name == table.name
+
+
+def test_full_reflection_of_unreflected_database_resets_everything(create_patents_table):
+    table = create_patents_table('full_reflection_of_unreflected_database')
+    other_db_object = _OtherDatabaseObject()
+    assert other_db_object.cached_value == 1
+    metadata = get_cached_metadata()
+    clear_catalog_snapshots()
+    reset_reflection(db_name=table.schema.database.name)
+    assert get_cached_metadata() is not metadata
+    assert other_db_object.cached_value == 2
+
+
+def test_reflection_worker_scoped_reflection_for_table_events():
+    worker = ReflectionWorker('some_db')
+    with patch('mathesar.state.background.reset_reflection') as mock_reset:
+        worker.handle_ddl_events([{'table_oids': [1, 2], 'full': False}, {'table_oids': [2]}])
+    mock_reset.assert_called_once()
+    assert mock_reset.call_args.kwargs['db_name'] == 'some_db'
+    assert set(mock_reset.call_args.kwargs['table_oids']) == {1, 2}
+
+
+def test_reflection_worker_incremental_reflection_for_full_events():
+    worker = ReflectionWorker('some_db')
+    with patch('mathesar.state.background.reset_reflection') as mock_reset:
+        worker.handle_ddl_events([{'table_oids': [1], 'full': False}, {'table_oids': [], 'full': True}])
+    mock_reset.assert_called_once_with(db_name='some_db', incremental=True)
+
+
+def _run_reflection_worker(worker, install_side_effect):
+    def _listen(engine, on_events, should_stop):
+        worker.stop()
+
+    with patch('mathesar.state.background.create_mathesar_engine'), \
+            patch('mathesar.state.background.reset_reflection'), \
+            patch('mathesar.state.background.listen_for_ddl_events', side_effect=_listen), \
+            patch('mathesar.state.background.install_ddl_event_triggers', side_effect=install_side_effect) as mock_install, \
+            patch.object(worker._stop_event, 'wait') as mock_wait:
+        worker.start()
+        worker.join(timeout=5)
+    assert not worker.is_alive()
+    return mock_install, mock_wait
+
+
+def test_reflection_worker_retries_with_backoff():
+    worker = ReflectionWorker('some_db')
+    error = OperationalError('statement', {}, Exception('could not connect to server'))
+    mock_install, mock_wait = _run_reflection_worker(worker, [error, error, None])
+    assert mock_install.call_count == 3
+    retry_delays = [call.args[0] for call in mock_wait.call_args_list]
+    assert retry_delays == [MIN_RETRY_DELAY, MIN_RETRY_DELAY * 2]
+
+
+def test_reflection_worker_gives_up_without_privileges():
+    worker = ReflectionWorker('some_db')
+    error = ProgrammingError('statement', {}, InsufficientPrivilege())
+    mock_install, mock_wait = _run_reflection_worker(worker, [error, None])
+    mock_install.assert_called_once()
+    mock_wait.assert_not_called()
+
+
+@pytest.mark.parametrize('background_reflection,test,started', [
+    (True, False, True),
+    (False, False, False),
+    (True, True, False),
+])
+def test_start_reflection_workers_only_when_enabled(settings, background_reflection, test, started):
+    settings.MATHESAR_BACKGROUND_REFLECTION = background_reflection
+    settings.TEST = test
+    with patch('mathesar.state.background.ReflectionWorker') as mock_worker:
+        start_reflection_workers()
+        stop_reflection_workers()
+    assert mock_worker.called == started
+
+
+def test_sync_databases_status_caches_probe_results(test_db_model):
+    clear_database_statuses()
+    with patch('mathesar.state.django._probe_database', return_value=True) as mock_probe:
+        sync_databases_status()
+        sync_databases_status()
+    probed_db_names = [call.args[0] for call in mock_probe.call_args_list]
+    assert probed_db_names.count(test_db_model.name) == 1
+
+
+def test_sync_databases_status_only_saves_changed_status(test_db_model):
+    clear_database_statuses()
+    with patch('mathesar.state.django._probe_database', return_value=True), \
+            patch.object(Database, 'save') as mock_save:
+        sync_databases_status()
+    mock_save.assert_not_called()
+    clear_database_statuses()
+    with patch('mathesar.state.django._probe_database', return_value=False):
+        sync_databases_status()
+    assert Database.current_objects.get(id=test_db_model.id).deleted is True
+    clear_database_statuses()
+
+
+def test_delete_stale_columns_finds_stale_columns_in_one_query(create_patents_table):
+    tables = [create_patents_table(f'delete_stale_columns_query_{i}') for i in range(3)]
+    attnum_tuples = []
+    stale_columns = []
+    for table in tables:
+        columns = list(Column.current_objects.filter(table=table))
+        stale_columns.append(columns.pop())
+        attnum_tuples += [(column.attnum, table.oid) for column in columns]
+    with CaptureQueriesContext(dj_connection) as context:
+        _delete_stale_columns(attnum_tuples, tables)
+    # The stale columns of all tables are found by a single anti-join, rather than a query (or a
+    # WHERE clause) per table.
+    anti_join_queries = [query for query in context.captured_queries if 'NOT EXISTS' in query['sql']]
+    assert len(anti_join_queries) == 1
+    remaining_ids = set(
+        Column.current_objects.filter(table__in=tables).values_list('id', flat=True)
+    )
+    assert remaining_ids.isdisjoint(column.id for column in stale_columns)
+    assert len(remaining_ids) == len(attnum_tuples)
@@ -1,13 +1,12 @@
 import os
 from time import time
-from io import TextIOWrapper
 
 import requests
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
 
 from mathesar.errors import URLDownloadError
-from mathesar.imports.csv import get_sv_dialect, get_file_encoding
+from mathesar.imports.csv import sniff_file
 from mathesar.models.base import DataFile
 
 
@@ -51,9 +50,7 @@ def create_datafile(data):
         base_name, _ = os.path.splitext(os.path.basename(raw_file.name))
         base_name = base_name[:max_length]
 
-    encoding = get_file_encoding(raw_file.file)
-    text_file = TextIOWrapper(raw_file.file, encoding=encoding)
-    dialect = get_sv_dialect(text_file)
+    encoding, dialect = sniff_file(raw_file.file)
 
     datafile = DataFile(
         file=raw_file,
@@ -63,6 +60,7 @@ def create_datafile(data):
         delimiter=dialect.delimiter,
         escapechar=dialect.escapechar,
         quotechar=dialect.quotechar,
+        encoding=encoding,
     )
     datafile.save()
     raw_file.close()
@@ -0,0 +1,190 @@
+"""
+Exports of table records as downloadable files.
+
+Records are fetched and encoded batch by batch, and the encoded chunks are meant to be streamed
+to the client (e.g. with a StreamingHttpResponse), so that memory use stays flat regardless of
+the size of the table.
+"""
+import datetime
+import decimal
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from db.records.operations.export import export_records_to_csv
+from db.records.operations.select import get_records_in_batches
+from mathesar.utils.json import MathesarJSONEncoder, MathesarJSONRenderer
+
+CSV = 'csv'
+JSON_LINES = 'jsonl'
+PARQUET = 'parquet'
+
+EXPORT_BATCH_SIZE = 5000
+
+
+def get_export_chunks(table, format, filter=None, order_by=None, search=None):
+    """
+    Returns a generator of bytes chunks that make up the given Table model's records, encoded in
+    the given format. The transformation arguments are those of db.records.operations.select
+    .get_records, with column names rather than ids.
+    """
+    sa_table = table._sa_table
+    if format == CSV:
+        # Postgres encodes CSV much faster than Python would.
+        return export_records_to_csv(
+            sa_table,
+            table._sa_engine,
+            order_by=order_by,
+            filter=filter,
+            search=search,
+        )
+    batches = get_records_in_batches(
+        sa_table,
+        table._sa_engine,
+        EXPORT_BATCH_SIZE,
+        order_by=order_by,
+        filter=filter,
+        search=search,
+    )
+    if format == JSON_LINES:
+        return _get_json_lines_chunks(sa_table.columns, batches)
+    elif format == PARQUET:
+        return _get_parquet_chunks(sa_table.columns, batches)
+    raise ValueError(f'Unknown export format: {format}')
+
+
+def _get_json_lines_chunks(columns, batches):
+    column_names = [column.name for column in columns]
+    for batch in batches:
+        lines = (
+            json.dumps(dict(zip(column_names, record)), cls=MathesarJSONEncoder)
+            for record in batch
+        )
+        yield ''.join(line + '\n' for line in lines).encode('utf-8')
+
+
+def _get_parquet_chunks(columns, batches):
+    # pyarrow is an optional dependency, only needed for Parquet exports.
+    import pyarrow
+    import pyarrow.parquet
+
+    schema = pyarrow.schema(
+        [(column.name, _get_arrow_type(pyarrow, column.type)) for column in columns]
+    )
+    sink = _ParquetSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            arrays = [
+                pyarrow.array(
+                    [_get_parquet_value(field.type, pyarrow, record[i]) for record in batch],
+                    type=field.type,
+                )
+                for i, field in enumerate(schema)
+            ]
+            # Each batch becomes a row group, which the writer outputs right away.
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            yield sink.pop()
+    yield sink.pop()
+
+
+def _get_arrow_type(pyarrow, sa_type):
+    try:
+        python_type = sa_type.python_type
+    except NotImplementedError:
+        return pyarrow.string()
+    if python_type is bool:
+        return pyarrow.bool_()
+    elif python_type is int:
+        return pyarrow.int64()
+    elif python_type is float:
+        return pyarrow.float64()
+    elif python_type is datetime.datetime:
+        timezone = 'UTC' if getattr(sa_type, 'timezone', False) else None
+        return pyarrow.timestamp('us', tz=timezone)
+    elif python_type is datetime.date:
+        return pyarrow.date32()
+    elif python_type is datetime.time and not getattr(sa_type, 'timezone', False):
+        return pyarrow.time64('us')
+    # Decimals are exported as strings, since their precision may not be bounded.
+    return pyarrow.string()
+
+
+def _get_parquet_value(arrow_type, pyarrow, value):
+    if value is None or not pyarrow.types.is_string(arrow_type):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=MathesarJSONEncoder)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value if isinstance(value, str) else str(value)
+
+
+class _ParquetSink:
+    """
+    A write-only file object that hands out what has been written to it so far. Parquet writers
+    need to know their position in the file, so it's tracked independently of the buffer.
+    """
+    closed = False
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._position = 0
+
+    def write(self, data):
+        self._position += len(data)
+        return self._buffer.write(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def pop(self):
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Exports are streamed, bypassing renderers. Still, DRF picks a renderer by the `format` query
+    parameter (or the Accept header) before the view runs, so each export format needs one. They
+    only ever render error responses, which they do as JSON.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        response = renderer_context.get('response')
+        if response is not None:
+            response['Content-Type'] = MathesarJSONRenderer.media_type
+        return MathesarJSONRenderer().render(data, renderer_context=renderer_context)
+
+
+class CSVExportRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = CSV
+    charset = 'utf-8'
+
+
+class JSONLinesExportRenderer(_ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = JSON_LINES
+    charset = 'utf-8'
+
+
+class ParquetExportRenderer(_ExportRenderer):
+    media_type = 'application/vnd.apache.parquet'
+    format = PARQUET
+    charset = None
+
+
+EXPORT_RENDERERS = [CSVExportRenderer, JSONLinesExportRenderer, ParquetExportRenderer]
@@ -16,7 +16,7 @@ TYPE = 'type'
 
 def get_processed_joinable_tables(table, limit=None, offset=None, max_depth=2):
     raw_joinable_tables = ma_sel.get_joinable_tables(
-        table.schema._sa_engine,
+        table.schema._sa_read_engine,
         get_empty_metadata(),
         base_table_oid=table.oid,
         max_depth=max_depth,
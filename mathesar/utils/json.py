@@ -1,8 +1,14 @@
 import datetime
+import re
 
 from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.renderers import JSONRenderer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class MathesarJSONEncoder(JSONEncoder):
     def default(self, obj):
@@ -17,3 +23,50 @@ class MathesarJSONEncoder(JSONEncoder):
 
 class MathesarJSONRenderer(JSONRenderer):
     encoder_class = MathesarJSONEncoder
+
+
+# orjson formats floats like the json module does, except when json would use an exponent (e.g.
+# 1e+16 vs. 1e16, 1e-05 vs. 0.00001). Output where either could have happened is rendered again
+# with the json module. In compact output, numbers always follow one of ':,['; this may still
+# match inside strings, which only costs some speed.
+_ORJSON_DIVERGENT_FLOAT_PATTERN = re.compile(rb'[:,\[]-?(?:[0-9.]+e|0\.0000)')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renders the same bytes as JSONRenderer (with the same encoder_class), but several times
+    faster, using orjson (a requirement, though this still works without it). Types that orjson doesn't serialize the same way as
+    the json module are handed to the encoder_class's default(), like the json module would.
+
+    Falls back to JSONRenderer when orjson isn't installed, when the output is indented, when
+    orjson can't encode the data (e.g. integers beyond 64 bits) and when a float in the output may
+    be formatted differently. One difference remains: NaN and infinite floats are rendered as null
+    rather than making rendering fail.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=(
+                    orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME
+                    | orjson.OPT_PASSTHROUGH_DATACLASS
+                ),
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _ORJSON_DIVERGENT_FLOAT_PATTERN.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer, fully escape \u2028 and \u2029, so that the output is a strict
+        # javascript subset.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MathesarFastJSONRenderer(FastJSONRenderer):
+    encoder_class = MathesarJSONEncoder
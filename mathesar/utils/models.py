@@ -1,7 +1,6 @@
 import os
 
 from sqlalchemy import text
-from sqlalchemy.exc import OperationalError
 
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -34,7 +33,7 @@ def update_sa_table(table, validated_data):
     try:
         data = _update_columns_side_effector(table, validated_data)
         alter_table(table.name, table.oid, table.schema.name, table.schema._sa_engine, data)
-        reset_reflection(db_name=table.schema.database.name)
+        reset_reflection(db_name=table.schema.database.name, incremental=True)
     # TODO: Catch more specific exceptions
     except InvalidTypeError as e:
         raise e
@@ -55,23 +54,6 @@ def update_sa_schema(schema, validated_data):
     alter_schema(schema.name, schema._sa_engine, validated_data)
 
 
-def ensure_cached_engine_ready(engine):
-    """
-    We must make sure that a cached engine is usable. An engine might become unusable if its
-    Postgres database is dropped and then recreated. This handles that case, by making a dumb
-    query, which if it fails, will cause the engine to reestablish a usable connection and the
-    subsequent queries will work as expected.
-
-    A problem with this is that we have to do this whenever an engine is retrieved from our engine
-    cache, which degrades the performance benefits of an engine cache. It might be worth eventually
-    benchmarking whether this is indeed better than not caching engines at all.
-    """
-    try:
-        attempt_dumb_query(engine)
-    except OperationalError:
-        pass
-
-
 def attempt_dumb_query(engine):
     with engine.connect() as con:
         con.execute(text('select 1 as is_alive'))
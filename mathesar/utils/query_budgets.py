@@ -0,0 +1,39 @@
+"""
+Budgets limit the queries that fetch and count records, so that one expensive view (e.g. a
+grouped, searched view of a huge table) can't keep a Postgres backend busy for minutes. They're
+configured per endpoint, in settings.MATHESAR_QUERY_BUDGETS.
+
+Queries that run out of time fail with a QueryCanceled error, which the API reports as a
+QueryBudgetExceededAPIException.
+"""
+from django.conf import settings
+
+from db.utils import connect_with_query_budget, set_query_budget
+
+TABLE_RECORDS = 'table_records'
+QUERY_RECORDS = 'query_records'
+
+
+def get_query_budget(endpoint):
+    return settings.MATHESAR_QUERY_BUDGETS.get(endpoint, {})
+
+
+def connect_within_budget(engine, query_budget):
+    """
+    Returns a context manager yielding a connection in a transaction limited by the budget.
+    """
+    return connect_with_query_budget(engine, **_get_connection_settings(query_budget))
+
+
+def set_budget(connection, query_budget):
+    """
+    Limits the connection's current transaction by the budget.
+    """
+    set_query_budget(connection, **_get_connection_settings(query_budget))
+
+
+def _get_connection_settings(query_budget):
+    return {
+        'statement_timeout': query_budget.get('statement_timeout'),
+        'work_mem': query_budget.get('work_mem'),
+    }
@@ -0,0 +1,121 @@
+"""
+Strategies for counting the records of a table when paginating them.
+
+Counting exactly means scanning every matching row, which on big tables can take longer than
+fetching the page itself. Hence, exact counts are cached until a write through Mathesar
+invalidates them (or until their TTL passes, for writes made by other Postgres clients), and
+unfiltered counts can be estimated from the catalog instead. Only counts made on the primary are
+cached, since a read replica's may predate the latest write. Counts that the planner estimates to be
+too expensive for the endpoint's query budget are estimated by the planner instead (see
+mathesar.utils.query_budgets).
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from db.records.operations.select import get_approximate_count
+from mathesar.utils.query_budgets import connect_within_budget
+
+COUNT_NONE = 'none'
+COUNT_APPROXIMATE = 'approx'
+COUNT_EXACT = 'exact'
+COUNT_STRATEGIES = (COUNT_NONE, COUNT_APPROXIMATE, COUNT_EXACT)
+
+
+def get_record_count(
+    table, filter=None, search=None, strategy=COUNT_EXACT, connection_to_use=None,
+    query_budget=None,
+):
+    """
+    Returns a (count, is_approximate) tuple for the records of the given Table model that match
+    filter and search. The count is None when the strategy is COUNT_NONE.
+
+    COUNT_APPROXIMATE only estimates unfiltered counts of tables that are big enough for counting
+    to be expensive; otherwise, it falls back to an exact count.
+
+    An exact count is estimated by the planner instead when it'd cost more than the budget's
+    approximate_count_cost. It's counted within the budget otherwise.
+
+    If connection_to_use is given, an exact count is always computed on it (e.g. because its
+    transaction has a snapshot that the count has to be consistent with), rather than read from
+    the cache.
+    """
+    if query_budget is None:
+        query_budget = {}
+    if strategy == COUNT_NONE:
+        return None, False
+    if strategy == COUNT_APPROXIMATE and not filter and not search:
+        approximate_count = get_approximate_count(table.oid, table._sa_read_engine)
+        if (
+            approximate_count is not None
+            and approximate_count >= settings.MATHESAR_APPROXIMATE_COUNT_THRESHOLD
+        ):
+            return approximate_count, True
+    return _get_exact_count(table, filter, search, connection_to_use, query_budget)
+
+
+def invalidate_record_counts(table):
+    """
+    Invalidates the cached counts of the given Table model. Call after writing to its records.
+    """
+    cache.set(_get_generation_cache_key(table), _get_new_generation(), None)
+
+
+def _get_exact_count(table, filter, search, connection_to_use, query_budget):
+    cache_key = _get_count_cache_key(table, filter, search)
+    if connection_to_use is not None:
+        engine = connection_to_use.engine
+        count, is_approximate = _count_within_budget(
+            table, filter, search, connection_to_use, query_budget
+        )
+    else:
+        count = cache.get(cache_key)
+        if count is not None:
+            return count, False
+        engine = table._sa_read_engine
+        with connect_within_budget(engine, query_budget) as connection:
+            count, is_approximate = _count_within_budget(
+                table, filter, search, connection, query_budget
+            )
+    # A count from a replica may lag behind writes that already replaced the generation, and
+    # would be served to everyone, including users whose reads are kept on the primary.
+    if not is_approximate and engine is table._sa_engine:
+        cache.set(cache_key, count, settings.MATHESAR_RECORD_COUNT_CACHE_TTL)
+    return count, is_approximate
+
+
+def _count_within_budget(table, filter, search, connection, query_budget):
+    max_cost = query_budget.get('approximate_count_cost')
+    if max_cost:
+        estimated_count, estimated_cost = table.sa_count_estimate(
+            filter=filter, search=search, connection_to_use=connection
+        )
+        if estimated_cost > max_cost:
+            return estimated_count, True
+    return table.sa_num_records(filter=filter, search=search, connection_to_use=connection), False
+
+
+def _get_count_cache_key(table, filter, search):
+    # All cached counts of a table are keyed by its current generation, so that invalidating them
+    # only takes replacing the generation.
+    generation = cache.get_or_set(_get_generation_cache_key(table), _get_new_generation, None)
+    return (
+        f"{table._cache_partition}_record_count_{table.oid}_{generation}"
+        f"_{_get_spec_hash(filter)}_{_get_spec_hash(search)}"
+    )
+
+
+def _get_generation_cache_key(table):
+    return f"{table._cache_partition}_record_count_generation_{table.oid}"
+
+
+def _get_new_generation():
+    return uuid.uuid4().hex
+
+
+def _get_spec_hash(spec):
+    spec_json = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(spec_json.encode()).hexdigest()
@@ -3,12 +3,12 @@ from rest_framework.exceptions import ValidationError
 
 from db.schemas.operations.create import create_schema
 from db.schemas.utils import get_schema_oid_from_name, get_mathesar_schemas
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.models.base import Schema, Database
 
 
 def create_schema_and_object(name, database, comment=None):
-    engine = create_mathesar_engine(database)
+    engine = get_mathesar_engine(database)
 
     all_schemas = get_mathesar_schemas(engine)
     if name in all_schemas:
@@ -3,7 +3,7 @@ from sqlalchemy import MetaData
 from db.tables.operations.create import create_mathesar_table
 from db.tables.operations.select import get_oid_from_table
 from db.tables.operations.infer_types import infer_table_column_types
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.imports.csv import create_table_from_csv
 from mathesar.models.base import Table
 from mathesar.state.django import reflect_columns_from_tables
@@ -77,7 +77,7 @@ def create_empty_table(name, schema, comment=None):
     :param schema: the parsed and validated schema model
     :return: the newly created blank table
     """
-    engine = create_mathesar_engine(schema.database.name)
+    engine = get_mathesar_engine(schema.database.name)
     db_table = create_mathesar_table(name, schema.name, [], engine, comment=comment)
     db_table_oid = get_oid_from_table(db_table.name, db_table.schema, engine)
     # Using current_objects to create the table instead of objects. objects